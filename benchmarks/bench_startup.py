@@ -0,0 +1,158 @@
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from benchmarks.harness import environment, save_results
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Cold-import budgets in milliseconds (CI machines are slower than laptops)
+DEFAULT_BUDGETS = {
+    "src.graph.workflow": 500,
+    "src.tools.finance_api": 150,
+    "src.tools.arxiv_search": 150,
+    "src.tools.news_api": 150,
+}
+
+# Must not be imported until a tool or agent is actually used
+DEFERRED = (
+    "langgraph",
+    "langchain_aws",
+    "boto3",
+    "yfinance",
+    "arxiv",
+    "newsapi",
+    "httpx",
+)
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """Rows of `python -X importtime` output: name, depth, self/cumulative µs"""
+    rows = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            rows.append(
+                {
+                    "name": match.group(4),
+                    "depth": len(match.group(3)) // 2,
+                    "self_us": int(match.group(1)),
+                    "cumulative_us": int(match.group(2)),
+                }
+            )
+    return rows
+
+
+def import_profile(module: str) -> Dict:
+    """Import module in a fresh interpreter; total time and per-package split"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+
+    rows = parse_importtime(proc.stderr)
+    total = next(r["cumulative_us"] for r in reversed(rows) if r["name"] == module)
+    packages = defaultdict(int)
+    for row in rows:
+        packages[row["name"].split(".")[0]] += row["self_us"]
+
+    return {
+        "total_ms": total / 1000,
+        "packages_ms": {name: us / 1000 for name, us in packages.items()},
+        "modules": {row["name"] for row in rows},
+    }
+
+
+def bench_imports(modules: List[str], repeat: int) -> Dict[str, Dict]:
+    results = {}
+    for module in modules:
+        profiles = [import_profile(module) for _ in range(repeat)]
+        median = statistics.median(p["total_ms"] for p in profiles)
+        # Breakdown from the run closest to the median
+        profile = min(profiles, key=lambda p: abs(p["total_ms"] - median))
+        results[module] = {
+            "median_ms": median,
+            "min_ms": min(p["total_ms"] for p in profiles),
+            "packages_ms": profile["packages_ms"],
+            "deferred_loaded": sorted(
+                name for name in DEFERRED if name in profile["modules"]
+            ),
+        }
+    return results
+
+
+def check_budgets(
+    results: Dict[str, Dict], budgets: Dict[str, float], check_deferred: bool
+) -> List[str]:
+    """Human-readable budget violations (empty when everything is in budget)"""
+    failures = []
+    for module, stats in results.items():
+        budget = budgets.get(module)
+        if budget is not None and stats["median_ms"] > budget:
+            failures.append(
+                f"{module}: {stats['median_ms']:.0f}ms > {budget:.0f}ms budget"
+            )
+        if check_deferred and stats["deferred_loaded"]:
+            failures.append(
+                f"{module}: eagerly imports {', '.join(stats['deferred_loaded'])}"
+            )
+    return failures
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Cold import-time benchmark")
+    parser.add_argument(
+        "--module",
+        action="append",
+        help="module to import (repeatable; default: workflow and tools)",
+    )
+    parser.add_argument(
+        "--budget-ms", type=float, help="budget for every module, overrides defaults"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8, help="packages to list")
+    parser.add_argument("--output", help="write results as JSON")
+    args = parser.parse_args(argv)
+
+    modules = args.module or list(DEFAULT_BUDGETS)
+    budgets = (
+        {module: args.budget_ms for module in modules}
+        if args.budget_ms is not None
+        else DEFAULT_BUDGETS
+    )
+
+    results = bench_imports(modules, args.repeat)
+
+    for module, stats in results.items():
+        budget = budgets.get(module)
+        limit = f" (budget {budget:.0f}ms)" if budget is not None else ""
+        print(f"{module}: {stats['median_ms']:.1f}ms median{limit}")
+        heaviest = sorted(stats["packages_ms"].items(), key=lambda kv: -kv[1])
+        for name, ms in heaviest[: args.top]:
+            print(f"  {name:<28} {ms:>8.1f}ms")
+
+    if args.output:
+        save_results(args.output, {"meta": environment(), "imports": results})
+        print(f"\nResults written to {args.output}")
+
+    failures = check_budgets(results, budgets, check_deferred=args.module is None)
+    for failure in failures:
+        print(f"OVER BUDGET {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,261 @@
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import os
+import sys
+import time
+from typing import Dict
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from benchmarks.fakes import FINDINGS, fake_llm_factory, fake_tools
+from benchmarks.harness import (
+    compare_results,
+    environment,
+    measure,
+    save_results,
+    summarize,
+)
+from src.agents.competitor_agent import CompetitorIntelAgent
+from src.agents.model_routing import RouteStats
+from src.agents.research_agent import ResearchAgent
+from src.agents.synthesis_agent import SynthesisAgent
+from src.graph.workflow import MultiAgentWorkflow
+
+QUERY = "Analyze solid-state battery developments and LG Energy Solution's position"
+
+
+def make_config(llm_latency: float = 0.0, token_latency: float = 0.0) -> Dict:
+    return {
+        "region": "us-west-2",
+        "model_id": "fake-bedrock",
+        "llm_factory": fake_llm_factory(llm_latency, token_latency),
+    }
+
+
+def make_state() -> Dict:
+    return {
+        "query": QUERY,
+        "research_findings": FINDINGS * 8,
+        "financial_analysis": {
+            "analysis": "\n".join(FINDINGS * 4),
+            "status": "success",
+        },
+        "competitor_insights": FINDINGS * 8,
+    }
+
+
+def agent_output(lines: int) -> str:
+    body = "\n".join(
+        f"- {FINDINGS[i % len(FINDINGS)]}" if i % 3 else f"Context line {i}"
+        for i in range(lines)
+    )
+    return f"Summary of the findings.\n{body}\n"
+
+
+def bench_overhead(repeat: int) -> Dict[str, Dict]:
+    """Framework cost with zero-latency fakes: everything measured is ours"""
+    config = make_config()
+    tools = fake_tools()
+    workflow = MultiAgentWorkflow(tools, config)
+    untraced = MultiAgentWorkflow(tools, {**config, "tracing": False})
+    synthesis = SynthesisAgent(config)
+    research = ResearchAgent(tools["arxiv_search"], config)
+    competitor = CompetitorIntelAgent(tools["news_api"], tools["arxiv_search"], config)
+    state = make_state()
+    output = agent_output(200)
+
+    return {
+        "graph_compile": measure(workflow._build_graph, repeat=repeat, number=5),
+        "workflow_init": measure(
+            lambda: MultiAgentWorkflow(tools, config), repeat=repeat
+        ),
+        "workflow_run": measure(lambda: workflow.run(QUERY), repeat=repeat),
+        "workflow_run_untraced": measure(lambda: untraced.run(QUERY), repeat=repeat),
+        "workflow_arun": measure(
+            lambda: asyncio.run(workflow.arun(QUERY)), repeat=repeat
+        ),
+        "synthesis_prompt_format": measure(
+            lambda: synthesis.prompt.format_messages(**synthesis._format_inputs(state)),
+            repeat=repeat,
+            number=200,
+        ),
+        "research_parse_findings": measure(
+            lambda: research._parse_findings(output), repeat=repeat, number=500
+        ),
+        "competitor_parse_insights": measure(
+            lambda: competitor._parse_insights(output), repeat=repeat, number=500
+        ),
+    }
+
+
+def bench_concurrency(levels, llm_latency: float, tool_latency: float) -> Dict:
+    """Wall time for N simultaneous queries against slow fake upstreams"""
+    workflow = MultiAgentWorkflow(fake_tools(tool_latency), make_config(llm_latency))
+    results = {}
+
+    for level in levels:
+        queries = [f"{QUERY} #{i}" for i in range(level)]
+
+        async def run_all():
+            return await asyncio.gather(*(workflow.arun(q) for q in queries))
+
+        start = time.perf_counter()
+        asyncio.run(run_all())
+        async_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=level) as executor:
+            list(executor.map(workflow.run, queries))
+        thread_elapsed = time.perf_counter() - start
+
+        for mode, elapsed in (("async", async_elapsed), ("threads", thread_elapsed)):
+            stats = summarize([elapsed])
+            stats["queries"] = level
+            stats["queries_per_sec"] = level / elapsed
+            results[f"concurrency_{mode}_{level}"] = stats
+
+    return results
+
+
+def bench_agent_modes(repeat: int, llm_latency: float, tool_latency: float) -> Dict:
+    """One query through ReAct agents vs prefetch-then-reason agents"""
+    tools = fake_tools(tool_latency)
+    prefetch = {name: "prefetch" for name in ("research", "financial", "competitor")}
+    results = {}
+
+    for mode, agent_modes in (("react", {}), ("prefetch", prefetch)):
+        config = {**make_config(llm_latency), "agent_modes": agent_modes}
+        workflow = MultiAgentWorkflow(tools, config)
+        results[f"agent_mode_{mode}"] = measure(
+            lambda: workflow.run(QUERY), repeat=repeat
+        )
+
+    return results
+
+
+def bench_synthesis_modes(
+    repeat: int, llm_latency: float, tool_latency: float, token_latency: float
+) -> Dict:
+    """One query with a single report call vs pipelined per-section calls
+
+    Output length matters here (a long report is slow to generate), so the
+    fake model also charges token_latency per output token.
+    """
+    tools = fake_tools(tool_latency)
+    results = {}
+
+    for mode in ("single", "sectioned"):
+        config = {
+            **make_config(llm_latency, token_latency),
+            "synthesis_mode": mode,
+        }
+        workflow = MultiAgentWorkflow(tools, config)
+        results[f"synthesis_{mode}"] = measure(
+            lambda: workflow.run(QUERY), repeat=repeat
+        )
+
+    return results
+
+
+def bench_model_routing(repeat: int, llm_latency: float, tool_latency: float) -> Dict:
+    """Every step on the large model vs ReAct steps cascading from a small one
+
+    The fake small model answers in llm_latency and the large one in three
+    times that; the fakes always pass the cascade checks, so this is the
+    best case. Per-route stats are returned under "routes".
+    """
+    tools = fake_tools(tool_latency)
+    factory = fake_llm_factory(
+        model_latency={"fake-small": llm_latency, "fake-large": 3 * llm_latency}
+    )
+    results, routes = {}, {}
+
+    for name, model_routes in (
+        ("large", {}),
+        ("cascade", {"react": {"cascade": ["fake-small", "fake-large"]}}),
+    ):
+        stats = RouteStats()
+        config = {
+            **make_config(),
+            "model_id": "fake-large",
+            "llm_factory": factory,
+            "model_routes": model_routes,
+            "route_stats": stats,
+        }
+        workflow = MultiAgentWorkflow(tools, config)
+        results[f"routing_{name}"] = measure(lambda: workflow.run(QUERY), repeat=repeat)
+        routes[name] = stats.snapshot()
+
+    return results, routes
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Offline workflow benchmarks")
+    parser.add_argument("--output", default="benchmarks/results/latest.json")
+    parser.add_argument("--compare", help="baseline JSON from an earlier commit")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--levels", default="1,8,64")
+    parser.add_argument("--llm-latency", type=float, default=0.02)
+    parser.add_argument("--tool-latency", type=float, default=0.01)
+    parser.add_argument(
+        "--token-latency",
+        type=float,
+        default=0.002,
+        help="fake model seconds per output token (synthesis mode benchmarks)",
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help="few repeats, low concurrency (CI)"
+    )
+    args = parser.parse_args(argv)
+
+    repeat = 2 if args.quick else args.repeat
+    levels = [1, 2] if args.quick else [int(n) for n in args.levels.split(",")]
+
+    benchmarks = bench_overhead(repeat)
+    benchmarks.update(bench_concurrency(levels, args.llm_latency, args.tool_latency))
+    benchmarks.update(bench_agent_modes(repeat, args.llm_latency, args.tool_latency))
+    benchmarks.update(
+        bench_synthesis_modes(
+            repeat, args.llm_latency, args.tool_latency, args.token_latency
+        )
+    )
+    routing, routes = bench_model_routing(repeat, args.llm_latency, args.tool_latency)
+    benchmarks.update(routing)
+    results = {"meta": environment(), "benchmarks": benchmarks, "routes": routes}
+    save_results(args.output, results)
+
+    print(f"{'benchmark':<32} {'median':>12} {'p95':>12} {'ops/s':>10}")
+    for name, stats in benchmarks.items():
+        print(
+            f"{name:<32} {stats['median_s'] * 1000:>10.3f}ms "
+            f"{stats['p95_s'] * 1000:>10.3f}ms {stats['ops_per_sec']:>10.1f}"
+        )
+    print(f"\n{'route':<32} {'mean latency':>12} {'calls':>6} {'escalated':>10}")
+    for name, stats in routes.items():
+        for route, route_stats in sorted(stats.items()):
+            print(
+                f"{name + ' ' + route:<32} "
+                f"{route_stats['mean_latency_s'] * 1000:>10.3f}ms "
+                f"{route_stats['calls']:>6} {route_stats['escalations']:>10}"
+            )
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows = compare_results(baseline, results, args.threshold)
+        print(f"\nCompared with {args.compare} ({baseline['meta']['commit']}):")
+        for row in rows:
+            flag = "REGRESSION" if row["regression"] else ""
+            print(f"{row['name']:<32} x{row['ratio']:.2f} {flag}")
+        if any(row["regression"] for row in rows):
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+import asyncio
+import re
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.tools import Tool
+
+FINDINGS = [
+    "Sulfide solid electrolytes reach 25 mS/cm ionic conductivity",
+    "Silicon-rich anodes push cell energy density past 350 Wh/kg",
+    "Dry electrode coating cuts cathode line energy use by 40%",
+    "LFP share of EV packs keeps rising on cost and cycle life",
+    "Sodium-ion cells enter volume production for low-range EVs",
+]
+
+REPORT = """Executive summary: the battery market is consolidating around cost.
+
+## Technical Analysis
+- Solid-state pilot lines scale toward 2027 launches
+
+## Financial Performance
+- Margins recover as lithium prices stabilise
+
+## Competitive Landscape
+- CATL and BYD extend their lead in LFP
+
+## Strategic Recommendations
+- Accelerate solid-state R&D partnerships
+- Hedge lithium exposure with sodium-ion programs
+- Localise cathode supply in North America
+
+## Key Risks and Opportunities
+- Policy shifts on EV subsidies
+"""
+
+
+class FakeBedrockChatModel(BaseChatModel):
+    """Scripted chat model that speaks the ReAct and synthesis formats
+
+    A ReAct prompt without an observation yet gets an Action for the first
+    listed tool; once an observation is present it gets a bulleted Final
+    Answer. Sectioned-synthesis prompts get their part of REPORT; any other
+    prompt gets the whole REPORT. Each call takes `latency` plus
+    `token_latency` per output token (~4 characters), so long generations
+    cost more than short ones.
+    """
+
+    model_id: str = "fake-bedrock"
+    latency: float = 0.0
+    token_latency: float = 0.0
+    findings: List[str] = FINDINGS
+    report: str = REPORT
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-bedrock"
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        result = self._result(messages)
+        time.sleep(self._delay(result.generations[0].message.content))
+        return result
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        result = self._result(messages)
+        await asyncio.sleep(self._delay(result.generations[0].message.content))
+        return result
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        if self.latency:
+            time.sleep(self.latency)
+        for line in self._respond(messages).splitlines(keepends=True):
+            if self.token_latency:
+                time.sleep(self.token_latency * len(line) / 4)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=line))
+
+    def _delay(self, text: str) -> float:
+        return self.latency + self.token_latency * len(text) / 4
+
+    def _result(self, messages: List[BaseMessage]) -> ChatResult:
+        text = self._respond(messages)
+        message = AIMessage(
+            content=text,
+            usage_metadata={
+                "input_tokens": sum(len(str(m.content)) for m in messages) // 4,
+                "output_tokens": len(text) // 4,
+                "total_tokens": 0,
+            },
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _respond(self, messages: List[BaseMessage]) -> str:
+        prompt = "\n".join(str(m.content) for m in messages)
+        tools = re.search(r"should be one of \[(.*?)\]", prompt)
+
+        if tools is None:
+            section = re.search(r'Write only the "(.+?)" section', prompt)
+            if section:
+                return _report_sections(self.report).get(section.group(1), "")
+            if "Write the remaining sections" in prompt:
+                sections = _report_sections(self.report)
+                return "\n\n".join(
+                    f"## {title}\n{sections.get(title, '')}"
+                    for title in (
+                        "Executive Summary",
+                        "Strategic Recommendations",
+                        "Key Risks and Opportunities",
+                    )
+                )
+            return self.report
+        if "Observation:" not in prompt.split("Begin!")[-1]:
+            tool = tools.group(1).split(",")[0].strip()
+            return f"Thought: I should search\nAction: {tool}\nAction Input: battery"
+
+        bullets = "\n".join(f"- {finding}" for finding in self.findings)
+        return f"Thought: I now know the final answer\nFinal Answer:\n{bullets}"
+
+
+def _report_sections(report: str) -> Dict[str, str]:
+    """REPORT split at its "## " headings; the lead paragraph is the summary"""
+    lead, *rest = re.split(r"^## ", report, flags=re.MULTILINE)
+    sections = {"Executive Summary": lead.strip()}
+    for part in rest:
+        title, _, body = part.partition("\n")
+        sections[title.strip()] = body.strip()
+    return sections
+
+
+def fake_llm_factory(
+    latency: float = 0.0,
+    token_latency: float = 0.0,
+    model_latency: Optional[Dict[str, float]] = None,
+):
+    """config["llm_factory"] building FakeBedrockChatModel instances
+
+    model_latency overrides `latency` per model ID, e.g. a fast small
+    model and a slow large one for routing benchmarks.
+    """
+
+    def factory(model_id: str, **model_kwargs) -> FakeBedrockChatModel:
+        return FakeBedrockChatModel(
+            model_id=model_id,
+            latency=(model_latency or {}).get(model_id, latency),
+            token_latency=token_latency,
+        )
+
+    return factory
+
+
+def fake_tools(latency: float = 0.0) -> Dict[str, Tool]:
+    """Tools dict for MultiAgentWorkflow returning canned API payloads"""
+
+    def make(name: str, payload: List[Dict], metadata: Dict = None) -> Tool:
+        def run(query: str):
+            if latency:
+                time.sleep(latency)
+            return payload
+
+        return Tool(name=name, func=run, description=f"Fake {name}", metadata=metadata)
+
+    return {
+        "arxiv_search": make(
+            "arxiv_search",
+            [
+                {"title": f"Paper {i}", "summary": FINDINGS[i % len(FINDINGS)]}
+                for i in range(10)
+            ],
+        ),
+        "yahoo_finance": make(
+            "yahoo_finance",
+            [{"name": "LG Energy Solution", "market_cap": 7.1e13, "revenue": 3.3e13}],
+            # Same shape as FinanceDataTool.as_langchain_tool(), for prefetch mode
+            {"company_tickers": {"lg_energy": "373220.KS", "catl": "300750.SZ"}},
+        ),
+        "news_api": make(
+            "news_search",
+            [{"title": f"Headline {i}", "source": "Wire"} for i in range(10)],
+        ),
+    }
@@ -0,0 +1,91 @@
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+
+def measure(fn: Callable, repeat: int = 5, number: int = 1, warmup: int = 1) -> Dict:
+    """Time fn() `repeat` times (each timing covers `number` calls)
+
+    Returns per-call seconds: min/median/mean/p95/max plus ops_per_sec from
+    the median, which is what comparisons use.
+    """
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number)
+
+    return summarize(samples)
+
+
+def summarize(samples: List[float]) -> Dict:
+    ordered = sorted(samples)
+    median = statistics.median(ordered)
+    return {
+        "min_s": ordered[0],
+        "median_s": median,
+        "mean_s": statistics.fmean(ordered),
+        "p95_s": ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))],
+        "max_s": ordered[-1],
+        "ops_per_sec": 1 / median if median else float("inf"),
+        "samples": len(ordered),
+    }
+
+
+def environment() -> Dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except Exception:
+        commit = "unknown"
+
+    return {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def save_results(path: str, results: Dict):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+
+
+def compare_results(
+    baseline: Dict, current: Dict, threshold: float = 0.2
+) -> List[Dict]:
+    """Median-time ratio per benchmark; flags slowdowns above threshold"""
+    rows = []
+    for name, stats in current["benchmarks"].items():
+        before = baseline.get("benchmarks", {}).get(name)
+        if before is None or not before.get("median_s"):
+            continue
+        ratio = stats["median_s"] / before["median_s"]
+        rows.append(
+            {
+                "name": name,
+                "baseline_s": before["median_s"],
+                "current_s": stats["median_s"],
+                "ratio": ratio,
+                "regression": ratio > 1 + threshold,
+            }
+        )
+    return rows
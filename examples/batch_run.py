@@ -0,0 +1,107 @@
+import argparse
+import os
+import sys
+import warnings
+
+from dotenv import load_dotenv
+
+warnings.filterwarnings("ignore")
+os.environ["LANGCHAIN_VERBOSE"] = "false"
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+load_dotenv()
+
+from src.graph.batch import BatchRunner
+from src.graph.workflow import MultiAgentWorkflow
+from src.tools.arxiv_index import ArxivIndex
+from src.tools.arxiv_search import ArxivSearchTool
+from src.tools.cache import SingleFlight, ToolCache
+from src.tools.finance_api import FinanceDataTool
+from src.tools.financials_store import FinancialsStore
+from src.tools.news_api import NewsSearchTool
+from src.tools.news_fanout import NewsFanout
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run a JSONL file of {query, context} records in bulk"
+    )
+    parser.add_argument("input", help="JSONL with one {query, context, id?} per line")
+    parser.add_argument("output", help="JSONL results, appended as queries finish")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument(
+        "--checkpoint", help="completed-ID file (default: <output>.done)"
+    )
+    args = parser.parse_args()
+
+    config = {
+        "region": os.getenv("AWS_REGION", "us-west-2"),
+        "model_id": os.getenv(
+            "BEDROCK_MODEL", "anthropic.claude-3-5-sonnet-20241022-v2:0"
+        ),
+        "max_pool_connections": int(os.getenv("BEDROCK_MAX_POOL_CONNECTIONS", "50")),
+    }
+
+    tool_cache = ToolCache(os.getenv("TOOL_CACHE_PATH", ".cache/tool_cache.sqlite"))
+    flight = SingleFlight()
+    # Kept current by examples/sync_arxiv_index.py; unsynced means live API
+    index_path = os.getenv("ARXIV_INDEX_PATH")
+    index = ArxivIndex(index_path) if index_path else None
+    store_dir = os.getenv("FINANCIALS_STORE_DIR")
+    store = FinancialsStore(store_dir) if store_dir else None
+    # e.g. NEWS_LANGUAGES=en,zh,de NEWS_PAGES=2: concurrent requests per query
+    news_languages = os.getenv("NEWS_LANGUAGES")
+    fanout = (
+        NewsFanout(
+            os.getenv("NEWS_API_KEY"),
+            languages=news_languages.split(","),
+            pages=int(os.getenv("NEWS_PAGES", "1")),
+        )
+        if news_languages
+        else None
+    )
+    tools = {
+        "arxiv_search": ArxivSearchTool(
+            cache=tool_cache, single_flight=flight, index=index
+        ).as_langchain_tool(),
+        "yahoo_finance": FinanceDataTool(
+            cache=tool_cache, single_flight=flight, store=store
+        ).as_langchain_tool(),
+        "news_api": NewsSearchTool(
+            os.getenv("NEWS_API_KEY"),
+            cache=tool_cache,
+            single_flight=flight,
+            fanout=fanout,
+        ).as_langchain_tool(),
+    }
+
+    runner = BatchRunner(
+        MultiAgentWorkflow(tools, config),
+        concurrency=args.concurrency,
+        checkpoint_path=args.checkpoint,
+    )
+    stats = runner.run(args.input, args.output)
+
+    print("=" * 80)
+    print("BATCH SUMMARY")
+    print("=" * 80)
+    print(f"Total queries:   {stats['total']}")
+    print(f"Completed:       {stats['completed']}")
+    print(f"Skipped (done):  {stats['skipped']}")
+    print(f"Failed:          {stats['failed']}")
+    print(f"Elapsed:         {stats['elapsed_s']:.1f}s")
+    print(f"Throughput:      {stats['queries_per_min']:.1f} queries/min")
+    if stats["p50_latency_s"] is not None:
+        print(
+            f"Latency p50/p95: {stats['p50_latency_s']:.1f}s / {stats['p95_latency_s']:.1f}s"
+        )
+    for source, counts in flight.stats().items():
+        print(
+            f"Tool {source}: {counts['executed']} requests, "
+            f"{counts['coalesced']} coalesced"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import sys
 import warnings
@@ -16,15 +17,20 @@ print("BATTERY ANALYST AGENTS - INTERACTIVE DEMO")
 print("=" * 80)
 
 print("\nChecking connections...")
-try:
-    import boto3
+# Bad credentials surface on the first Bedrock call anyway; the STS round
+# trip (plus importing boto3) only runs when CHECK_AWS_CONNECTION is set
+if os.getenv("CHECK_AWS_CONNECTION"):
+    try:
+        import boto3
 
-    sts = boto3.client("sts", region_name="us-west-2")
-    identity = sts.get_caller_identity()
-    print(f"AWS: Connected as {identity['Arn'].split('/')[-1]}")
-except Exception as e:
-    print(f"AWS: Connection failed - {e}")
-    sys.exit(1)
+        sts = boto3.client("sts", region_name="us-west-2")
+        identity = sts.get_caller_identity()
+        print(f"AWS: Connected as {identity['Arn'].split('/')[-1]}")
+    except Exception as e:
+        print(f"AWS: Connection failed - {e}")
+        sys.exit(1)
+else:
+    print("AWS: Not checked (set CHECK_AWS_CONNECTION=1 to verify credentials)")
 
 api_key = os.getenv("NEWS_API_KEY")
 if api_key and api_key != "your-news-api-key-here":
@@ -35,11 +41,9 @@ else:
 
 print("\nInitializing agents...")
 try:
-    from src.agents.competitor_agent import CompetitorIntelAgent
-    from src.agents.financial_agent import FinancialAnalystAgent
-    from src.agents.research_agent import ResearchAgent
-    from src.agents.synthesis_agent import SynthesisAgent
+    from src.graph.workflow import MultiAgentWorkflow
     from src.tools.arxiv_search import ArxivSearchTool
+    from src.tools.cache import ToolCache
     from src.tools.finance_api import FinanceDataTool
     from src.tools.news_api import NewsSearchTool
 
@@ -48,21 +52,23 @@ try:
         "model_id": os.getenv(
             "BEDROCK_MODEL", "anthropic.claude-3-5-sonnet-20241022-v2:0"
         ),
+        "max_pool_connections": int(os.getenv("BEDROCK_MAX_POOL_CONNECTIONS", "50")),
     }
 
-    arxiv_tool = ArxivSearchTool().as_langchain_tool()
-    finance_tool = FinanceDataTool().as_langchain_tool()
-    news_tool = NewsSearchTool(api_key).as_langchain_tool()
+    # Shared across tools and processes: repeated queries skip the network
+    tool_cache = ToolCache(os.getenv("TOOL_CACHE_PATH", ".cache/tool_cache.sqlite"))
+
+    arxiv_tool = ArxivSearchTool(cache=tool_cache).as_langchain_tool()
+    finance_tool = FinanceDataTool(cache=tool_cache).as_langchain_tool()
+    news_tool = NewsSearchTool(api_key, cache=tool_cache).as_langchain_tool()
     tools = {
         "arxiv_search": arxiv_tool,
         "yahoo_finance": finance_tool,
         "news_api": news_tool,
     }
 
-    research_agent = ResearchAgent(arxiv_tool, config)
-    financial_agent = FinancialAnalystAgent(finance_tool, config)
-    competitor_agent = CompetitorIntelAgent(news_tool, arxiv_tool, config)
-    synthesis_agent = SynthesisAgent(config)
+    # Built once and reused for every query
+    workflow = MultiAgentWorkflow(tools, config)
 
     print("All agents initialized successfully")
 
@@ -120,29 +126,46 @@ def run_analysis(query):
 
         start_time = time.time()
 
-        from src.graph.workflow import MultiAgentWorkflow
-
-        workflow = MultiAgentWorkflow(tools, config)
-
         print("\nStarting parallel analysis...")
 
-        result = workflow.run(query)
+        async def stream_report():
+            # Print the report as it is generated instead of after the full run
+            result = None
+            first_chunk = True
+            async for kind, payload in workflow.astream(query):
+                if kind == "report_chunk":
+                    if first_chunk:
+                        print(f"First tokens after {time.time() - start_time:.1f}s")
+                        print("\n" + "=" * 80)
+                        print("ANALYSIS REPORT")
+                        print("=" * 80)
+                        print("\nFULL REPORT:")
+                        print("-" * 80)
+                        first_chunk = False
+                    print(payload, end="", flush=True)
+                else:
+                    result = payload
+            return result
+
+        result = asyncio.run(stream_report())
 
         elapsed_time = time.time() - start_time
-        print(f"Analysis completed in {elapsed_time:.1f}s")
-
-        print("\n" + "=" * 80)
-        print("ANALYSIS REPORT")
-        print("=" * 80)
+        print(f"\n\nAnalysis completed in {elapsed_time:.1f}s")
+
+        trace = result.get("metadata", {}).get("trace")
+        if trace:
+            print("\nSTAGE TIMINGS:")
+            print("-" * 80)
+            for span in trace["spans"]:
+                if span["kind"] in ("node", "agent"):
+                    print(
+                        f"{span['kind']:>6} {span['name']:<16} {span['duration_ms']:>9.0f} ms"
+                    )
 
         print("\nEXECUTIVE SUMMARY:")
         print("-" * 80)
         print(result["executive_summary"])
 
-        print("\n\nFULL REPORT:")
-        print("-" * 80)
-        print(result["final_report"])
-
         print("\n\nKEY RECOMMENDATIONS:")
         print("-" * 80)
         for i, rec in enumerate(result["recommendations"], 1):
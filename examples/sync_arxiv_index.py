@@ -0,0 +1,38 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.tools.arxiv_index import DEFAULT_CATEGORIES, ArxivIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Fetch arXiv papers newer than the local index's watermark"
+    )
+    parser.add_argument(
+        "--path", default=os.getenv("ARXIV_INDEX_PATH", ".cache/arxiv_index.sqlite")
+    )
+    parser.add_argument("--category", action="append", help="repeatable")
+    parser.add_argument(
+        "--initial-days", type=int, default=365, help="backfill on the first sync"
+    )
+    parser.add_argument(
+        "--max-results", type=int, default=1000, help="papers per request batch"
+    )
+    args = parser.parse_args()
+
+    index = ArxivIndex(
+        args.path,
+        categories=args.category or DEFAULT_CATEGORIES,
+        initial_days=args.initial_days,
+    )
+    for category, count in index.sync(max_results=args.max_results).items():
+        print(f"{category}: {count} new papers")
+    print(f"{index.status()['papers']} papers indexed in {args.path}")
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
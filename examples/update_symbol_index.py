@@ -0,0 +1,66 @@
+import argparse
+import csv
+import os
+import sys
+import urllib.request
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.tools.symbol_resolver import (
+    DEFAULT_INDEX,
+    load_index,
+    parse_nasdaq_listing,
+    write_index,
+)
+
+NASDAQ_LISTING = "https://www.nasdaqtrader.com/dynamic/SymDir/nasdaqtraded.txt"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Rebuild the symbol index: curated entries first, then every "
+            "US-listed issuer from NASDAQ Trader and any extra CSVs"
+        )
+    )
+    parser.add_argument("--output", default=DEFAULT_INDEX)
+    parser.add_argument(
+        "--seed", default=DEFAULT_INDEX, help="curated rows kept first (aliases win)"
+    )
+    parser.add_argument("--listing-url", default=NASDAQ_LISTING)
+    parser.add_argument("--no-listing", action="store_true")
+    parser.add_argument(
+        "--csv",
+        action="append",
+        default=[],
+        help="extra symbol,name[,aliases] CSV (e.g. a KRX or TSE export)",
+    )
+    args = parser.parse_args()
+
+    # Curated rows are the first part of the current file; keep them on top
+    rows = list(load_index(args.seed)) if os.path.exists(args.seed) else []
+    print(f"seed: {len(rows)} rows")
+
+    for path in args.csv:
+        with open(path, newline="", encoding="utf-8") as f:
+            extra = [
+                (r[0], r[1], r[2].split("|") if len(r) > 2 and r[2] else [])
+                for r in csv.reader(f)
+                if len(r) >= 2 and r[0] != "symbol"
+            ]
+        print(f"{path}: {len(extra)} rows")
+        rows.extend(extra)
+
+    if not args.no_listing:
+        with urllib.request.urlopen(args.listing_url, timeout=60) as response:
+            lines = response.read().decode("utf-8", errors="replace").splitlines()
+        listing = list(parse_nasdaq_listing(lines))
+        print(f"{args.listing_url}: {len(listing)} rows")
+        rows.extend(listing)
+
+    write_index(args.output, rows)
+    print(f"{len({r[0] for r in rows})} symbols written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
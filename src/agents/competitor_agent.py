@@ -1,18 +1,38 @@
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
-import boto3
-from langchain.agents import AgentExecutor, create_react_agent
-from langchain.prompts import PromptTemplate
-from langchain_aws import ChatBedrock
+from langchain_core.prompts import PromptTemplate
+
+from .model_routing import bullets_check, get_route_llm
+from .prefetch import (
+    PREFETCH,
+    REACT,
+    agent_mode,
+    arun_tools,
+    extract_companies,
+    format_observations,
+    react_executor,
+    run_tools,
+)
 
 
 class CompetitorIntelAgent:
 
-    def __init__(self, news_tool, research_tool, config: Dict):
-        self.llm = ChatBedrock(
-            client=boto3.client("bedrock-runtime", region_name=config["region"]),
-            model_id=config["model_id"],
-            model_kwargs={"temperature": 0.1, "max_tokens": 2000},
+    def __init__(
+        self,
+        news_tool,
+        research_tool,
+        config: Dict,
+        company_tickers: Optional[Dict[str, str]] = None,
+    ):
+        self.mode = agent_mode(config, "competitor")
+        # Prefetch answers are parsed into bullet points (cascade check)
+        self.llm = get_route_llm(
+            config,
+            "competitor",
+            self.mode,
+            check=bullets_check if self.mode == PREFETCH else None,
+            temperature=0.1,
+            max_tokens=2000,
         )
 
         self.tools = [news_tool, research_tool]
@@ -44,34 +64,88 @@ Thought: {agent_scratchpad}
 """
         )
 
-        self.agent = create_react_agent(
-            llm=self.llm, tools=self.tools, prompt=self.prompt
+        # "prefetch" mode: news (narrowed to the companies named in the
+        # query) and arXiv searched concurrently, then one LLM call
+        self.executor = (
+            react_executor(self.llm, self.tools, self.prompt)
+            if self.mode == REACT
+            else None
         )
+        self.company_tickers = company_tickers
+        self.prefetch_prompt = PromptTemplate.from_template(
+            """
+You are a competitive intelligence analyst for the battery industry.
+
+Summarize competitor activities and market trends from the tool results
+below as bullet points.
 
-        self.executor = AgentExecutor(
-            agent=self.agent,
-            tools=self.tools,
-            verbose=False,
-            max_iterations=3,
-            handle_parsing_errors=True,
+Question: {input}
+
+Tool results:
+{observations}
+
+Answer:
+"""
         )
 
     def analyze(self, query: str, context: str = "") -> List[str]:
         full_query = f"{query}\n\nContext: {context}" if context else query
 
         try:
+            if self.mode == PREFETCH:
+                observations = run_tools(self._tool_calls(query, full_query))
+                output = (self.prefetch_prompt | self.llm).invoke(
+                    {
+                        "input": full_query,
+                        "observations": format_observations(observations),
+                    }
+                )
+                return self._parse_insights(output.content)
+
             result = self.executor.invoke({"input": full_query})
-            output = result.get("output", "")
+            return self._parse_insights(result.get("output", ""))
+
+        except Exception as e:
+            return [f"Competitor Agent Error: {str(e)}"]
 
-            insights = []
-            for line in output.split("\n"):
-                line = line.strip()
-                if line and (
-                    line.startswith("-") or line.startswith("•") or line.startswith("*")
-                ):
-                    insights.append(line.lstrip("-•* "))
+    async def aanalyze(self, query: str, context: str = "") -> List[str]:
+        full_query = f"{query}\n\nContext: {context}" if context else query
 
-            return insights if insights else [output]
+        try:
+            if self.mode == PREFETCH:
+                observations = await arun_tools(self._tool_calls(query, full_query))
+                output = await (self.prefetch_prompt | self.llm).ainvoke(
+                    {
+                        "input": full_query,
+                        "observations": format_observations(observations),
+                    }
+                )
+                return self._parse_insights(output.content)
+
+            result = await self.executor.ainvoke({"input": full_query})
+            return self._parse_insights(result.get("output", ""))
 
         except Exception as e:
             return [f"Competitor Agent Error: {str(e)}"]
+
+    def _tool_calls(self, query: str, text: str) -> List[Tuple[str, object, str]]:
+        news_tool, research_tool = self.tools
+        companies = extract_companies(text, self.company_tickers)
+        news_query = (
+            " OR ".join(company.replace("_", " ") for company in companies) or query
+        )
+        return [
+            (news_tool.name, news_tool, news_query),
+            (research_tool.name, research_tool, query),
+        ]
+
+    def _parse_insights(self, output: str) -> List[str]:
+        insights = []
+        for line in output.split("\n"):
+            line = line.strip()
+            if line and (
+                line.startswith("-") or line.startswith("•") or line.startswith("*")
+            ):
+                insights.append(line.lstrip("-•* "))
+
+        return insights if insights else [output]
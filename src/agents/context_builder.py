@@ -0,0 +1,213 @@
+import json
+import math
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+STOPWORDS = {
+    "a",
+    "an",
+    "and",
+    "are",
+    "as",
+    "at",
+    "by",
+    "for",
+    "from",
+    "how",
+    "in",
+    "is",
+    "it",
+    "its",
+    "of",
+    "on",
+    "or",
+    "s",
+    "the",
+    "to",
+    "what",
+    "with",
+}
+
+# Prompt inputs built from agent outputs; earlier sections win duplicates
+SECTIONS = ("research_findings", "financial_analysis", "competitor_insights")
+
+# Smallest useful cut of an item too long for what is left of its budget
+MIN_TRUNCATED_TOKENS = 16
+
+TRUNCATION_MARK = " …"
+
+
+def approx_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for Claude on English)"""
+    return math.ceil(len(text) / 4)
+
+
+def _words(text: str) -> set:
+    return {
+        w
+        for w in re.sub(r"[^a-z0-9]+", " ", text.lower()).split()
+        if w not in STOPWORDS
+    }
+
+
+class ContextBuilder:
+    """Fit agent outputs into a token budget for the synthesis prompt
+
+    Research findings, competitor insights and the lines of the financial
+    analysis are treated as items: near-duplicates across agents are dropped
+    (word-set Jaccard >= dedup_threshold, first occurrence wins), the
+    budget is split across sections with unused share passed on, and each
+    section keeps its most query-relevant items in their original order.
+    The best-ranked item that does not fit is cut to the budget left (a
+    long prose answer arrives as one item) rather than dropped. Other
+    financial fields are kept as compact JSON.
+
+    build() returns the prompt inputs plus per-section usage:
+    {"research_findings": {"tokens", "items", "dropped", "truncated",
+     "duplicates"}, ..., "total_tokens", "budget"}.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 6000,
+        count_tokens: Optional[Callable[[str], int]] = None,
+        dedup_threshold: float = 0.8,
+    ):
+        self.max_tokens = max_tokens
+        self.count_tokens = count_tokens or approx_tokens
+        self.dedup_threshold = dedup_threshold
+
+    def build(self, state: Dict) -> Tuple[Dict[str, str], Dict]:
+        financial = state.get("financial_analysis") or {}
+        if not isinstance(financial, dict):
+            financial = {"analysis": str(financial)}
+        analysis = financial.get("analysis")
+        financial_rest = {k: v for k, v in financial.items() if k != "analysis"}
+
+        items = {
+            "research_findings": list(state.get("research_findings") or []),
+            "financial_analysis": (
+                [line for line in analysis.split("\n") if line.strip()]
+                if isinstance(analysis, str)
+                else []
+            ),
+            "competitor_insights": list(state.get("competitor_insights") or []),
+        }
+        duplicates = self._dedupe(items)
+
+        # Fixed cost of the financial fields other than the analysis text
+        overhead = {
+            "research_findings": 0,
+            "financial_analysis": self.count_tokens(
+                self._financial_json(financial_rest, None)
+            ),
+            "competitor_insights": 0,
+        }
+        budgets = self._allocate(items, overhead)
+
+        query_words = _words(state.get("query", ""))
+        kept, truncated = {}, {}
+        for section in SECTIONS:
+            kept[section], truncated[section] = self._select(
+                items[section], budgets[section], query_words
+            )
+
+        inputs = {
+            "research_findings": "\n".join(kept["research_findings"]),
+            "financial_analysis": self._financial_json(
+                financial_rest,
+                "\n".join(kept["financial_analysis"]) if analysis is not None else None,
+            ),
+            "competitor_insights": "\n".join(kept["competitor_insights"]),
+        }
+
+        usage = {
+            section: {
+                "tokens": self.count_tokens(inputs[section]),
+                "items": len(kept[section]),
+                "dropped": len(items[section]) - len(kept[section]),
+                "truncated": truncated[section],
+                "duplicates": duplicates[section],
+            }
+            for section in SECTIONS
+        }
+        usage["total_tokens"] = sum(usage[s]["tokens"] for s in SECTIONS)
+        usage["budget"] = self.max_tokens
+        return inputs, usage
+
+    def _dedupe(self, items: Dict[str, List[str]]) -> Dict[str, int]:
+        seen: List[set] = []
+        duplicates = {}
+        for section in SECTIONS:
+            unique = []
+            for item in items[section]:
+                words = _words(item)
+                if words and any(
+                    len(words & other) / len(words | other) >= self.dedup_threshold
+                    for other in seen
+                ):
+                    continue
+                seen.append(words)
+                unique.append(item)
+            duplicates[section] = len(items[section]) - len(unique)
+            items[section] = unique
+        return duplicates
+
+    def _allocate(self, items: Dict[str, List[str]], overhead: Dict[str, int]) -> Dict:
+        """Equal shares of the budget; sections needing less pass the rest on"""
+        needs = {
+            section: sum(self.count_tokens(item) + 1 for item in items[section])
+            for section in SECTIONS
+        }
+        remaining = max(0, self.max_tokens - sum(overhead.values()))
+        budgets = {}
+        pending = sorted(SECTIONS, key=lambda s: needs[s])
+        while pending:
+            share = remaining // len(pending)
+            section = pending.pop(0)
+            budgets[section] = min(needs[section], share)
+            remaining -= budgets[section]
+        return budgets
+
+    def _select(
+        self, items: List[str], budget: int, query_words: set
+    ) -> Tuple[List[str], int]:
+        """Most query-relevant items that fit, in their original order
+
+        Also returns how many items were truncated (0 or 1).
+        """
+        ranked = sorted(
+            range(len(items)),
+            key=lambda i: (-len(_words(items[i]) & query_words), i),
+        )
+        chosen, used, truncated = {}, 0, 0
+        for i in ranked:
+            cost = self.count_tokens(items[i]) + 1
+            if used + cost <= budget:
+                chosen[i] = items[i]
+                used += cost
+            elif not truncated and budget - used - 1 >= MIN_TRUNCATED_TOKENS:
+                chosen[i] = self._truncate(items[i], budget - used - 1)
+                used += self.count_tokens(chosen[i]) + 1
+                truncated = 1
+        return [chosen[i] for i in sorted(chosen)], truncated
+
+    def _truncate(self, text: str, max_tokens: int) -> str:
+        """Longest word-boundary prefix of text, marked, within max_tokens"""
+        low, high = 0, len(text)
+        while low < high:
+            mid = (low + high + 1) // 2
+            if self.count_tokens(text[:mid] + TRUNCATION_MARK) <= max_tokens:
+                low = mid
+            else:
+                high = mid - 1
+        cut = text[:low]
+        if low < len(text) and " " in cut:
+            cut = cut[: cut.rindex(" ")]
+        return cut.rstrip() + TRUNCATION_MARK
+
+    def _financial_json(self, rest: Dict, analysis: Optional[str]) -> str:
+        data = dict(rest)
+        if analysis is not None:
+            data["analysis"] = analysis
+        return json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=str)
@@ -1,17 +1,26 @@
-from typing import Dict
+from typing import Dict, List, Tuple
 
-import boto3
-from langchain.agents import AgentExecutor, Tool, create_react_agent
-from langchain.prompts import PromptTemplate
-from langchain_aws import ChatBedrock
+from langchain_core.prompts import PromptTemplate
+
+from .model_routing import get_route_llm
+from .prefetch import (
+    PREFETCH,
+    REACT,
+    agent_mode,
+    arun_tools,
+    company_tickers_of,
+    extract_companies,
+    format_observations,
+    react_executor,
+    run_tools,
+)
 
 
 class FinancialAnalystAgent:
     def __init__(self, finance_tool, config: Dict):
-        self.llm = ChatBedrock(
-            client=boto3.client("bedrock-runtime", region_name=config["region"]),
-            model_id=config["model_id"],
-            model_kwargs={"temperature": 0.1, "max_tokens": 2000},
+        self.mode = agent_mode(config, "financial")
+        self.llm = get_route_llm(
+            config, "financial", self.mode, temperature=0.1, max_tokens=2000
         )
 
         self.tools = [finance_tool]
@@ -43,23 +52,70 @@ Thought:{agent_scratchpad}
 """
         )
 
-        self.agent = create_react_agent(
-            llm=self.llm, tools=self.tools, prompt=self.prompt
+        # "prefetch" mode: look up every company named in the query, then
+        # one LLM call
+        self.executor = (
+            react_executor(self.llm, self.tools, self.prompt)
+            if self.mode == REACT
+            else None
         )
+        self.company_tickers = company_tickers_of(finance_tool)
+        self.prefetch_prompt = PromptTemplate.from_template(
+            """
+You are a financial analyst specializing in battery industry economics.
 
-        self.executor = AgentExecutor(
-            agent=self.agent,
-            tools=self.tools,
-            verbose=False,
-            max_iterations=3,
-            handle_parsing_errors=True,
+Analyze financial performance using the tool results below.
+
+Question: {input}
+
+Tool results:
+{observations}
+
+Answer:
+"""
         )
 
     def analyze(self, query: str, context: str = "") -> Dict:
         full_query = f"{query}\n\nContext: {context}" if context else query
 
         try:
+            if self.mode == PREFETCH:
+                observations = run_tools(self._tool_calls(full_query))
+                output = (self.prefetch_prompt | self.llm).invoke(
+                    {
+                        "input": full_query,
+                        "observations": format_observations(observations),
+                    }
+                )
+                return {"analysis": output.content, "status": "success"}
+
             result = self.executor.invoke({"input": full_query})
             return {"analysis": result.get("output", ""), "status": "success"}
         except Exception as e:
             return {"analysis": f"Financial Agent Error: {str(e)}", "status": "error"}
+
+    async def aanalyze(self, query: str, context: str = "") -> Dict:
+        full_query = f"{query}\n\nContext: {context}" if context else query
+
+        try:
+            if self.mode == PREFETCH:
+                observations = await arun_tools(self._tool_calls(full_query))
+                output = await (self.prefetch_prompt | self.llm).ainvoke(
+                    {
+                        "input": full_query,
+                        "observations": format_observations(observations),
+                    }
+                )
+                return {"analysis": output.content, "status": "success"}
+
+            result = await self.executor.ainvoke({"input": full_query})
+            return {"analysis": result.get("output", ""), "status": "success"}
+        except Exception as e:
+            return {"analysis": f"Financial Agent Error: {str(e)}", "status": "error"}
+
+    def _tool_calls(self, text: str) -> List[Tuple[str, object, str]]:
+        tool = self.tools[0]
+        return [
+            (f"{tool.name}: {company}", tool, company)
+            for company in extract_companies(text, self.company_tickers)
+        ]
@@ -0,0 +1,143 @@
+import json
+import threading
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+from .rate_limit import AdaptiveRateLimiter, RateLimitedChatModel
+
+# boto3 and langchain_aws load on first use, not at import
+if TYPE_CHECKING:
+    from langchain_aws import ChatBedrock
+
+DEFAULT_MAX_POOL_CONNECTIONS = 50
+
+_lock = threading.Lock()
+_clients: Dict[Tuple[str, int], object] = {}
+_llms: Dict[Tuple[int, str, str], "ChatBedrock"] = {}
+_limiters: Dict[Tuple[str, str], AdaptiveRateLimiter] = {}
+
+# config["rate_limit"] keys for the limiter; the rest configure retries
+_LIMITER_SETTINGS = ("requests_per_second", "tokens_per_minute", "burst")
+
+
+def _chat_bedrock():
+    """ChatBedrock class, imported on first use (tests may patch it here)"""
+    if "ChatBedrock" not in globals():
+        from langchain_aws import ChatBedrock
+
+        globals()["ChatBedrock"] = ChatBedrock
+    return globals()["ChatBedrock"]
+
+
+def __getattr__(name: str):
+    # Keeps llm_registry.ChatBedrock working without importing langchain_aws
+    if name == "ChatBedrock":
+        return _chat_bedrock()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_bedrock_client(
+    region: str, max_pool_connections: int = None, max_attempts: Optional[int] = None
+):
+    """Process-wide bedrock-runtime client per (region, pool size, attempts)
+
+    boto3 clients are thread-safe, so every agent and workflow in the process
+    shares one connection pool instead of opening its own. max_attempts
+    caps botocore's attempts including the first call (1 disables its
+    retries); None keeps botocore's default retry policy.
+    """
+    import boto3
+    from botocore.config import Config
+
+    pool_size = max_pool_connections or DEFAULT_MAX_POOL_CONNECTIONS
+    key = (region, pool_size, max_attempts)
+
+    with _lock:
+        if key not in _clients:
+            # botocore's "max_attempts" counts retries only; the total is
+            # what must be 1 for the caller to own every retry
+            retries = (
+                {"mode": "standard", "total_max_attempts": max_attempts}
+                if max_attempts is not None
+                else None
+            )
+            _clients[key] = boto3.client(
+                "bedrock-runtime",
+                region_name=region,
+                config=Config(max_pool_connections=pool_size, retries=retries),
+            )
+        return _clients[key]
+
+
+def get_llm(config: Dict, **model_kwargs) -> "ChatBedrock":
+    """Shared ChatBedrock keyed by (client, model_id, model_kwargs)
+
+    The client (get_bedrock_client) already encodes region, pool size and
+    retry policy, so configs differing in any of those get their own model.
+
+    config supplies "region", "model_id" and optionally
+    "max_pool_connections"; model_kwargs are the Bedrock inference params
+    (temperature, max_tokens, ...). With config["cassette"] set, the model
+    is wrapped for record/replay (see src.cassette). config["llm_factory"],
+    a callable taking (model_id, **model_kwargs), replaces Bedrock entirely
+    (fake models for benchmarks); such models are not shared.
+
+    With config["rate_limit"] (e.g. {"requests_per_second": 2,
+    "tokens_per_minute": 200000}) every model for the same (region,
+    model_id) goes through one AdaptiveRateLimiter and throttled calls are
+    retried with jittered backoff ("max_retries", "backoff_base",
+    "backoff_cap"); botocore's own retries are then turned off so every
+    attempt is paced by the limiter.
+    """
+    region = config["region"]
+    model_id = config["model_id"]
+    factory = config.get("llm_factory")
+    rate_limit = config.get("rate_limit")
+
+    if factory is not None:
+        llm = factory(model_id, **model_kwargs)
+    else:
+        client = get_bedrock_client(
+            region, config.get("max_pool_connections"), 1 if rate_limit else None
+        )
+        key = (id(client), model_id, json.dumps(model_kwargs, sort_keys=True))
+
+        with _lock:
+            if key not in _llms:
+                _llms[key] = _chat_bedrock()(
+                    client=client, model_id=model_id, model_kwargs=dict(model_kwargs)
+                )
+            llm = _llms[key]
+
+    if rate_limit:
+        llm = RateLimitedChatModel(
+            inner=llm,
+            limiter=get_rate_limiter(region, model_id, rate_limit),
+            **{k: v for k, v in rate_limit.items() if k not in _LIMITER_SETTINGS},
+        )
+
+    cassette = config.get("cassette")
+    if cassette is not None:
+        return cassette.wrap_llm(llm, model_id)
+    return llm
+
+
+def get_rate_limiter(region: str, model_id: str, settings: Dict) -> AdaptiveRateLimiter:
+    """Process-wide limiter per (region, model_id), i.e. per Bedrock quota
+
+    The settings of the first caller win; later callers share its limiter.
+    """
+    with _lock:
+        key = (region, model_id)
+        if key not in _limiters:
+            _limiters[key] = AdaptiveRateLimiter(
+                **{k: v for k, v in settings.items() if k in _LIMITER_SETTINGS}
+            )
+        return _limiters[key]
+
+
+def clear_registry():
+    """Drop all shared clients, models and limiters (tests, credential rotation)"""
+    with _lock:
+        _clients.clear()
+        _llms.clear()
+        _limiters.clear()
@@ -0,0 +1,339 @@
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+
+from .context_builder import approx_tokens
+from .llm_registry import get_llm
+
+# langchain's ReAct output parser pattern: a step must name an action and its input
+_REACT_ACTION = re.compile(
+    r"Action\s*\d*\s*:[\s]*(.*?)[\s]*Action\s*\d*\s*Input\s*\d*\s*:[\s]*(.*)",
+    re.DOTALL,
+)
+
+# Phrases that mean the model is not confident in its answer
+UNCERTAIN_MARKERS = (
+    "i don't know",
+    "i do not know",
+    "i'm not sure",
+    "i am not sure",
+    "i cannot determine",
+    "unable to determine",
+    "insufficient information",
+    "not enough information",
+)
+
+
+def confidence_check(text: str) -> Optional[str]:
+    """Reason to escalate, or None if the answer looks usable"""
+    if not text.strip():
+        return "empty output"
+    lower = text.lower()
+    for marker in UNCERTAIN_MARKERS:
+        if marker in lower:
+            return f"low confidence ({marker!r})"
+    return None
+
+
+def react_check(text: str) -> Optional[str]:
+    """A ReAct step must be an Action/Action Input pair or a Final Answer"""
+    if "Final Answer:" in text:
+        return confidence_check(text.split("Final Answer:")[-1])
+    if _REACT_ACTION.search(text) is None:
+        return "unparseable ReAct step"
+    return None
+
+
+def bullets_check(text: str) -> Optional[str]:
+    """Answers parsed into findings must contain bullet points"""
+    if not any(line.strip().startswith(("-", "•", "*")) for line in text.split("\n")):
+        return "no bullet points"
+    return confidence_check(text)
+
+
+def closing_check(text: str) -> Optional[str]:
+    """The sectioned-synthesis closing call must keep its headings"""
+    lower = text.lower()
+    if "executive summary" not in lower or "recommendations" not in lower:
+        return "missing section headings"
+    return confidence_check(text)
+
+
+# Step type -> default acceptance check for cascades
+STEP_CHECKS = {"react": react_check, "closing": closing_check}
+
+# Route settings that are not Bedrock inference parameters
+_ROUTE_KEYS = ("model_id", "cascade")
+
+
+class RouteStats:
+    """Thread-safe per-route counters: calls, escalations, latency, tokens
+
+    Each route also breaks its attempts down by model, so a cascade shows
+    how often the small model was enough and what each tier cost.
+    """
+
+    def __init__(self):
+        self._routes: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        route: str,
+        model_id: str,
+        seconds: float,
+        input_tokens: int,
+        output_tokens: int,
+        accepted: bool,
+    ):
+        with self._lock:
+            stats = self._routes.setdefault(
+                route,
+                {
+                    "calls": 0,
+                    "escalations": 0,
+                    "latency_s": 0.0,
+                    "input_tokens": 0,
+                    "output_tokens": 0,
+                    "models": {},
+                },
+            )
+            model = stats["models"].setdefault(
+                model_id,
+                {"attempts": 0, "accepted": 0, "latency_s": 0.0, "output_tokens": 0},
+            )
+            stats["calls"] += accepted
+            stats["escalations"] += not accepted
+            stats["latency_s"] += seconds
+            stats["input_tokens"] += input_tokens
+            stats["output_tokens"] += output_tokens
+            model["attempts"] += 1
+            model["accepted"] += accepted
+            model["latency_s"] += seconds
+            model["output_tokens"] += output_tokens
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Copy of all routes with mean latency per call added"""
+        with self._lock:
+            result = {}
+            for route, stats in self._routes.items():
+                result[route] = {
+                    **stats,
+                    "models": {k: dict(v) for k, v in stats["models"].items()},
+                    "mean_latency_s": stats["latency_s"] / max(1, stats["calls"]),
+                }
+            return result
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+
+# Process-wide default; config["route_stats"] may supply its own
+ROUTE_STATS = RouteStats()
+
+
+def route_stats() -> Dict[str, Dict]:
+    return ROUTE_STATS.snapshot()
+
+
+class CascadeChatModel(BaseChatModel):
+    """Chat model trying `models` in order until `check` accepts the output
+
+    check(text) returns None to accept or a reason to escalate; exceptions
+    from any model but the last also escalate. The last model's answer is
+    returned even if rejected. Every attempt is recorded in `stats` under
+    `route`. A single-model route streams normally; a real cascade must
+    see the whole answer before accepting it, so it streams it as one
+    chunk.
+    """
+
+    models: List[Any]
+    model_ids: List[str]
+    route: str
+    check: Optional[Callable[[str], Optional[str]]] = None
+    stats: Any = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "cascade"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"route": self.route, "model_ids": self.model_ids}
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        for tier, model in enumerate(self.models):
+            start = time.perf_counter()
+            try:
+                result = model._generate(
+                    messages, stop=stop, run_manager=run_manager, **kwargs
+                )
+            except Exception:
+                if tier == len(self.models) - 1:
+                    raise
+                self._record(tier, messages, None, start, accepted=False)
+                continue
+            if self._accept(tier, messages, result, start):
+                return result
+        return result
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        for tier, model in enumerate(self.models):
+            start = time.perf_counter()
+            try:
+                result = await model._agenerate(
+                    messages, stop=stop, run_manager=run_manager, **kwargs
+                )
+            except Exception:
+                if tier == len(self.models) - 1:
+                    raise
+                self._record(tier, messages, None, start, accepted=False)
+                continue
+            if self._accept(tier, messages, result, start):
+                return result
+        return result
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        inner = self.models[0]
+        if len(self.models) > 1 or type(inner)._stream is BaseChatModel._stream:
+            result = self._generate(messages, stop, run_manager, **kwargs)
+            message = result.generations[0].message
+            yield ChatGenerationChunk(
+                message=AIMessageChunk(
+                    content=message.content,
+                    usage_metadata=getattr(message, "usage_metadata", None),
+                )
+            )
+            return
+
+        start = time.perf_counter()
+        text, usage = [], None
+        for chunk in inner._stream(
+            messages, stop=stop, run_manager=run_manager, **kwargs
+        ):
+            text.append(chunk.text)
+            usage = getattr(chunk.message, "usage_metadata", None) or usage
+            yield chunk
+        self._record(0, messages, ("".join(text), usage), start, accepted=True)
+
+    def _accept(self, tier: int, messages, result: ChatResult, start: float) -> bool:
+        message = result.generations[0].message
+        text = content_text(message.content)
+        last = tier == len(self.models) - 1
+        accepted = last or self.check is None or self.check(text) is None
+        usage = getattr(message, "usage_metadata", None)
+        self._record(tier, messages, (text, usage), start, accepted=accepted)
+        return accepted
+
+    def _record(self, tier: int, messages, output, start: float, accepted: bool):
+        if self.stats is None:
+            return
+        text, usage = output or ("", None)
+        input_tokens = (usage or {}).get("input_tokens") or sum(
+            approx_tokens(str(m.content)) for m in messages
+        )
+        output_tokens = (usage or {}).get("output_tokens") or approx_tokens(text)
+        self.stats.record(
+            self.route,
+            self.model_ids[tier],
+            time.perf_counter() - start,
+            input_tokens,
+            output_tokens if output else 0,
+            accepted,
+        )
+
+
+def content_text(content) -> str:
+    """Plain text of a message's content, a string or a list of blocks"""
+    if isinstance(content, str):
+        return content
+    # Content blocks (e.g. Anthropic messages API): keep the text parts
+    return "".join(
+        block.get("text", "") if isinstance(block, dict) else str(block)
+        for block in content
+    )
+
+
+def route_settings(config: Dict, agent: str, step: str) -> Dict:
+    """Merged config["model_routes"] entries, most specific last
+
+    Keys, from general to specific: "default", the step ("react",
+    "prefetch", "report", "section", "closing"), the agent ("research")
+    and "agent.step" ("research.react").
+    """
+    routes = config.get("model_routes") or {}
+    settings = {}
+    for key in ("default", step, agent, f"{agent}.{step}"):
+        settings.update(routes.get(key) or {})
+    return settings
+
+
+def get_route_llm(
+    config: Dict,
+    agent: str,
+    step: str,
+    check: Optional[Callable[[str], Optional[str]]] = None,
+    **model_kwargs,
+):
+    """Model for one agent step, routed through config["model_routes"]
+
+    Without "model_routes" this is get_llm(config, **model_kwargs). With
+    it, the route may set "model_id" and inference parameters (e.g.
+    "max_tokens") or a "cascade": model IDs (or dicts with "model_id" and
+    parameters) from smallest to largest, tried in order until `check`
+    (default: STEP_CHECKS for the step, else confidence_check) accepts
+    the output. Calls are recorded per route in config["route_stats"]
+    (default ROUTE_STATS).
+    """
+    if "model_routes" not in config:
+        return get_llm(config, **model_kwargs)
+
+    settings = route_settings(config, agent, step)
+    params = {
+        **model_kwargs,
+        **{k: v for k, v in settings.items() if k not in _ROUTE_KEYS},
+    }
+    tiers = settings.get("cascade") or [settings.get("model_id", config["model_id"])]
+
+    models, model_ids = [], []
+    for tier in tiers:
+        tier = {"model_id": tier} if isinstance(tier, str) else dict(tier)
+        model_id = tier.pop("model_id", config["model_id"])
+        models.append(get_llm({**config, "model_id": model_id}, **{**params, **tier}))
+        model_ids.append(model_id)
+
+    return CascadeChatModel(
+        models=models,
+        model_ids=model_ids,
+        route=f"{agent}.{step}",
+        check=check or STEP_CHECKS.get(step, confidence_check),
+        stats=config.get("route_stats") or ROUTE_STATS,
+    )
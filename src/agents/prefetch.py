@@ -0,0 +1,97 @@
+import asyncio
+import json
+import re
+from typing import Dict, List, Optional, Tuple
+
+from langchain_core.runnables.config import ContextThreadPoolExecutor
+
+# Agent execution modes (config["agent_modes"], e.g. {"financial": "prefetch"})
+REACT = "react"
+PREFETCH = "prefetch"
+
+
+def agent_mode(config: Dict, agent: str) -> str:
+    mode = config.get("agent_modes", {}).get(agent, REACT)
+    if mode not in (REACT, PREFETCH):
+        raise ValueError(f"Unknown mode {mode!r} for {agent} agent")
+    return mode
+
+
+def react_executor(llm, tools: List, prompt, max_iterations: int = 3):
+    """ReAct AgentExecutor over tools; langchain.agents loads only when needed"""
+    from langchain.agents import AgentExecutor, create_react_agent
+
+    agent = create_react_agent(llm=llm, tools=tools, prompt=prompt)
+    return AgentExecutor(
+        agent=agent,
+        tools=tools,
+        verbose=False,
+        max_iterations=max_iterations,
+        handle_parsing_errors=True,
+    )
+
+
+def extract_companies(
+    text: str, company_tickers: Optional[Dict[str, str]]
+) -> List[str]:
+    """Keys of company_tickers mentioned in text ("LG Energy Solution" -> lg_energy)
+
+    A key matches when its words appear in order as whole words, so the
+    FinanceDataTool keys double as the entity dictionary.
+    """
+    words = f" {' '.join(re.sub(r'[^a-z0-9]+', ' ', text.lower()).split())} "
+    return [
+        key for key in (company_tickers or {}) if f" {key.replace('_', ' ')} " in words
+    ]
+
+
+def company_tickers_of(tool) -> Optional[Dict[str, str]]:
+    """Ticker dictionary published by FinanceDataTool.as_langchain_tool()"""
+    return (getattr(tool, "metadata", None) or {}).get("company_tickers")
+
+
+def run_tools(calls: List[Tuple[str, object, str]]) -> List[Tuple[str, object]]:
+    """Invoke (label, tool, input) calls concurrently; errors become observations"""
+
+    def call(tool, tool_input):
+        try:
+            return tool.invoke(tool_input)
+        except Exception as e:
+            return f"Error: {str(e)}"
+
+    if not calls:
+        return []
+    if len(calls) == 1:
+        label, tool, tool_input = calls[0]
+        return [(label, call(tool, tool_input))]
+
+    # Context-copying pool keeps callbacks (tracing) attached to the caller
+    with ContextThreadPoolExecutor(max_workers=len(calls)) as executor:
+        futures = [
+            (label, executor.submit(call, tool, tool_input))
+            for label, tool, tool_input in calls
+        ]
+        return [(label, future.result()) for label, future in futures]
+
+
+async def arun_tools(calls: List[Tuple[str, object, str]]) -> List[Tuple[str, object]]:
+    """Async counterpart of run_tools()"""
+
+    async def call(tool, tool_input):
+        try:
+            return await tool.ainvoke(tool_input)
+        except Exception as e:
+            return f"Error: {str(e)}"
+
+    results = await asyncio.gather(*(call(tool, inp) for _, tool, inp in calls))
+    return [(label, result) for (label, _, _), result in zip(calls, results)]
+
+
+def format_observations(observations: List[Tuple[str, object]]) -> str:
+    """Tool results as prompt text, one labelled block per call"""
+    blocks = []
+    for label, result in observations:
+        if not isinstance(result, str):
+            result = json.dumps(result, indent=2, default=str)
+        blocks.append(f"[{label}]\n{result}")
+    return "\n\n".join(blocks) if blocks else "(no tool results)"
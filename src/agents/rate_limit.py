@@ -0,0 +1,329 @@
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from langchain_core.rate_limiters import BaseRateLimiter
+
+from .context_builder import approx_tokens
+
+# Bedrock error codes that mean "slow down" rather than "this request is bad"
+THROTTLING_CODES = ("ThrottlingException", "TooManyRequestsException")
+_THROTTLING_TEXT = THROTTLING_CODES + ("Too many requests", "Rate exceeded")
+
+
+def is_throttling(error: BaseException) -> bool:
+    """True for Bedrock throttling, also when wrapped by langchain_aws
+
+    ChatBedrock re-raises botocore's ClientError as a ValueError carrying
+    its message, so the error code is matched in the text as well.
+    """
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        code = (getattr(error, "response", None) or {}).get("Error", {}).get("Code")
+        if code in THROTTLING_CODES:
+            return True
+        if any(text in str(error) for text in _THROTTLING_TEXT):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 20.0) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2^n)]"""
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+class AdaptiveRateLimiter(BaseRateLimiter):
+    """Token buckets for requests/sec and tokens/min, shared by every model
+
+    Each call takes one request and its estimated prompt tokens; the
+    difference to the real usage is settled afterwards with
+    record_tokens(), so the token balance may go negative and hold back
+    later calls. On throttling the refill rates drop by `decrease` (at most
+    once per `cooldown` seconds, so one burst of rejections counts once)
+    and recover by `increase` of the configured rate per successful call:
+    additive-increase/multiplicative-decrease keeps throughput just under
+    the quota instead of alternating between idle and error storms.
+
+    requests_per_second / tokens_per_minute of None leave that dimension
+    unlimited.
+    """
+
+    def __init__(
+        self,
+        requests_per_second: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        burst: Optional[float] = None,
+        decrease: float = 0.7,
+        increase: float = 0.05,
+        min_scale: float = 0.05,
+        cooldown: float = 1.0,
+    ):
+        self.requests_per_second = requests_per_second
+        self.tokens_per_minute = tokens_per_minute
+        self.burst = burst or max(1.0, requests_per_second or 1.0)
+        self.decrease = decrease
+        self.increase = increase
+        self.min_scale = min_scale
+        self.cooldown = cooldown
+
+        self._scale = 1.0
+        self._requests = self.burst
+        self._tokens = float(tokens_per_minute or 0)
+        self._updated = time.monotonic()
+        self._last_decrease = float("-inf")
+        self._stats = {
+            "acquired": 0,
+            "waited_s": 0.0,
+            "throttles": 0,
+            "tokens": 0,
+        }
+        self._lock = threading.Lock()
+
+    def acquire(self, *, blocking: bool = True, tokens: int = 0) -> bool:
+        start = time.monotonic()
+        while True:
+            wait = self._try_acquire(tokens)
+            if wait == 0:
+                self._waited(time.monotonic() - start)
+                return True
+            if not blocking:
+                return False
+            time.sleep(wait)
+
+    async def aacquire(self, *, blocking: bool = True, tokens: int = 0) -> bool:
+        start = time.monotonic()
+        while True:
+            wait = self._try_acquire(tokens)
+            if wait == 0:
+                self._waited(time.monotonic() - start)
+                return True
+            if not blocking:
+                return False
+            await asyncio.sleep(wait)
+
+    def record_tokens(self, delta: int):
+        """Settle the token balance once a call's real usage is known"""
+        with self._lock:
+            self._refill()
+            self._tokens -= delta
+            if self.tokens_per_minute:
+                self._tokens = min(self.tokens_per_minute, self._tokens)
+            self._stats["tokens"] += delta
+
+    def on_throttle(self):
+        with self._lock:
+            self._stats["throttles"] += 1
+            now = time.monotonic()
+            if now - self._last_decrease < self.cooldown:
+                return
+            self._last_decrease = now
+            self._refill()
+            self._scale = max(self.min_scale, self._scale * self.decrease)
+            # Whoever was about to go next waits for the slower refill
+            self._requests = min(self._requests, 0.0)
+
+    def on_success(self):
+        with self._lock:
+            self._refill()
+            self._scale = min(1.0, self._scale + self.increase)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                **self._stats,
+                "scale": self._scale,
+                "requests_per_second": (
+                    self.requests_per_second * self._scale
+                    if self.requests_per_second
+                    else None
+                ),
+                "tokens_per_minute": (
+                    self.tokens_per_minute * self._scale
+                    if self.tokens_per_minute
+                    else None
+                ),
+            }
+
+    def _try_acquire(self, tokens: int) -> float:
+        """Take a request (and tokens) if available, else seconds to wait"""
+        with self._lock:
+            self._refill()
+            waits = [0.0]
+            if self.requests_per_second and self._requests < 1:
+                rate = self.requests_per_second * self._scale
+                waits.append((1 - self._requests) / rate)
+            if self.tokens_per_minute:
+                need = max(1, min(tokens, self.tokens_per_minute))
+                if self._tokens < need:
+                    rate = self.tokens_per_minute * self._scale / 60
+                    waits.append((need - self._tokens) / rate)
+            wait = max(waits)
+            if wait == 0:
+                self._requests -= 1
+                self._tokens -= tokens
+                self._stats["acquired"] += 1
+                self._stats["tokens"] += tokens
+            return wait
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        if self.requests_per_second:
+            self._requests = min(
+                self.burst,
+                self._requests + elapsed * self.requests_per_second * self._scale,
+            )
+        if self.tokens_per_minute:
+            self._tokens = min(
+                self.tokens_per_minute,
+                self._tokens + elapsed * self.tokens_per_minute * self._scale / 60,
+            )
+
+    def _waited(self, seconds: float):
+        with self._lock:
+            self._stats["waited_s"] += seconds
+
+
+class RateLimitedChatModel(BaseChatModel):
+    """Chat model that paces `inner` through a shared limiter and retries
+    throttled calls with jittered exponential backoff"""
+
+    inner: Any
+    limiter: Any
+    max_retries: int = 5
+    backoff_base: float = 0.5
+    backoff_cap: float = 20.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "rate_limited"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"inner": getattr(self.inner, "_identifying_params", {})}
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        estimate = _prompt_tokens(messages)
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire(tokens=estimate)
+            try:
+                result = self.inner._generate(
+                    messages, stop=stop, run_manager=run_manager, **kwargs
+                )
+            except Exception as e:
+                if not self._retry(e, estimate, attempt):
+                    raise
+                time.sleep(backoff_delay(attempt, self.backoff_base, self.backoff_cap))
+                continue
+            self._settle(estimate, _result_tokens(result, estimate))
+            return result
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        estimate = _prompt_tokens(messages)
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.aacquire(tokens=estimate)
+            try:
+                result = await self.inner._agenerate(
+                    messages, stop=stop, run_manager=run_manager, **kwargs
+                )
+            except Exception as e:
+                if not self._retry(e, estimate, attempt):
+                    raise
+                await asyncio.sleep(
+                    backoff_delay(attempt, self.backoff_base, self.backoff_cap)
+                )
+                continue
+            self._settle(estimate, _result_tokens(result, estimate))
+            return result
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        estimate = _prompt_tokens(messages)
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire(tokens=estimate)
+            chunks = self.inner._stream(
+                messages, stop=stop, run_manager=run_manager, **kwargs
+            )
+            # Throttling is raised before the first chunk; later errors
+            # cannot be retried without repeating streamed text
+            try:
+                first = next(chunks, None)
+            except Exception as e:
+                if not self._retry(e, estimate, attempt):
+                    raise
+                time.sleep(backoff_delay(attempt, self.backoff_base, self.backoff_cap))
+                continue
+
+            text, usage = [], None
+            if first is not None:
+                text.append(first.text)
+                usage = _chunk_tokens(first) or usage
+                yield first
+            for chunk in chunks:
+                text.append(chunk.text)
+                usage = _chunk_tokens(chunk) or usage
+                yield chunk
+            self._settle(estimate, usage or estimate + approx_tokens("".join(text)))
+            return
+
+    def _retry(self, error: Exception, estimate: int, attempt: int) -> bool:
+        # The rejected call used no quota
+        self.limiter.record_tokens(-estimate)
+        if not is_throttling(error):
+            return False
+        self.limiter.on_throttle()
+        return attempt < self.max_retries
+
+    def _settle(self, estimate: int, used: int):
+        self.limiter.record_tokens(used - estimate)
+        self.limiter.on_success()
+
+
+def _prompt_tokens(messages: List[BaseMessage]) -> int:
+    return sum(approx_tokens(str(m.content)) for m in messages)
+
+
+def _result_tokens(result: ChatResult, estimate: int) -> int:
+    message = result.generations[0].message
+    usage = getattr(message, "usage_metadata", None)
+    if usage and usage.get("total_tokens"):
+        return usage["total_tokens"]
+    usage = (result.llm_output or {}).get("usage") or {}
+    total = usage.get("total_tokens") or (
+        usage.get("prompt_tokens", 0) + usage.get("completion_tokens", 0)
+    )
+    return total or estimate + approx_tokens(str(message.content))
+
+
+def _chunk_tokens(chunk: ChatGenerationChunk) -> Optional[int]:
+    usage = getattr(chunk.message, "usage_metadata", None)
+    return usage.get("total_tokens") if usage else None
@@ -1,19 +1,32 @@
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
-import boto3
-from langchain.agents import AgentExecutor, create_react_agent
-from langchain.prompts import PromptTemplate
-from langchain_aws import ChatBedrock
+from langchain_core.prompts import PromptTemplate
+
+from .model_routing import bullets_check, get_route_llm
+from .prefetch import (
+    PREFETCH,
+    REACT,
+    agent_mode,
+    arun_tools,
+    format_observations,
+    react_executor,
+    run_tools,
+)
 
 
 class ResearchAgent:
     """Technical research and patent analysis agent"""
 
     def __init__(self, research_tool, config: Dict):
-        self.llm = ChatBedrock(
-            client=boto3.client("bedrock-runtime", region_name=config["region"]),
-            model_id=config["model_id"],
-            model_kwargs={"temperature": 0.1, "max_tokens": 2000},
+        self.mode = agent_mode(config, "research")
+        # Prefetch answers are parsed into bullet points (cascade check)
+        self.llm = get_route_llm(
+            config,
+            "research",
+            self.mode,
+            check=bullets_check if self.mode == PREFETCH else None,
+            temperature=0.1,
+            max_tokens=2000,
         )
 
         self.tools = [research_tool]
@@ -46,16 +59,26 @@ Thought:{agent_scratchpad}
 """
         )
 
-        self.agent = create_react_agent(
-            llm=self.llm, tools=self.tools, prompt=self.prompt
+        # "prefetch" mode: search arXiv up front, then one LLM call
+        self.executor = (
+            react_executor(self.llm, self.tools, self.prompt)
+            if self.mode == REACT
+            else None
         )
+        self.prefetch_prompt = PromptTemplate.from_template(
+            """
+You are a technical research analyst specializing in battery technology.
 
-        self.executor = AgentExecutor(
-            agent=self.agent,
-            tools=self.tools,
-            verbose=False,
-            max_iterations=3,
-            handle_parsing_errors=True,
+Answer the question using the tool results below. Be concise and technical.
+List the key findings as bullet points.
+
+Question: {input}
+
+Tool results:
+{observations}
+
+Answer:
+"""
         )
 
     def analyze(self, query: str, context: str = "") -> List[str]:
@@ -63,19 +86,54 @@ Thought:{agent_scratchpad}
         full_query = f"{query}\n\nContext: {context}" if context else query
 
         try:
+            if self.mode == PREFETCH:
+                observations = run_tools(self._tool_calls(query))
+                output = (self.prefetch_prompt | self.llm).invoke(
+                    {
+                        "input": full_query,
+                        "observations": format_observations(observations),
+                    }
+                )
+                return self._parse_findings(output.content)
+
             result = self.executor.invoke({"input": full_query})
-            output = result.get("output", "")
+            return self._parse_findings(result.get("output", ""))
 
-            # Parse findings
-            findings = []
-            for line in output.split("\n"):
-                line = line.strip()
-                if line and (
-                    line.startswith("-") or line.startswith("•") or line.startswith("*")
-                ):
-                    findings.append(line.lstrip("-•* "))
+        except Exception as e:
+            return [f"Research Agent Error: {str(e)}"]
+
+    async def aanalyze(self, query: str, context: str = "") -> List[str]:
+        """Run research analysis on the event loop"""
+        full_query = f"{query}\n\nContext: {context}" if context else query
 
-            return findings if findings else [output]
+        try:
+            if self.mode == PREFETCH:
+                observations = await arun_tools(self._tool_calls(query))
+                output = await (self.prefetch_prompt | self.llm).ainvoke(
+                    {
+                        "input": full_query,
+                        "observations": format_observations(observations),
+                    }
+                )
+                return self._parse_findings(output.content)
+
+            result = await self.executor.ainvoke({"input": full_query})
+            return self._parse_findings(result.get("output", ""))
 
         except Exception as e:
             return [f"Research Agent Error: {str(e)}"]
+
+    def _tool_calls(self, query: str) -> List[Tuple[str, object, str]]:
+        tool = self.tools[0]
+        return [(tool.name, tool, query)]
+
+    def _parse_findings(self, output: str) -> List[str]:
+        findings = []
+        for line in output.split("\n"):
+            line = line.strip()
+            if line and (
+                line.startswith("-") or line.startswith("•") or line.startswith("*")
+            ):
+                findings.append(line.lstrip("-•* "))
+
+        return findings if findings else [output]
@@ -1,20 +1,80 @@
-import json
-from typing import Dict
+import asyncio
+import re
+from typing import Callable, Dict, Optional, Tuple
 
-import boto3
-from langchain.prompts import ChatPromptTemplate
-from langchain_aws import ChatBedrock
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables.config import ContextThreadPoolExecutor
+
+from .context_builder import ContextBuilder
+from .model_routing import content_text, get_route_llm
+
+# Agent name -> prompt input it fills
+AGENT_SECTIONS = {
+    "research": "research_findings",
+    "financial": "financial_analysis",
+    "competitor": "competitor_insights",
+}
+
+# Sectioned mode: agent name -> (report heading, what the section covers)
+REPORT_SECTIONS = {
+    "research": ("Technical Analysis", "technology developments and research trends"),
+    "financial": (
+        "Financial Performance",
+        "revenue, profitability and market position, citing the figures",
+    ),
+    "competitor": (
+        "Competitive Landscape",
+        "competitor moves, partnerships and market developments",
+    ),
+}
+
+# Sectioned mode: written last, from the finished agent sections
+CLOSING_SECTIONS = (
+    "Executive Summary",
+    "Strategic Recommendations",
+    "Key Risks and Opportunities",
+)
+
+_HEADING = re.compile(r"^#+\s*(?:\d+\.\s*)?(.+?)\s*$", re.MULTILINE)
 
 
 class SynthesisAgent:
-    """Synthesizes insights from all agents into final report"""
+    """Synthesizes insights from all agents into final report
+
+    config["synthesis_mode"] "single" (default) writes the whole report in
+    one call once every agent is done. "sectioned" writes each agent's
+    section from that agent's output alone (write_section, which the
+    workflow calls as soon as the agent finishes), then one short call
+    writes the executive summary, recommendations and risks from the
+    finished sections.
+    """
 
     def __init__(self, config: Dict):
-        self.llm = ChatBedrock(
-            client=boto3.client("bedrock-runtime", region_name=config["region"]),
-            model_id=config["model_id"],
-            model_kwargs={"temperature": 0.2, "max_tokens": 3000},
+        self.llm = get_route_llm(
+            config, "synthesis", "report", temperature=0.2, max_tokens=3000
         )
+        self.mode = config.get("synthesis_mode", "single")
+
+        # Token budget for the agent sections of the prompt
+        budget = config.get("synthesis_context_tokens", 6000)
+        self.context_builder = ContextBuilder(max_tokens=budget)
+
+        self.section_llm = self.closing_llm = None
+        if self.mode == "sectioned":
+            section_params = {
+                "temperature": 0.2,
+                "max_tokens": config.get("section_max_tokens", 800),
+            }
+            self.section_llm = get_route_llm(
+                config, "synthesis", "section", **section_params
+            )
+            self.closing_llm = get_route_llm(
+                config, "synthesis", "closing", **section_params
+            )
+            # Each section sees its own agent's share of the budget
+            self.section_builder = ContextBuilder(
+                max_tokens=budget // len(REPORT_SECTIONS)
+            )
 
         self.prompt = ChatPromptTemplate.from_messages(
             [
@@ -53,46 +113,296 @@ Please synthesize these insights into a comprehensive report.""",
             ]
         )
 
-    def synthesize(self, state: Dict) -> Dict:
-        """Create final report from agent outputs"""
+        self.section_prompt = ChatPromptTemplate.from_messages(
+            [
+                (
+                    "system",
+                    """You are an executive analyst writing one section of a battery industry report.
+
+Write only the "{title}" section: {scope}. Use only the analyst input below.
+Be concise, data-driven, and actionable. Do not add a heading or an introduction.
+""",
+                ),
+                ("user", "Original Query: {query}\n\nAnalyst input:\n{content}"),
+            ]
+        )
+
+        self.closing_prompt = ChatPromptTemplate.from_messages(
+            [
+                (
+                    "system",
+                    """You are an executive analyst finishing a battery industry report.
+
+The analysis sections are already written. Write the remaining sections,
+each under its markdown heading exactly as given:
+
+## Executive Summary
+(3-4 sentences)
+
+## Strategic Recommendations
+(3-5 bullet points)
+
+## Key Risks and Opportunities
+
+Be concise, data-driven, and actionable. Do not repeat the analysis sections.
+""",
+                ),
+                ("user", "Original Query: {query}\n\n{sections}"),
+            ]
+        )
+
+    def synthesize(
+        self, state: Dict, on_token: Optional[Callable[[str], None]] = None
+    ) -> Dict:
+        """Create final report from agent outputs
+
+        When on_token is given the report is streamed from the model and each
+        chunk is passed to it as it arrives; summary and recommendations are
+        still derived from the complete report. "context_usage" reports the
+        prompt tokens each section used (see ContextBuilder).
+
+        In sectioned mode, sections missing from state["report_sections"]
+        are written first (concurrently), and on_token receives the
+        assembled report section by section once the closing call is done.
+        """
+        if self.mode == "sectioned":
+            return self._synthesize_sectioned(state, on_token)
         try:
-            # Format inputs
-            research = "\n".join(state.get("research_findings", []))
-            financial = json.dumps(state.get("financial_analysis", {}), indent=2)
-            competitor = "\n".join(state.get("competitor_insights", []))
+            chain = self.prompt | self.llm
+            inputs, usage = self._build_inputs(state)
+
+            if on_token is None:
+                return self._build_report(chain.invoke(inputs).content, usage)
+
+            parts = []
+            for chunk in chain.stream(inputs):
+                text = content_text(chunk.content)
+                if text:
+                    parts.append(text)
+                    on_token(text)
+
+            return self._build_report("".join(parts), usage)
+
+        except Exception as e:
+            return self._error_report(e)
 
-            # Generate report
+    async def asynthesize(
+        self, state: Dict, on_token: Optional[Callable[[str], None]] = None
+    ) -> Dict:
+        """Create final report from agent outputs on the event loop"""
+        if self.mode == "sectioned":
+            return await self._asynthesize_sectioned(state, on_token)
+        try:
             chain = self.prompt | self.llm
-            result = chain.invoke(
-                {
-                    "query": state["query"],
-                    "research_findings": research,
-                    "financial_analysis": financial,
-                    "competitor_insights": competitor,
-                }
+            inputs, usage = self._build_inputs(state)
+
+            if on_token is None:
+                result = await chain.ainvoke(inputs)
+                return self._build_report(result.content, usage)
+
+            parts = []
+            async for chunk in chain.astream(inputs):
+                text = content_text(chunk.content)
+                if text:
+                    parts.append(text)
+                    on_token(text)
+
+            return self._build_report("".join(parts), usage)
+
+        except Exception as e:
+            return self._error_report(e)
+
+    def write_section(self, name: str, query: str, output) -> Optional[str]:
+        """One agent's report section (sectioned mode); None if the call fails"""
+        try:
+            result = (self.section_prompt | self.section_llm).invoke(
+                self._section_inputs(name, query, output)
             )
+            return content_text(result.content).strip()
+        except Exception:
+            return None
 
-            report = result.content
+    async def awrite_section(self, name: str, query: str, output) -> Optional[str]:
+        """Async counterpart of write_section()"""
+        try:
+            result = await (self.section_prompt | self.section_llm).ainvoke(
+                self._section_inputs(name, query, output)
+            )
+            return content_text(result.content).strip()
+        except Exception:
+            return None
 
-            # Extract executive summary (first paragraph)
-            exec_summary = report.split("\n\n")[0] if report else "No summary available"
+    def _section_inputs(self, name: str, query: str, output) -> Dict:
+        key = AGENT_SECTIONS[name]
+        inputs, _ = self.section_builder.build({"query": query, key: output})
+        title, scope = REPORT_SECTIONS[name]
+        return {"title": title, "scope": scope, "query": query, "content": inputs[key]}
+
+    def _synthesize_sectioned(
+        self, state: Dict, on_token: Optional[Callable[[str], None]] = None
+    ) -> Dict:
+        try:
+            sections, missing = self._known_sections(state)
+            if missing:
+                with ContextThreadPoolExecutor(max_workers=len(missing)) as executor:
+                    written = executor.map(
+                        lambda name: self.write_section(
+                            name, state["query"], state.get(AGENT_SECTIONS[name])
+                        ),
+                        missing,
+                    )
+                    sections.update(zip(missing, written))
+
+            closing = (self.closing_prompt | self.closing_llm).invoke(
+                self._closing_inputs(state, sections)
+            )
+            return self._sectioned_report(
+                sections, content_text(closing.content), on_token
+            )
+
+        except Exception as e:
+            return self._error_report(e)
+
+    async def _asynthesize_sectioned(
+        self, state: Dict, on_token: Optional[Callable[[str], None]] = None
+    ) -> Dict:
+        try:
+            sections, missing = self._known_sections(state)
+            written = await asyncio.gather(
+                *(
+                    self.awrite_section(
+                        name, state["query"], state.get(AGENT_SECTIONS[name])
+                    )
+                    for name in missing
+                )
+            )
+            sections.update(zip(missing, written))
 
-            # Extract recommendations (simplified)
-            recommendations = [
+            closing = await (self.closing_prompt | self.closing_llm).ainvoke(
+                self._closing_inputs(state, sections)
+            )
+            return self._sectioned_report(
+                sections, content_text(closing.content), on_token
+            )
+
+        except Exception as e:
+            return self._error_report(e)
+
+    def _known_sections(self, state: Dict) -> Tuple[Dict[str, str], list]:
+        """Sections already written or not writable, plus agents still to write"""
+        written = state.get("report_sections") or {}
+        statuses = state.get("agent_statuses", {})
+        sections, missing = {}, []
+        for name in REPORT_SECTIONS:
+            if written.get(name):
+                sections[name] = written[name]
+            elif statuses.get(name) == "timed_out":
+                sections[name] = (
+                    f"_Partial: the {name} analysis did not finish within its "
+                    "time budget._"
+                )
+            elif statuses.get(name) == "failed":
+                sections[name] = f"_Not available: the {name} analysis failed._"
+            else:
+                missing.append(name)
+        return sections, missing
+
+    def _closing_inputs(self, state: Dict, sections: Dict[str, Optional[str]]) -> Dict:
+        text = "\n\n".join(
+            f"## {REPORT_SECTIONS[name][0]}\n{sections[name] or '(not available)'}"
+            for name in REPORT_SECTIONS
+        )
+        return {"query": state["query"], "sections": text}
+
+    def _sectioned_report(
+        self,
+        sections: Dict[str, Optional[str]],
+        closing: str,
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> Dict:
+        closing_parts = _split_headings(closing)
+        if not any(closing_parts.get(title) for title in CLOSING_SECTIONS):
+            # Model ignored the headings: keep its text as the summary
+            closing_parts = {"Executive Summary": closing.strip()}
+
+        ordered = [
+            ("Executive Summary", closing_parts.get("Executive Summary")),
+            *(
+                (title, sections.get(name))
+                for name, (title, _) in REPORT_SECTIONS.items()
+            ),
+            *((title, closing_parts.get(title)) for title in CLOSING_SECTIONS[1:]),
+        ]
+        parts = [f"## {title}\n{body.strip()}\n" for title, body in ordered if body]
+        report = "\n".join(parts)
+        if on_token is not None:
+            for part in parts:
+                on_token(part if part is parts[-1] else part + "\n")
+
+        summary = closing_parts.get("Executive Summary") or ""
+        recommendations = closing_parts.get("Strategic Recommendations") or closing
+        return {
+            "final_report": report,
+            "executive_summary": summary.strip().split("\n\n")[0]
+            or "No summary available",
+            "recommendations": [
                 line.strip()
-                for line in report.split("\n")
+                for line in recommendations.split("\n")
                 if line.strip().startswith(("-", "•", "*"))
-            ][:5]
+            ][:5],
+            "context_usage": {},
+        }
 
-            return {
-                "final_report": report,
-                "executive_summary": exec_summary,
-                "recommendations": recommendations,
-            }
+    def _format_inputs(self, state: Dict) -> Dict:
+        return self._build_inputs(state)[0]
 
-        except Exception as e:
-            return {
-                "final_report": f"Synthesis Error: {str(e)}",
-                "executive_summary": "Error generating summary",
-                "recommendations": [],
-            }
+    def _build_inputs(self, state: Dict) -> Tuple[Dict, Dict]:
+        sections, usage = self.context_builder.build(state)
+        inputs = {"query": state["query"], **sections}
+
+        # Agents cut off by the workflow deadline
+        statuses = state.get("agent_statuses", {})
+        for name, key in AGENT_SECTIONS.items():
+            if statuses.get(name) == "timed_out":
+                inputs[key] = (
+                    f"(Not available: the {name} analysis did not finish within "
+                    "its time budget. Mark this section as partial.)"
+                )
+        return inputs, usage
+
+    def _build_report(self, report: str, context_usage: Optional[Dict] = None) -> Dict:
+        # Extract executive summary (first paragraph)
+        exec_summary = report.split("\n\n")[0] if report else "No summary available"
+
+        # Extract recommendations (simplified)
+        recommendations = [
+            line.strip()
+            for line in report.split("\n")
+            if line.strip().startswith(("-", "•", "*"))
+        ][:5]
+
+        return {
+            "final_report": report,
+            "executive_summary": exec_summary,
+            "recommendations": recommendations,
+            "context_usage": context_usage or {},
+        }
+
+    def _error_report(self, error: Exception) -> Dict:
+        return {
+            "final_report": f"Synthesis Error: {str(error)}",
+            "executive_summary": "Error generating summary",
+            "recommendations": [],
+        }
+
+
+def _split_headings(text: str) -> Dict[str, str]:
+    """Markdown heading -> body text, for the closing sections"""
+    parts = _HEADING.split(text)
+    titles = {title.lower(): title for title in CLOSING_SECTIONS}
+    sections = {}
+    for heading, body in zip(parts[1::2], parts[2::2]):
+        title = titles.get(heading.strip("*: ").lower())
+        if title is not None:
+            sections[title] = body.strip()
+    return sections
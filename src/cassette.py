@@ -0,0 +1,293 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.tools import Tool
+
+
+class CassetteMissError(KeyError):
+    """Replay asked for an interaction that was never recorded"""
+
+
+class Cassette:
+    """Record/replay store for LLM and tool calls
+
+    In "record" mode wrapped models and tools call through to the real
+    service and every request/response pair is kept (with its duration)
+    until save(). In "replay" mode the same requests are answered from the
+    cassette file without touching Bedrock, arXiv, NewsAPI or Yahoo;
+    with latency=True each answer is delayed by its recorded duration
+    (times latency_scale) so timing runs stay realistic.
+
+    Requests are matched on their content, so concurrent agents can replay
+    in any order; identical requests are served in recorded order.
+
+    Pass it to the workflow as config["cassette"].
+    """
+
+    def __init__(
+        self,
+        path: str,
+        mode: str = "replay",
+        latency: bool = False,
+        latency_scale: float = 1.0,
+    ):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.latency_scale = latency_scale
+
+        self._interactions: List[Dict] = []
+        self._by_key: Dict[str, List[Dict]] = {}
+        self._played: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        if mode == "replay":
+            with open(path) as f:
+                for interaction in json.load(f)["interactions"]:
+                    self._add(interaction)
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    def record(
+        self, kind: str, name: str, request: Any, response: Any, duration: float
+    ):
+        key = self._key(kind, name, request)
+        with self._lock:
+            self._add(
+                {
+                    "kind": kind,
+                    "name": name,
+                    "key": key,
+                    "request": request,
+                    "response": response,
+                    "duration_s": duration,
+                }
+            )
+
+    def play(self, kind: str, name: str, request: Any) -> Tuple[Any, float]:
+        key = self._key(kind, name, request)
+        with self._lock:
+            recorded = self._by_key.get(key, [])
+            index = self._played.get(key, 0)
+            if not recorded:
+                raise CassetteMissError(f"No recorded {kind} call for {name}: {key}")
+            # Past the last recording, keep serving the final answer
+            interaction = recorded[min(index, len(recorded) - 1)]
+            self._played[key] = index + 1
+
+        return interaction["response"], interaction["duration_s"]
+
+    def replay_delay(self, duration: float) -> float:
+        return duration * self.latency_scale if self.latency else 0.0
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            payload = {"version": 1, "interactions": list(self._interactions)}
+        with open(self.path, "w") as f:
+            json.dump(payload, f, indent=1, default=str)
+
+    def wrap_llm(
+        self, llm: Optional[BaseChatModel], name: str = None
+    ) -> "CassetteChatModel":
+        name = name or getattr(llm, "model_id", None) or type(llm).__name__
+        return CassetteChatModel(inner=llm, cassette=self, model_name=name)
+
+    def wrap_tool(self, tool: Tool) -> Tool:
+        cassette = self
+
+        def run(tool_input: str):
+            if not cassette.recording:
+                response, duration = cassette.play("tool", tool.name, tool_input)
+                delay = cassette.replay_delay(duration)
+                if delay:
+                    time.sleep(delay)
+                return response["output"]
+
+            start = time.perf_counter()
+            output = tool.func(tool_input)
+            cassette.record(
+                "tool",
+                tool.name,
+                tool_input,
+                {"output": _replayable(output)},
+                time.perf_counter() - start,
+            )
+            return output
+
+        return Tool(
+            name=tool.name,
+            func=run,
+            description=tool.description,
+            metadata=tool.metadata,
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if self.recording:
+            self.save()
+
+    def _add(self, interaction: Dict):
+        self._interactions.append(interaction)
+        self._by_key.setdefault(interaction["key"], []).append(interaction)
+
+    @staticmethod
+    def _key(kind: str, name: str, request: Any) -> str:
+        payload = json.dumps([kind, name, request], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class CassetteChatModel(BaseChatModel):
+    """Chat model that records through, or replays instead of, `inner`"""
+
+    inner: Optional[Any] = None
+    cassette: Any
+    model_name: str
+
+    @property
+    def _llm_type(self) -> str:
+        return "cassette"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model_name": self.model_name, "mode": self.cassette.mode}
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        request = self._request(messages, stop)
+        if not self.cassette.recording:
+            response, duration = self.cassette.play("llm", self.model_name, request)
+            delay = self.cassette.replay_delay(duration)
+            if delay:
+                time.sleep(delay)
+            return self._result(response)
+
+        start = time.perf_counter()
+        result = self.inner._generate(
+            messages, stop=stop, run_manager=run_manager, **kwargs
+        )
+        self._record(request, result, time.perf_counter() - start)
+        return result
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        request = self._request(messages, stop)
+        if not self.cassette.recording:
+            response, duration = self.cassette.play("llm", self.model_name, request)
+            delay = self.cassette.replay_delay(duration)
+            if delay:
+                await asyncio.sleep(delay)
+            return self._result(response)
+
+        start = time.perf_counter()
+        result = await self.inner._agenerate(
+            messages, stop=stop, run_manager=run_manager, **kwargs
+        )
+        self._record(request, result, time.perf_counter() - start)
+        return result
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        request = self._request(messages, stop)
+        if not self.cassette.recording:
+            response, duration = self.cassette.play("llm", self.model_name, request)
+            chunks = response.get("chunks") or [response["content"]]
+            delay = self.cassette.replay_delay(duration) / len(chunks)
+            for text in chunks:
+                if delay:
+                    time.sleep(delay)
+                chunk = ChatGenerationChunk(message=AIMessageChunk(content=text))
+                if run_manager:
+                    run_manager.on_llm_new_token(text, chunk=chunk)
+                yield chunk
+            return
+
+        start = time.perf_counter()
+        chunks = []
+        for chunk in self.inner._stream(
+            messages, stop=stop, run_manager=run_manager, **kwargs
+        ):
+            chunks.append(chunk.text)
+            yield chunk
+        self.cassette.record(
+            "llm",
+            self.model_name,
+            request,
+            {"content": "".join(chunks), "chunks": chunks},
+            time.perf_counter() - start,
+        )
+
+    def _request(self, messages: List[BaseMessage], stop: Optional[List[str]]) -> Dict:
+        return {
+            "messages": [[m.type, m.content] for m in messages],
+            "stop": stop,
+        }
+
+    def _record(self, request: Dict, result: ChatResult, duration: float):
+        message = result.generations[0].message
+        self.cassette.record(
+            "llm",
+            self.model_name,
+            request,
+            {
+                "content": message.content,
+                "usage_metadata": getattr(message, "usage_metadata", None),
+                "llm_output": result.llm_output,
+            },
+            duration,
+        )
+
+    def _result(self, response: Dict) -> ChatResult:
+        message = AIMessage(content=response["content"])
+        if response.get("usage_metadata"):
+            message.usage_metadata = response["usage_metadata"]
+        return ChatResult(
+            generations=[ChatGeneration(message=message)],
+            llm_output=response.get("llm_output"),
+        )
+
+
+def _replayable(output: Any) -> Any:
+    # Tool observations are stringified into ReAct prompts; anything that
+    # would not come back from JSON with the same repr is stored as that string
+    try:
+        restored = json.loads(json.dumps(output))
+    except (TypeError, ValueError):
+        return str(output)
+    return output if repr(restored) == repr(output) else str(output)
@@ -0,0 +1,145 @@
+import asyncio
+import hashlib
+import json
+import os
+import statistics
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set
+
+
+class BatchRunner:
+    """Run a JSONL file of queries through a workflow with bounded concurrency
+
+    Each input line is {"query": ..., "context": ..., "id": optional}.
+    Results are appended to the output JSONL as they finish, and every
+    successful ID is appended to a checkpoint file, so rerunning the same
+    command after a crash only processes what is missing. Failed queries
+    are written with an "error" field but not checkpointed, so they are
+    retried on the next run.
+    """
+
+    def __init__(
+        self,
+        workflow,
+        concurrency: int = 4,
+        checkpoint_path: Optional[str] = None,
+    ):
+        self.workflow = workflow
+        self.concurrency = concurrency
+        self.checkpoint_path = checkpoint_path
+
+    def run(self, input_path: str, output_path: str) -> Dict:
+        return asyncio.run(self.arun(input_path, output_path))
+
+    async def arun(self, input_path: str, output_path: str) -> Dict:
+        checkpoint_path = self.checkpoint_path or f"{output_path}.done"
+        records = load_records(input_path)
+        completed = load_checkpoint(checkpoint_path)
+        pending = [r for r in records if r["id"] not in completed]
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        latencies: List[float] = []
+        failures = 0
+        start = time.perf_counter()
+
+        async def process(record: Dict) -> Dict:
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    result = await self.workflow.arun(
+                        record["query"], record.get("context", "")
+                    )
+                    error = None
+                except Exception as e:
+                    result, error = {}, str(e)
+                return _output_row(record, result, error, time.perf_counter() - started)
+
+        with open(output_path, "a") as output, open(checkpoint_path, "a") as done:
+            for next_row in asyncio.as_completed([process(r) for r in pending]):
+                row = await next_row
+                _append_line(output, json.dumps(row, default=str))
+
+                if row["error"] is None:
+                    latencies.append(row["latency_s"])
+                    _append_line(done, row["id"])
+                else:
+                    failures += 1
+
+        elapsed = time.perf_counter() - start
+        return batch_stats(
+            total=len(records),
+            skipped=len(records) - len(pending),
+            failed=failures,
+            latencies=latencies,
+            elapsed=elapsed,
+        )
+
+
+def load_records(path: str) -> List[Dict]:
+    records = []
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if "id" not in record:
+                # Stable across runs so the checkpoint still matches
+                digest = hashlib.sha1(
+                    json.dumps([record["query"], record.get("context", "")]).encode()
+                ).hexdigest()
+                record["id"] = digest[:12]
+            record["id"] = str(record["id"])
+            records.append(record)
+    return records
+
+
+def load_checkpoint(path: str) -> Set[str]:
+    if not os.path.exists(path):
+        return set()
+    with open(path) as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+def batch_stats(
+    total: int, skipped: int, failed: int, latencies: List[float], elapsed: float
+) -> Dict:
+    ordered = sorted(latencies)
+    return {
+        "total": total,
+        "completed": len(ordered),
+        "skipped": skipped,
+        "failed": failed,
+        "elapsed_s": elapsed,
+        "queries_per_min": len(ordered) / elapsed * 60 if elapsed else 0.0,
+        "p50_latency_s": statistics.median(ordered) if ordered else None,
+        "p95_latency_s": _percentile(ordered, 0.95),
+    }
+
+
+def _percentile(ordered: List[float], q: float) -> Optional[float]:
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def _output_row(record: Dict, result: Dict, error: Optional[str], latency: float):
+    return {
+        "id": record["id"],
+        "query": record["query"],
+        "context": record.get("context", ""),
+        "executive_summary": result.get("executive_summary"),
+        "final_report": result.get("final_report"),
+        "recommendations": result.get("recommendations", []),
+        "agent_statuses": result.get("agent_statuses", {}),
+        "errors": result.get("errors", []),
+        "error": error,
+        "latency_s": latency,
+        "completed_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def _append_line(f, line: str):
+    f.write(line + "\n")
+    f.flush()
+    os.fsync(f.fileno())
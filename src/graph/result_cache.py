@@ -0,0 +1,266 @@
+import copy
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, FrozenSet, Optional
+
+STOPWORDS = {
+    "a",
+    "about",
+    "an",
+    "and",
+    "are",
+    "do",
+    "does",
+    "for",
+    "how",
+    "in",
+    "is",
+    "its",
+    "me",
+    "of",
+    "on",
+    "please",
+    "s",
+    "tell",
+    "the",
+    "to",
+    "what",
+    "whats",
+}
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, drop punctuation and filler words, collapse whitespace"""
+    words = re.sub(r"[^\w\s]", " ", (text or "").lower()).split()
+    return " ".join(w for w in words if w not in STOPWORDS)
+
+
+def char_ngrams(text: str, n: int = 3) -> Dict[str, float]:
+    """Sparse character n-gram counts of normalized text"""
+    padded = f" {normalize_text(text)} "
+    return dict(Counter(padded[i : i + n] for i in range(len(padded) - n + 1)))
+
+
+def key_terms(text: str) -> FrozenSet[str]:
+    """Numbers and proper nouns of a text, lowercased
+
+    A similarity hit must agree on these exactly: "Samsung SDI 2023
+    revenue" is not an answer to "... 2024 revenue", nor is a global
+    answer one to "... in Europe?". A capitalized word opening a sentence
+    only counts when it has more capitals or digits ("LG", "Q3").
+    """
+    terms = set()
+    for match in re.finditer(r"[^\W_]+", text or ""):
+        word = match.group()
+        if any(c.isdigit() for c in word):
+            terms.add(word.lower())
+            continue
+        if not word[0].isupper() or word.lower() in STOPWORDS:
+            continue
+        before = text[: match.start()].rstrip()
+        if (not before or before[-1] in ".?!") and word[1:].islower():
+            continue
+        terms.add(word.lower())
+    return frozenset(terms)
+
+
+class ResultCache:
+    """Whole-workflow result cache keyed on query and context text
+
+    Queries and contexts are normalized (case, punctuation, filler words),
+    so rephrasings like "What is X's position?" / "X position" hit exactly.
+    With similarity_threshold set, near matches are served too: both query
+    and context must reach the threshold under cosine similarity of
+    `embed` vectors (character trigrams by default; pass any local
+    embedding function instead). Numbers and proper nouns must also match
+    exactly (see key_terms), so a different year or a narrower region
+    ("... in Europe?") misses even when its score clears the threshold.
+
+    Hits come back as a copy of the stored state with
+    metadata["cache"] = {"hit": True, "match": "exact" | "similar", ...}.
+    Pass it to the workflow as config["result_cache"].
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl: float = 24 * 3600,
+        similarity_threshold: Optional[float] = None,
+        max_entries: int = 1000,
+        embed: Optional[Callable[[str], object]] = None,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.embed = embed or char_ngrams
+
+        self._entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "similar_hits": 0, "misses": 0}
+
+        self._db = None
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS result_cache ("
+                "key TEXT PRIMARY KEY, query TEXT NOT NULL, context TEXT NOT NULL, "
+                "result TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._db.commit()
+            self._load()
+
+    def lookup(self, query: str, context: str = "") -> Optional[Dict]:
+        now = time.time()
+        key = self._key(query, context)
+
+        with self._lock:
+            self._expire(now)
+
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._stats["hits"] += 1
+                return self._hit(entry, "exact", 1.0)
+
+            if self.similarity_threshold is not None and self._entries:
+                query_vector = self.embed(query)
+                context_vector = self.embed(context)
+                terms = (key_terms(query), key_terms(context))
+                best, best_score = None, 0.0
+
+                for entry in self._entries.values():
+                    if entry["key_terms"] != terms:
+                        continue
+                    score = cosine(query_vector, entry["query_vector"])
+                    if score < self.similarity_threshold or score <= best_score:
+                        continue
+                    if (
+                        cosine(context_vector, entry["context_vector"])
+                        >= self.similarity_threshold
+                    ):
+                        best, best_score = entry, score
+
+                if best is not None:
+                    self._stats["hits"] += 1
+                    self._stats["similar_hits"] += 1
+                    return self._hit(best, "similar", best_score)
+
+            self._stats["misses"] += 1
+            return None
+
+    def store(self, query: str, context: str, result: Dict):
+        result = copy.deepcopy(result)
+        # Per-run data (trace spans, previous cache flags) is not reusable
+        result["metadata"] = {
+            k: v
+            for k, v in result.get("metadata", {}).items()
+            if k not in ("trace", "cache")
+        }
+        created_at = time.time()
+        key = self._key(query, context)
+
+        with self._lock:
+            self._remember(key, query, context, result, created_at)
+            while len(self._entries) > self.max_entries:
+                oldest = min(
+                    self._entries, key=lambda k: self._entries[k]["created_at"]
+                )
+                del self._entries[oldest]
+
+            if self._db is not None:
+                self._db.execute(
+                    "DELETE FROM result_cache WHERE created_at < ?",
+                    (created_at - self.ttl,),
+                )
+                self._db.execute(
+                    "INSERT OR REPLACE INTO result_cache "
+                    "(key, query, context, result, created_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, query, context, json.dumps(result, default=str), created_at),
+                )
+                self._db.commit()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries)}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM result_cache")
+                self._db.commit()
+
+    def _remember(self, key, query, context, result, created_at):
+        self._entries[key] = {
+            "query": query,
+            "context": context,
+            "result": result,
+            "created_at": created_at,
+            "query_vector": self.embed(query),
+            "context_vector": self.embed(context),
+            "key_terms": (key_terms(query), key_terms(context)),
+        }
+
+    def _hit(self, entry: Dict, match: str, similarity: float) -> Dict:
+        result = copy.deepcopy(entry["result"])
+        result["metadata"] = {
+            **result.get("metadata", {}),
+            "cache": {
+                "hit": True,
+                "match": match,
+                "similarity": similarity,
+                "cached_query": entry["query"],
+                "age_s": time.time() - entry["created_at"],
+            },
+        }
+        return result
+
+    def _expire(self, now: float):
+        expired = [
+            k for k, e in self._entries.items() if now - e["created_at"] > self.ttl
+        ]
+        for key in expired:
+            del self._entries[key]
+
+    def _load(self):
+        cutoff = time.time() - self.ttl
+        self._db.execute("DELETE FROM result_cache WHERE created_at < ?", (cutoff,))
+        self._db.commit()
+        rows = self._db.execute(
+            "SELECT key, query, context, result, created_at FROM result_cache "
+            "WHERE created_at >= ? ORDER BY created_at DESC LIMIT ?",
+            (cutoff, self.max_entries),
+        ).fetchall()
+        for key, query, context, result, created_at in rows:
+            self._remember(key, query, context, json.loads(result), created_at)
+
+    @staticmethod
+    def _key(query: str, context: str) -> str:
+        return json.dumps([normalize_text(query), normalize_text(context)])
+
+
+def cosine(a, b) -> float:
+    """Cosine similarity of two sparse dicts or two dense sequences"""
+    if isinstance(a, dict):
+        if not a or not b:
+            return 1.0 if not a and not b else 0.0
+        if len(a) > len(b):
+            a, b = b, a
+        dot = sum(value * b.get(k, 0.0) for k, value in a.items())
+        norm = math.sqrt(sum(v * v for v in a.values())) * math.sqrt(
+            sum(v * v for v in b.values())
+        )
+        return dot / norm if norm else 0.0
+
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
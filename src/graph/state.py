@@ -1,4 +1,9 @@
-from typing import Dict, List, TypedDict
+from typing import Annotated, Dict, List, TypedDict
+
+
+def merge_dicts(left: Dict, right: Dict) -> Dict:
+    """Reducer for keys that several agent nodes update in the same step"""
+    return {**(left or {}), **(right or {})}
 
 
 class AgentState(TypedDict):
@@ -13,6 +18,10 @@ class AgentState(TypedDict):
     financial_analysis: Dict[str, any]  # Financial Agent
     competitor_insights: List[str]  # Competitor Agent
 
+    # Sectioned synthesis: agent name -> its report section, written as
+    # soon as that agent finishes ("" when it has none)
+    report_sections: Annotated[Dict[str, str], merge_dicts]
+
     # Synthesis output
     final_report: str
     executive_summary: str
@@ -20,5 +29,7 @@ class AgentState(TypedDict):
 
     # Metadata
     iteration: int
-    agent_statuses: Dict[str, str]
+    agent_statuses: Annotated[Dict[str, str], merge_dicts]  # "completed" / "failed"
+    agent_updated_at: Annotated[Dict[str, float], merge_dicts]  # epoch seconds
     errors: List[str]
+    metadata: Dict[str, any]  # e.g. "trace": latency spans of the run
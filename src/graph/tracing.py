@@ -0,0 +1,265 @@
+import json
+import threading
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, List, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+_active_tracer: ContextVar[Optional["Tracer"]] = ContextVar(
+    "active_tracer", default=None
+)
+_current_span: ContextVar[Optional[str]] = ContextVar("current_span", default=None)
+
+
+class Tracer:
+    """Collects nested latency spans for one workflow run
+
+    Spans opened with span() nest through context variables, so children
+    started in worker threads (ContextThreadPoolExecutor) or asyncio tasks
+    attach to the span that was current when they were scheduled. LLM and
+    tool calls are recorded by the LangChain callback handler from
+    callback_handler().
+    """
+
+    def __init__(self):
+        self.trace_id = uuid.uuid4().hex
+        self._spans: List[Dict] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def activate(self):
+        """Make this tracer the target of trace_span() in the current context"""
+        token = _active_tracer.set(self)
+        try:
+            yield self
+        finally:
+            _active_tracer.reset(token)
+
+    @contextmanager
+    def span(self, name: str, kind: str, **attributes):
+        span = self.start_span(name, kind, _current_span.get(), attributes)
+        token = _current_span.set(span["span_id"])
+        try:
+            yield span
+        except BaseException as e:
+            span["status"] = "error"
+            span["attributes"]["error"] = str(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            self.end_span(span)
+
+    def start_span(
+        self,
+        name: str,
+        kind: str,
+        parent_id: Optional[str] = None,
+        attributes: Optional[Dict] = None,
+    ) -> Dict:
+        span = {
+            "span_id": uuid.uuid4().hex[:16],
+            "parent_id": parent_id,
+            "name": name,
+            "kind": kind,
+            "start_time": time.time(),
+            "duration_ms": None,
+            "status": "ok",
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "attributes": dict(attributes or {}),
+            "_start": time.perf_counter(),
+        }
+        with self._lock:
+            self._spans.append(span)
+        return span
+
+    def end_span(self, span: Dict, status: Optional[str] = None):
+        span["duration_ms"] = (time.perf_counter() - span.pop("_start")) * 1000
+        if status:
+            span["status"] = status
+
+    def callback_handler(self) -> "TracingCallbackHandler":
+        return TracingCallbackHandler(self)
+
+    @property
+    def spans(self) -> List[Dict]:
+        """Finished spans with token counts rolled up into their ancestors"""
+        with self._lock:
+            spans = [
+                {k: v for k, v in span.items() if not k.startswith("_")}
+                for span in self._spans
+                if span["duration_ms"] is not None
+            ]
+
+        by_id = {span["span_id"]: span for span in spans}
+        for span in spans:
+            span["total_input_tokens"] = 0
+            span["total_output_tokens"] = 0
+        for span in spans:
+            node = span
+            while node is not None:
+                node["total_input_tokens"] += span["input_tokens"]
+                node["total_output_tokens"] += span["output_tokens"]
+                node = by_id.get(node["parent_id"])
+
+        return spans
+
+    def to_dict(self) -> Dict:
+        return {"trace_id": self.trace_id, "spans": self.spans}
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.to_dict(), default=str, **kwargs)
+
+    def to_prometheus(self, buckets=DEFAULT_BUCKETS) -> str:
+        return export_prometheus(self.spans, buckets)
+
+
+class TracingCallbackHandler(BaseCallbackHandler):
+    """Records LLM and tool calls as spans of the active tracer"""
+
+    # Called in the caller's context so the current span is the parent
+    run_inline = True
+
+    def __init__(self, tracer: Tracer):
+        self.tracer = tracer
+        self._runs: Dict[uuid.UUID, Dict] = {}
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        self._start_llm(serialized, run_id, kwargs)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self._start_llm(serialized, run_id, kwargs)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        span = self._runs.pop(run_id, None)
+        if span is None:
+            return
+        span["input_tokens"], span["output_tokens"] = _token_usage(response)
+        self.tracer.end_span(span)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._fail(run_id, error)
+
+    def on_tool_start(self, serialized, input_str, *, run_id, **kwargs):
+        name = (serialized or {}).get("name") or kwargs.get("name") or "tool"
+        self._runs[run_id] = self.tracer.start_span(
+            f"tool.{name}", "tool", _current_span.get(), {"input": str(input_str)}
+        )
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        span = self._runs.pop(run_id, None)
+        if span is not None:
+            self.tracer.end_span(span)
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._fail(run_id, error)
+
+    def _start_llm(self, serialized, run_id, kwargs):
+        metadata = kwargs.get("metadata") or {}
+        model = metadata.get("ls_model_name") or (serialized or {}).get("name", "llm")
+        self._runs[run_id] = self.tracer.start_span(
+            "llm", "llm", _current_span.get(), {"model": model}
+        )
+
+    def _fail(self, run_id, error):
+        span = self._runs.pop(run_id, None)
+        if span is not None:
+            span["attributes"]["error"] = str(error)
+            self.tracer.end_span(span, status="error")
+
+
+def current_tracer() -> Optional[Tracer]:
+    return _active_tracer.get()
+
+
+def trace_span(name: str, kind: str, **attributes):
+    """Span on the active tracer, or a no-op when nothing is being traced"""
+    tracer = _active_tracer.get()
+    if tracer is None:
+        return nullcontext()
+    return tracer.span(name, kind, **attributes)
+
+
+def export_prometheus(spans: Iterable[Dict], buckets=DEFAULT_BUCKETS) -> str:
+    """Prometheus text exposition of span latencies and LLM token counts
+
+    Accepts spans from any number of runs, so histograms can be built per
+    stage across a batch.
+    """
+    histograms: Dict[tuple, Dict[str, Any]] = {}
+    tokens: Dict[tuple, int] = {}
+
+    for span in spans:
+        labels = (span["kind"], span["name"])
+        seconds = (span["duration_ms"] or 0) / 1000
+        histogram = histograms.setdefault(
+            labels, {"buckets": [0] * len(buckets), "sum": 0.0, "count": 0}
+        )
+        for i, bound in enumerate(buckets):
+            if seconds <= bound:
+                histogram["buckets"][i] += 1
+        histogram["sum"] += seconds
+        histogram["count"] += 1
+
+        if span["kind"] == "llm":
+            model = span["attributes"].get("model", "")
+            for direction in ("input", "output"):
+                key = (model, direction)
+                tokens[key] = tokens.get(key, 0) + span[f"{direction}_tokens"]
+
+    lines = [
+        "# HELP analyst_span_duration_seconds Workflow span latency",
+        "# TYPE analyst_span_duration_seconds histogram",
+    ]
+    for (kind, name), histogram in sorted(histograms.items()):
+        label = f'kind="{kind}",name="{_escape(name)}"'
+        for bound, count in zip(buckets, histogram["buckets"]):
+            lines.append(
+                f'analyst_span_duration_seconds_bucket{{{label},le="{bound}"}} {count}'
+            )
+        lines.append(
+            f'analyst_span_duration_seconds_bucket{{{label},le="+Inf"}} '
+            f'{histogram["count"]}'
+        )
+        lines.append(f"analyst_span_duration_seconds_sum{{{label}}} {histogram['sum']}")
+        lines.append(
+            f"analyst_span_duration_seconds_count{{{label}}} {histogram['count']}"
+        )
+
+    lines.append("# HELP analyst_llm_tokens_total LLM tokens by model and direction")
+    lines.append("# TYPE analyst_llm_tokens_total counter")
+    for (model, direction), count in sorted(tokens.items()):
+        lines.append(
+            f'analyst_llm_tokens_total{{model="{_escape(model)}",'
+            f'direction="{direction}"}} {count}'
+        )
+
+    return "\n".join(lines) + "\n"
+
+
+def _token_usage(response) -> tuple:
+    usage = (response.llm_output or {}).get("usage") or {}
+    input_tokens = usage.get("prompt_tokens", usage.get("input_tokens", 0))
+    output_tokens = usage.get("completion_tokens", usage.get("output_tokens", 0))
+
+    if not (input_tokens or output_tokens):
+        # Streaming and newer integrations report usage on the message
+        for generations in response.generations:
+            for generation in generations:
+                metadata = getattr(
+                    getattr(generation, "message", None), "usage_metadata", None
+                )
+                if metadata:
+                    input_tokens += metadata.get("input_tokens", 0)
+                    output_tokens += metadata.get("output_tokens", 0)
+
+    return input_tokens or 0, output_tokens or 0
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
@@ -1,107 +1,691 @@
+import asyncio
 import concurrent.futures
-from typing import Dict
+import queue
+import re
+import time
+import uuid
+from contextlib import contextmanager
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
-from langgraph.graph import END, START, StateGraph
-
-from src.agents.competitor_agent import CompetitorIntelAgent
-from src.agents.financial_agent import FinancialAnalystAgent
-from src.agents.research_agent import ResearchAgent
-from src.agents.synthesis_agent import SynthesisAgent
 from src.graph.state import AgentState
+from src.graph.tracing import Tracer, trace_span
+
+# langgraph, the agents (langchain, Bedrock) and the tools' clients are
+# imported when a workflow is built, so importing this module stays cheap
+if TYPE_CHECKING:
+    from langchain_core.runnables import RunnableConfig, RunnableLambda
+    from langgraph.graph import StateGraph
+
+# Specialist agents and the state key each one fills
+AGENT_OUTPUTS = {
+    "research": "research_findings",
+    "financial": "financial_analysis",
+    "competitor": "competitor_insights",
+}
+
+_AGENT_ERROR = re.compile(r"^\w+( Agent)? [Ee]rror:")
+_TIMED_OUT = object()
+
+
+def agent_error(output) -> Optional[str]:
+    """Error message if an agent returned its error placeholder, else None"""
+    if isinstance(output, dict):
+        if output.get("status") == "error":
+            return output.get("analysis") or "unknown error"
+        return output.get("error")
+    if output and all(isinstance(item, str) for item in output):
+        if all(_AGENT_ERROR.match(item) for item in output):
+            return output[0]
+    return None
+
+
+def _remaining(cutoff: Optional[float]) -> Optional[float]:
+    return None if cutoff is None else max(0.0, cutoff - time.time())
+
+
+def _on_token(config: Optional[Dict]) -> Optional[Callable[[str], None]]:
+    """Report-chunk callback stream()/astream() put in the run config"""
+    return ((config or {}).get("configurable") or {}).get("on_token")
 
 
 class MultiAgentWorkflow:
+    """Research, financial and competitor agents feeding a synthesis agent
+
+    Build once and reuse: agents share pooled Bedrock clients, the graph is
+    compiled in the constructor, and all per-query data lives in the graph
+    state, so run/arun/stream may be called concurrently from threads or
+    tasks on a single instance.
+
+    Unless config["tracing"] is False, every run records nested latency
+    spans (workflow, nodes, agents, LLM and tool calls) under
+    result["metadata"]["trace"]; see src.graph.tracing for exporters.
+
+    With config["result_cache"] (a src.graph.result_cache.ResultCache),
+    repeated or near-identical queries return a stored report without
+    running the agents; result["metadata"]["cache"]["hit"] says which.
+
+    With config["checkpoint_path"], each agent runs as its own graph node
+    and every step is saved to that SQLite file under a run ID
+    (result["metadata"]["run_id"]). resume(run_id) then finishes an
+    interrupted run or reruns only the agents that failed (or are older
+    than max_age_s) before synthesizing again.
+
+    config["deadline_s"] caps a request's wall-clock time and
+    config["agent_budgets"] (e.g. {"research": 20}) caps each agent.
+    Agents still running at their cutoff are cancelled (async) or abandoned
+    (threads); synthesis goes ahead with what finished, the late agents get
+    status "timed_out" and their sections are marked partial. Synthesis
+    itself is not interrupted, so config["synthesis_reserve_s"] keeps that
+    much of the deadline free for it.
+
+    With config["synthesis_mode"] = "sectioned", each agent's report
+    section is written in that agent's own worker right after it finishes
+    (state["report_sections"]), overlapping with the agents still running;
+    the synthesis node then only makes the short closing call. Cutoffs
+    apply to the agents alone: a section still being written at its
+    agent's cutoff is dropped and written by the synthesis node instead,
+    so the agent's output is kept.
+    """
+
     def __init__(self, tools: Dict, config: Dict):
+        if config.get("cassette") is not None:
+            tools = {
+                name: config["cassette"].wrap_tool(tool) for name, tool in tools.items()
+            }
+
         self.tools = tools
         self.config = config
+        self.result_cache = config.get("result_cache")
+
+        from src.agents.competitor_agent import CompetitorIntelAgent
+        from src.agents.financial_agent import FinancialAnalystAgent
+        from src.agents.prefetch import company_tickers_of
+        from src.agents.research_agent import ResearchAgent
+        from src.agents.synthesis_agent import SynthesisAgent
+        from src.graph.checkpoint import sqlite_checkpointer
 
         self.research_agent = ResearchAgent(tools["arxiv_search"], config)
         self.financial_agent = FinancialAnalystAgent(tools["yahoo_finance"], config)
         self.competitor_agent = CompetitorIntelAgent(
-            tools["news_api"], tools["arxiv_search"], config
+            tools["news_api"],
+            tools["arxiv_search"],
+            config,
+            company_tickers=company_tickers_of(tools["yahoo_finance"]),
         )
         self.synthesis_agent = SynthesisAgent(config)
+        self.sectioned = self.synthesis_agent.mode == "sectioned"
+        self.agents = {
+            "research": self.research_agent,
+            "financial": self.financial_agent,
+            "competitor": self.competitor_agent,
+        }
 
+        self.checkpointer = (
+            sqlite_checkpointer(config["checkpoint_path"])
+            if config.get("checkpoint_path")
+            else None
+        )
         self.graph = self._build_graph()
 
-    def _build_graph(self) -> StateGraph:
+    def _build_graph(self) -> "StateGraph":
+        from langchain_core.runnables import RunnableLambda
+        from langgraph.graph import END, START, StateGraph
+
         workflow = StateGraph(AgentState)
 
-        workflow.add_node("parallel_agents", self._parallel_agents_node)
-        workflow.add_node("synthesis", self._synthesis_node)
+        # Each node has a sync and an async implementation: graph.invoke uses
+        # the thread-pool path, graph.ainvoke stays on the caller's event loop
+        if self.checkpointer is None:
+            workflow.add_node(
+                "parallel_agents",
+                RunnableLambda(
+                    self._parallel_agents_node,
+                    afunc=self._aparallel_agents_node,
+                    name="parallel_agents",
+                ),
+            )
+            workflow.add_edge(START, "parallel_agents")
+            workflow.add_edge("parallel_agents", "synthesis")
+        else:
+            # One node per agent, so each output is checkpointed as its own
+            # write and a resumed run can redo just the branches it needs
+            for name in AGENT_OUTPUTS:
+                workflow.add_node(name, self._agent_node(name))
+                workflow.add_edge(name, "synthesis")
+            workflow.add_conditional_edges(
+                START, self._route_agents, [*AGENT_OUTPUTS, "synthesis"]
+            )
 
-        workflow.add_edge(START, "parallel_agents")
-        workflow.add_edge("parallel_agents", "synthesis")
+        workflow.add_node(
+            "synthesis",
+            RunnableLambda(
+                self._synthesis_node, afunc=self._asynthesis_node, name="synthesis"
+            ),
+        )
         workflow.add_edge("synthesis", END)
 
-        return workflow.compile()
+        return workflow.compile(checkpointer=self.checkpointer)
 
-    def _parallel_agents_node(self, state: AgentState) -> Dict:
-        def run_research():
-            try:
-                return self.research_agent.analyze(
+    def _run_agent(self, name: str, state: AgentState):
+        try:
+            with trace_span(name, "agent"):
+                return self.agents[name].analyze(
                     state["query"], state.get("context", "")
                 )
-            except Exception as e:
-                return [f"Research error: {str(e)}"]
+        except Exception as e:
+            return self._agent_exception(name, e)
 
-        def run_financial():
-            try:
-                return self.financial_agent.analyze(
+    async def _arun_agent(self, name: str, state: AgentState):
+        try:
+            with trace_span(name, "agent"):
+                return await self.agents[name].aanalyze(
                     state["query"], state.get("context", "")
                 )
-            except Exception as e:
-                return {"error": f"Financial error: {str(e)}"}
+        except Exception as e:
+            return self._agent_exception(name, e)
+
+    def _run_branch(
+        self, name: str, state: AgentState, agent_done: concurrent.futures.Future
+    ) -> Optional[str]:
+        """Run the agent, hand its output to agent_done, then write its section
+
+        The caller's cutoff applies to agent_done only, so a slow section
+        call can never cost the agent's finished output.
+        """
+        output = self._run_agent(name, state)
+        agent_done.set_result(output)
+        if not self.sectioned or agent_error(output):
+            return None
+        with trace_span(name, "section"):
+            return self.synthesis_agent.write_section(name, state["query"], output)
+
+    async def _awrite_section(self, name: str, state: AgentState, output):
+        if not self.sectioned or agent_error(output):
+            return None
+        with trace_span(name, "section"):
+            return await self.synthesis_agent.awrite_section(
+                name, state["query"], output
+            )
+
+    def _agent_exception(self, name: str, error: Exception):
+        message = f"{name.capitalize()} error: {str(error)}"
+        return {"error": message} if name == "financial" else [message]
+
+    def _agent_update(self, results: Dict, timed_out: Sequence[str] = ()) -> Dict:
+        """State update for finished agents, with their real statuses
+
+        results maps agent name -> (output, report section or None).
+        """
+        now = time.time()
+        outputs = {name: output for name, (output, _) in results.items()}
+        update = {AGENT_OUTPUTS[name]: output for name, output in outputs.items()}
+        statuses = {
+            name: "failed" if agent_error(output) else "completed"
+            for name, output in outputs.items()
+        }
+        for name in timed_out:
+            update[AGENT_OUTPUTS[name]] = {} if name == "financial" else []
+            statuses[name] = "timed_out"
+
+        update["agent_statuses"] = statuses
+        update["agent_updated_at"] = {name: now for name in statuses}
+        if self.sectioned:
+            # "" replaces a section left over from an earlier attempt
+            update["report_sections"] = {
+                name: (results[name][1] if name in results else None) or ""
+                for name in statuses
+            }
+        return update
+
+    def _agent_cutoffs(self, state: AgentState, names: Sequence[str]) -> Dict:
+        """Wall-clock time (epoch) each agent must finish by, or None"""
+        budgets = self.config.get("agent_budgets", {})
+        deadline_at = state.get("metadata", {}).get("deadline_at")
+        if deadline_at is not None:
+            # Leave the tail of the request for the synthesis call
+            deadline_at -= self.config.get("synthesis_reserve_s", 0.0)
+
+        start = time.time()
+        cutoffs = {}
+        for name in names:
+            limits = [deadline_at]
+            if budgets.get(name) is not None:
+                limits.append(start + budgets[name])
+            limits = [limit for limit in limits if limit is not None]
+            cutoffs[name] = min(limits) if limits else None
+        return cutoffs
+
+    def _run_agents(self, names: Sequence[str], state: AgentState) -> Dict:
+        cutoffs = self._agent_cutoffs(state, names)
+        results, timed_out = {}, []
+
+        from langchain_core.runnables.config import ContextThreadPoolExecutor
+
+        # Context-copying pool so agent spans and LangChain callbacks in the
+        # worker threads stay attached to this node
+        executor = ContextThreadPoolExecutor(max_workers=len(names))
+        try:
+            outputs = {name: concurrent.futures.Future() for name in names}
+            sections = {
+                name: executor.submit(self._run_branch, name, state, outputs[name])
+                for name in names
+            }
+            for name in names:
+                try:
+                    output = outputs[name].result(timeout=_remaining(cutoffs[name]))
+                except concurrent.futures.TimeoutError:
+                    timed_out.append(name)
+                    continue
+                try:
+                    section = sections[name].result(timeout=_remaining(cutoffs[name]))
+                except concurrent.futures.TimeoutError:
+                    # Written again by the synthesis node instead
+                    section = None
+                results[name] = (output, section)
+        finally:
+            # Threads cannot be killed: a straggler finishes its current
+            # Bedrock/tool call in the background and its result is dropped
+            executor.shutdown(wait=False, cancel_futures=True)
 
-        def run_competitor():
+        return self._agent_update(results, timed_out)
+
+    async def _arun_agents(self, names: Sequence[str], state: AgentState) -> Dict:
+        cutoffs = self._agent_cutoffs(state, names)
+
+        async def run(name):
             try:
-                return self.competitor_agent.analyze(
-                    state["query"], state.get("context", "")
+                # wait_for cancels the agent task, including in-flight requests
+                output = await asyncio.wait_for(
+                    self._arun_agent(name, state), _remaining(cutoffs[name])
                 )
-            except Exception as e:
-                return [f"Competitor error: {str(e)}"]
+            except asyncio.TimeoutError:
+                return _TIMED_OUT
+            try:
+                section = await asyncio.wait_for(
+                    self._awrite_section(name, state, output),
+                    _remaining(cutoffs[name]),
+                )
+            except asyncio.TimeoutError:
+                # Written again by the synthesis node instead
+                section = None
+            return output, section
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
-            future_research = executor.submit(run_research)
-            future_financial = executor.submit(run_financial)
-            future_competitor = executor.submit(run_competitor)
+        results = dict(zip(names, await asyncio.gather(*(run(n) for n in names))))
+        timed_out = [name for name, result in results.items() if result is _TIMED_OUT]
+        finished = {
+            name: result for name, result in results.items() if result is not _TIMED_OUT
+        }
+        return self._agent_update(finished, timed_out)
 
-            research_findings = future_research.result()
-            financial_analysis = future_financial.result()
-            competitor_insights = future_competitor.result()
+    def _parallel_agents_node(self, state: AgentState) -> Dict:
+        with trace_span("parallel_agents", "node"):
+            return self._run_agents(list(AGENT_OUTPUTS), state)
 
-        return {
-            "research_findings": research_findings,
-            "financial_analysis": financial_analysis,
-            "competitor_insights": competitor_insights,
-        }
+    async def _aparallel_agents_node(self, state: AgentState) -> Dict:
+        with trace_span("parallel_agents", "node"):
+            return await self._arun_agents(list(AGENT_OUTPUTS), state)
+
+    def _agent_node(self, name: str) -> "RunnableLambda":
+        from langchain_core.runnables import RunnableLambda
+
+        def node(state: AgentState) -> Dict:
+            return self._run_agents([name], state)
+
+        async def anode(state: AgentState) -> Dict:
+            return await self._arun_agents([name], state)
+
+        return RunnableLambda(node, afunc=anode, name=name)
+
+    def _route_agents(self, state: AgentState, config: "RunnableConfig") -> List[str]:
+        # resume() passes the failed/stale subset; fresh runs fan out to all
+        rerun = config.get("configurable", {}).get("rerun_agents")
+        if rerun is None:
+            return list(AGENT_OUTPUTS)
+        return rerun or ["synthesis"]
+
+    def _synthesis_node(self, state: AgentState, config: "RunnableConfig") -> Dict:
+        with trace_span("synthesis", "node"):
+            report_data = self.synthesis_agent.synthesize(
+                state, on_token=_on_token(config)
+            )
+        return self._synthesis_update(state, report_data)
+
+    async def _asynthesis_node(
+        self, state: AgentState, config: "RunnableConfig"
+    ) -> Dict:
+        with trace_span("synthesis", "node"):
+            report_data = await self.synthesis_agent.asynthesize(
+                state, on_token=_on_token(config)
+            )
+        return self._synthesis_update(state, report_data)
+
+    def _synthesis_update(self, state: AgentState, report_data: Dict) -> Dict:
+        errors = []
+        statuses = state.get("agent_statuses", {})
+        for name, key in AGENT_OUTPUTS.items():
+            error = agent_error(state.get(key))
+            if statuses.get(name) == "timed_out":
+                errors.append(f"{name}: timed out, section is partial")
+            elif error:
+                errors.append(f"{name}: {error}")
+
+        report_data = dict(report_data)
+        context_usage = report_data.pop("context_usage", None)
+        failed = report_data["final_report"].startswith("Synthesis Error")
+        if failed:
+            errors.append(f"synthesis: {report_data['final_report']}")
+
+        metadata = dict(state.get("metadata") or {})
+        if context_usage:
+            metadata["synthesis_context"] = context_usage
 
-    def _synthesis_node(self, state: AgentState) -> Dict:
-        report_data = self.synthesis_agent.synthesize(state)
         return {
             **report_data,
-            "agent_statuses": {
-                "research": "completed",
-                "financial": "completed",
-                "competitor": "completed",
-                "synthesis": "completed",
-            },
+            "metadata": metadata,
+            "errors": errors,
+            "agent_statuses": {"synthesis": "failed" if failed else "completed"},
+            "agent_updated_at": {"synthesis": time.time()},
         }
 
-    def run(self, query: str, context: str = "") -> Dict:
-        initial_state = {
+    def _initial_state(self, query: str, context: str, run_id: Optional[str]) -> Dict:
+        return {
             "query": query,
             "context": context,
             "research_findings": [],
             "financial_analysis": {},
             "competitor_insights": [],
+            "report_sections": {},
             "final_report": "",
             "executive_summary": "",
             "recommendations": [],
             "iteration": 0,
             "agent_statuses": {},
+            "agent_updated_at": {},
             "errors": [],
+            "metadata": self._run_metadata(run_id),
         }
 
-        result = self.graph.invoke(initial_state)
+    def _run_metadata(self, run_id: Optional[str]) -> Dict:
+        metadata = {"run_id": run_id} if run_id else {}
+        if self.config.get("deadline_s") is not None:
+            metadata["deadline_at"] = time.time() + self.config["deadline_s"]
+        return metadata
+
+    def _new_run_id(self, run_id: Optional[str]) -> Optional[str]:
+        if self.checkpointer is None:
+            return None
+        return run_id or uuid.uuid4().hex
+
+    def _new_tracer(self) -> Optional[Tracer]:
+        return Tracer() if self.config.get("tracing", True) else None
+
+    @contextmanager
+    def _traced(self, tracer: Optional[Tracer], query: str):
+        if tracer is None:
+            yield
+            return
+        with tracer.activate(), tracer.span("workflow", "workflow", query=query):
+            yield
+
+    def _run_config(
+        self,
+        tracer: Optional[Tracer],
+        run_id: Optional[str] = None,
+        rerun: Optional[List[str]] = None,
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> Dict:
+        config = {"callbacks": [tracer.callback_handler()]} if tracer else {}
+        configurable = {}
+        if run_id is not None:
+            configurable["thread_id"] = run_id
+            if rerun is not None:
+                configurable["rerun_agents"] = rerun
+        if on_token is not None:
+            # Only stream()/astream() set this; run() never streams the report
+            configurable["on_token"] = on_token
+        if configurable:
+            config["configurable"] = configurable
+        return config
+
+    def _attach_trace(self, result: Dict, tracer: Optional[Tracer]) -> Dict:
+        if tracer is not None:
+            result["metadata"] = {
+                **result.get("metadata", {}),
+                "trace": tracer.to_dict(),
+            }
         return result
+
+    def _cached_result(self, query: str, context: str) -> Optional[Dict]:
+        if self.result_cache is None:
+            return None
+        return self.result_cache.lookup(query, context)
+
+    def _finish(self, query: str, context: str, result: Dict, tracer) -> Dict:
+        if self.result_cache is not None:
+            # Only clean runs are worth replaying to other users
+            if not result.get("errors"):
+                self.result_cache.store(query, context, result)
+            result["metadata"] = {
+                **result.get("metadata", {}),
+                "cache": {"hit": False},
+            }
+        return self._attach_trace(result, tracer)
+
+    def run(self, query: str, context: str = "", run_id: Optional[str] = None) -> Dict:
+        """Run the workflow; run_id names the checkpointed run (default: new ID)"""
+        cached = self._cached_result(query, context)
+        if cached is not None:
+            return cached
+
+        run_id = self._new_run_id(run_id)
+        tracer = self._new_tracer()
+        with self._traced(tracer, query):
+            result = self.graph.invoke(
+                self._initial_state(query, context, run_id),
+                self._run_config(tracer, run_id),
+            )
+        return self._finish(query, context, result, tracer)
+
+    async def arun(
+        self, query: str, context: str = "", run_id: Optional[str] = None
+    ) -> Dict:
+        """Async counterpart of run(); concurrent queries share one event loop"""
+        cached = self._cached_result(query, context)
+        if cached is not None:
+            return cached
+
+        run_id = self._new_run_id(run_id)
+        tracer = self._new_tracer()
+        with self._traced(tracer, query):
+            result = await self.graph.ainvoke(
+                self._initial_state(query, context, run_id),
+                self._run_config(tracer, run_id),
+            )
+        return self._finish(query, context, result, tracer)
+
+    def resume(self, run_id: str, max_age_s: Optional[float] = None) -> Dict:
+        """Repair a checkpointed run without redoing agents that succeeded
+
+        An interrupted run continues from its last checkpoint. A finished run
+        reruns the failed agents, plus any whose output is older than
+        max_age_s, then synthesis; if there is nothing to redo the stored
+        state is returned as is.
+        """
+        values, plan = self._resume_plan(
+            self.graph.get_state(self._run_config(None, run_id)), run_id, max_age_s
+        )
+        if plan is None:
+            return values
+        graph_input, rerun = plan
+
+        tracer = self._new_tracer()
+        with self._traced(tracer, values["query"]):
+            result = self.graph.invoke(
+                graph_input, self._run_config(tracer, run_id, rerun)
+            )
+        return self._finish(values["query"], values["context"], result, tracer)
+
+    async def aresume(self, run_id: str, max_age_s: Optional[float] = None) -> Dict:
+        """Async counterpart of resume()"""
+        values, plan = self._resume_plan(
+            await self.graph.aget_state(self._run_config(None, run_id)),
+            run_id,
+            max_age_s,
+        )
+        if plan is None:
+            return values
+        graph_input, rerun = plan
+
+        tracer = self._new_tracer()
+        with self._traced(tracer, values["query"]):
+            result = await self.graph.ainvoke(
+                graph_input, self._run_config(tracer, run_id, rerun)
+            )
+        return self._finish(values["query"], values["context"], result, tracer)
+
+    def _resume_plan(self, snapshot, run_id: str, max_age_s: Optional[float]):
+        """Stored values plus (graph input, agents to rerun), or None if done
+
+        Graph input None continues an interrupted run from its checkpoint.
+        """
+        if self.checkpointer is None:
+            raise ValueError("resume() needs config['checkpoint_path']")
+        values = snapshot.values
+        if not values:
+            raise ValueError(f"No checkpointed run with ID {run_id!r}")
+
+        if snapshot.next:
+            return values, (None, None)
+
+        statuses = values.get("agent_statuses", {})
+        updated_at = values.get("agent_updated_at", {})
+        now = time.time()
+        rerun = [
+            name
+            for name in AGENT_OUTPUTS
+            if statuses.get(name) != "completed"
+            or (max_age_s is not None and now - updated_at.get(name, 0.0) > max_age_s)
+        ]
+        if not rerun and statuses.get("synthesis") == "completed":
+            return values, None
+        # An empty rerun list redoes synthesis from the stored agent outputs;
+        # the repair gets a fresh deadline
+        graph_input = {
+            "query": values["query"],
+            "metadata": {
+                **{
+                    k: v
+                    for k, v in values.get("metadata", {}).items()
+                    if k != "deadline_at"
+                },
+                **self._run_metadata(run_id),
+            },
+        }
+        return values, (graph_input, rerun)
+
+    def stream(self, query: str, context: str = "") -> Iterator[Tuple[str, object]]:
+        """Run the workflow, yielding report chunks as the model produces them
+
+        Yields ("report_chunk", str) for every streamed piece of the synthesis
+        report, then a single ("final", Dict) with the same state run() returns.
+        A cache hit yields the stored report as one chunk.
+        """
+        cached = self._cached_result(query, context)
+        if cached is not None:
+            yield "report_chunk", cached["final_report"]
+            yield "final", cached
+            return
+
+        from langchain_core.runnables.config import ContextThreadPoolExecutor
+
+        run_id = self._new_run_id(None)
+        tracer = self._new_tracer()
+        events: queue.Queue = queue.Queue()
+
+        def produce():
+            try:
+                final_state = self.graph.invoke(
+                    self._initial_state(query, context, run_id),
+                    self._run_config(
+                        tracer,
+                        run_id,
+                        on_token=lambda chunk: events.put(("report_chunk", chunk)),
+                    ),
+                )
+                events.put(("final", final_state))
+            except BaseException as e:
+                events.put(("error", e))
+
+        with self._traced(tracer, query):
+            # The graph runs in a worker so chunks reach the caller while
+            # the synthesis node is still producing them
+            executor = ContextThreadPoolExecutor(max_workers=1)
+            try:
+                executor.submit(produce)
+                kind, item = events.get()
+                while kind == "report_chunk":
+                    yield kind, item
+                    kind, item = events.get()
+            finally:
+                executor.shutdown(wait=False)
+        if kind == "error":
+            raise item
+
+        yield "final", self._finish(query, context, item, tracer)
+
+    async def astream(
+        self, query: str, context: str = ""
+    ) -> AsyncIterator[Tuple[str, object]]:
+        """Async counterpart of stream()"""
+        cached = self._cached_result(query, context)
+        if cached is not None:
+            yield "report_chunk", cached["final_report"]
+            yield "final", cached
+            return
+
+        run_id = self._new_run_id(None)
+        tracer = self._new_tracer()
+        events: asyncio.Queue = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+
+        def put(event):
+            # Safe from the loop and from worker threads alike, in order
+            loop.call_soon_threadsafe(events.put_nowait, event)
+
+        async def produce():
+            try:
+                final_state = await self.graph.ainvoke(
+                    self._initial_state(query, context, run_id),
+                    self._run_config(
+                        tracer,
+                        run_id,
+                        on_token=lambda chunk: put(("report_chunk", chunk)),
+                    ),
+                )
+                put(("final", final_state))
+            except Exception as e:
+                put(("error", e))
+
+        with self._traced(tracer, query):
+            task = asyncio.create_task(produce())
+            try:
+                kind, item = await events.get()
+                while kind == "report_chunk":
+                    yield kind, item
+                    kind, item = await events.get()
+            finally:
+                task.cancel()
+        if kind == "error":
+            raise item
+
+        yield "final", self._finish(query, context, item, tracer)
@@ -0,0 +1,285 @@
+import itertools
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from .arxiv_search import arxiv, date_filtered_query
+
+# Where battery, electrochemistry and materials papers are filed
+DEFAULT_CATEGORIES = (
+    "cond-mat.mtrl-sci",
+    "physics.chem-ph",
+    "physics.app-ph",
+)
+
+# bm25() column weights: title, authors, summary, categories
+_BM25_WEIGHTS = "10.0, 2.0, 1.0, 0.5"
+
+# Query words that say nothing about the topic
+_STOPWORDS = frozenset(
+    "a an and are as at by for from in into is latest new of on or recent "
+    "research the to with".split()
+)
+
+# Key terms considered per query; bounds the relaxed MATCH expression
+_MAX_TERMS = 8
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS papers (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT UNIQUE NOT NULL,
+    title TEXT NOT NULL,
+    authors TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    categories TEXT NOT NULL,
+    published TEXT NOT NULL,
+    pdf_url TEXT
+);
+CREATE INDEX IF NOT EXISTS papers_published ON papers (published);
+CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
+    title, authors, summary, categories,
+    content='papers', content_rowid='rowid', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS papers_ai AFTER INSERT ON papers BEGIN
+    INSERT INTO papers_fts (rowid, title, authors, summary, categories)
+    VALUES (new.rowid, new.title, new.authors, new.summary, new.categories);
+END;
+CREATE TRIGGER IF NOT EXISTS papers_au AFTER UPDATE ON papers BEGIN
+    INSERT INTO papers_fts (papers_fts, rowid, title, authors, summary, categories)
+    VALUES ('delete', old.rowid, old.title, old.authors, old.summary, old.categories);
+    INSERT INTO papers_fts (rowid, title, authors, summary, categories)
+    VALUES (new.rowid, new.title, new.authors, new.summary, new.categories);
+END;
+CREATE TABLE IF NOT EXISTS sync_state (
+    category TEXT PRIMARY KEY,
+    watermark TEXT NOT NULL,
+    synced_at REAL NOT NULL
+);
+"""
+
+
+class ArxivIndex:
+    """Local SQLite FTS5 index of arXiv paper metadata
+
+    sync() pulls each category's papers submitted after its watermark (the
+    newest paper seen so far; initial_days back on the first run),
+    oldest first, and upserts them, so a periodic sync downloads only what
+    is new. search()
+    ranks the indexed title/authors/abstract/categories with BM25 and
+    answers in milliseconds; ArxivSearchTool uses it while is_fresh().
+    """
+
+    def __init__(
+        self,
+        path: str = ".cache/arxiv_index.sqlite",
+        categories: Sequence[str] = DEFAULT_CATEGORIES,
+        max_age: float = 24 * 3600,
+        initial_days: int = 365,
+        min_coverage: float = 0.6,
+    ):
+        self.path = path
+        self.categories = tuple(categories)
+        self.max_age = max_age
+        self.initial_days = initial_days
+        # Share of key terms a paper must match when no paper matches all
+        self.min_coverage = min_coverage
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+        self._lock = threading.Lock()
+
+    def sync(self, client=None, max_results: int = 1000) -> Dict[str, int]:
+        """Fetch papers newer than each category's watermark; counts per category
+
+        Pages oldest-first in batches of max_results, committing the
+        watermark after each batch, so a backlog larger than one batch is
+        covered by the next request and an interrupted sync resumes where
+        it stopped.
+        """
+        client = client or arxiv.Client(page_size=100)
+        added = {}
+        for category in self.categories:
+            watermark = self._watermark(category)
+            since = (
+                datetime.fromisoformat(watermark)
+                if watermark
+                else datetime.now(timezone.utc) - timedelta(days=self.initial_days)
+            )
+            watermark = watermark or _iso(since)
+            added[category] = 0
+
+            while True:
+                search = arxiv.Search(
+                    query=date_filtered_query(f"cat:{category}", since),
+                    max_results=max_results,
+                    sort_by=arxiv.SortCriterion.SubmittedDate,
+                    sort_order=arxiv.SortOrder.Ascending,
+                )
+                with closing(client.results(search)) as results:
+                    batch = list(results)
+
+                # The query range is minute-granular; papers before the
+                # watermark are already indexed. Papers at the watermark may
+                # not be (a batch can end mid-second), so those are upserted.
+                papers = [p for p in batch if _iso(p.published) >= watermark]
+                added[category] += sum(_iso(p.published) > watermark for p in papers)
+                self.add(papers)
+                newest = max([_iso(p.published) for p in papers] + [watermark])
+                with self._lock:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO sync_state "
+                        "(category, watermark, synced_at) VALUES (?, ?, ?)",
+                        (category, newest, time.time()),
+                    )
+                    self._db.commit()
+
+                # A short batch means the gap is covered; a full one that did
+                # not move the watermark cannot make progress
+                if len(batch) < max_results or newest == watermark:
+                    break
+                watermark, since = newest, datetime.fromisoformat(newest)
+        return added
+
+    def add(self, papers: Iterable):
+        """Upsert arxiv.Result-like papers"""
+        rows = [
+            (
+                getattr(paper, "entry_id", None) or paper.pdf_url,
+                paper.title,
+                ", ".join(a.name for a in paper.authors),
+                paper.summary,
+                " ".join(paper.categories),
+                _iso(paper.published),
+                paper.pdf_url,
+            )
+            for paper in papers
+        ]
+        with self._lock:
+            self._db.executemany(
+                "INSERT INTO papers "
+                "(id, title, authors, summary, categories, published, pdf_url) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET title = excluded.title, "
+                "authors = excluded.authors, summary = excluded.summary, "
+                "categories = excluded.categories, published = excluded.published, "
+                "pdf_url = excluded.pdf_url",
+                rows,
+            )
+            self._db.commit()
+
+    def search(
+        self, query: str, max_results: int = 10, days_back: int = 365
+    ) -> List[Dict]:
+        """BM25-ranked papers covering the query, in search_papers' format
+
+        Papers must match every key term; if none do, the query is relaxed
+        to papers matching at least min_coverage of them. Anything weaker
+        returns [], so ArxivSearchTool asks the live API instead of
+        answering an off-topic query from the local categories.
+        """
+        terms = list(
+            dict.fromkeys(
+                term
+                for term in re.findall(r"\w+", query.lower())
+                if term not in _STOPWORDS
+            )
+        )[:_MAX_TERMS]
+        if not terms:
+            return []
+        needed = max(1, math.ceil(self.min_coverage * len(terms)))
+        matches = [_all_of(terms)]
+        if needed < len(terms):
+            matches.append(
+                " OR ".join(
+                    f"({_all_of(subset)})"
+                    for subset in itertools.combinations(terms, needed)
+                )
+            )
+
+        for match in matches:
+            rows = self._search(match, days_back, max_results)
+            if rows:
+                break
+
+        return [
+            {
+                "title": title,
+                "authors": authors.split(", ") if authors else [],
+                "published": published[:10],
+                "summary": summary[:300] + "...",
+                "pdf_url": pdf_url,
+                "categories": categories.split(),
+            }
+            for title, authors, summary, categories, published, pdf_url in rows
+        ]
+
+    def is_fresh(self, max_age: Optional[float] = None) -> bool:
+        """Every category synced within max_age seconds"""
+        status = self.status()
+        limit = self.max_age if max_age is None else max_age
+        return all(
+            category in status["categories"]
+            and time.time() - status["categories"][category]["synced_at"] <= limit
+            for category in self.categories
+        )
+
+    def status(self) -> Dict:
+        with self._lock:
+            papers = self._db.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+            rows = self._db.execute(
+                "SELECT category, watermark, synced_at FROM sync_state"
+            ).fetchall()
+        return {
+            "papers": papers,
+            "categories": {
+                category: {"watermark": watermark, "synced_at": synced_at}
+                for category, watermark, synced_at in rows
+            },
+        }
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _watermark(self, category: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT watermark FROM sync_state WHERE category = ?", (category,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _search(self, match: str, days_back: int, max_results: int) -> List:
+        cutoff = _iso(datetime.now(timezone.utc) - timedelta(days=days_back))
+
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT p.title, p.authors, p.summary, p.categories, p.published, "
+                "p.pdf_url FROM papers_fts JOIN papers p ON p.rowid = papers_fts.rowid "
+                "WHERE papers_fts MATCH ? AND p.published >= ? "
+                f"ORDER BY bm25(papers_fts, {_BM25_WEIGHTS}) LIMIT ?",
+                (match, cutoff, max_results),
+            ).fetchall()
+        return rows
+
+
+def _all_of(terms: Iterable[str]) -> str:
+    return " AND ".join(f'"{term}"' for term in terms)
+
+
+def _iso(moment: datetime) -> str:
+    """UTC ISO timestamp; string order equals time order"""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S+00:00")
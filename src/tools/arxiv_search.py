@@ -1,50 +1,105 @@
-from datetime import datetime, timedelta
-from typing import Dict, List
+from contextlib import closing
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Dict, List, Optional
 
-import arxiv
-from langchain.tools import Tool
+from .cache import SingleFlight, ToolCache, cached
+from .lazy import lazy_import
+
+if TYPE_CHECKING:
+    from langchain_core.tools import Tool
+
+    from .arxiv_index import ArxivIndex
+
+arxiv = lazy_import("arxiv")
+
+
+def date_filtered_query(
+    query: str, since: datetime, until: Optional[datetime] = None
+) -> str:
+    """Restrict an arXiv query to papers submitted in [since, until] (UTC)"""
+    until = until or datetime.now(timezone.utc)
+    start, end = (
+        d.astimezone(timezone.utc).strftime("%Y%m%d%H%M") for d in (since, until)
+    )
+    return f"({query}) AND submittedDate:[{start} TO {end}]"
 
 
 class ArxivSearchTool:
-    def __init__(self):
+    def __init__(
+        self,
+        cache: Optional[ToolCache] = None,
+        single_flight: Optional[SingleFlight] = None,
+        page_size: Optional[int] = None,
+        index: Optional["ArxivIndex"] = None,
+    ):
         self.max_results = 10
-        self.client = arxiv.Client()
+        # Results per API request; by default one request covers max_results
+        self.page_size = page_size
+        self._clients: Dict[int, "arxiv.Client"] = {}
+        # Local FTS index answers instead of the API while it is fresh
+        self.index = index
+        self.cache = cache
+        # Research and competitor agents often search the same thing at once
+        self.single_flight = single_flight or SingleFlight()
+
+    @property
+    def client(self):
+        return self.client_for(self.page_size or self.max_results)
 
+    def client_for(self, page_size: int):
+        """arxiv.Client fetching page_size results per request"""
+        # arxiv.Client defaults to 100 per page, even when 10 are wanted
+        if page_size not in self._clients:
+            self._clients[page_size] = arxiv.Client(page_size=page_size)
+        return self._clients[page_size]
+
+    @cached("arxiv")
     def search_papers(
         self, query: str, max_results: int = None, days_back: int = 365
     ) -> List[Dict]:
         max_results = max_results or self.max_results
 
+        if self.index is not None and self.index.is_fresh():
+            results = self.index.search(query, max_results, days_back)
+            if results:
+                return results
+
+        cutoff_date = datetime.now(timezone.utc) - timedelta(days=days_back)
+        page_size = min(self.page_size or max_results, max_results)
+
         try:
             search = arxiv.Search(
-                query=query,
+                query=date_filtered_query(query, cutoff_date),
                 max_results=max_results,
                 sort_by=arxiv.SortCriterion.SubmittedDate,
             )
 
             results = []
-            cutoff_date = datetime.now() - timedelta(days=days_back)
-
-            for result in self.client.results(search):
-                if result.published.replace(tzinfo=None) < cutoff_date:
-                    continue
-
-                results.append(
-                    {
-                        "title": result.title,
-                        "authors": [a.name for a in result.authors],
-                        "published": result.published.strftime("%Y-%m-%d"),
-                        "summary": result.summary[:300] + "...",
-                        "pdf_url": result.pdf_url,
-                        "categories": result.categories,
-                    }
-                )
+            # Newest first: the first paper past the cutoff ends the search
+            # instead of paging through older ones only to drop them
+            with closing(self.client_for(page_size).results(search)) as papers:
+                for result in papers:
+                    if result.published < cutoff_date:
+                        break
+
+                    results.append(
+                        {
+                            "title": result.title,
+                            "authors": [a.name for a in result.authors],
+                            "published": result.published.strftime("%Y-%m-%d"),
+                            "summary": result.summary[:300] + "...",
+                            "pdf_url": result.pdf_url,
+                            "categories": result.categories,
+                        }
+                    )
 
             return results
         except Exception as e:
             return [{"error": str(e)}]
 
-    def as_langchain_tool(self) -> Tool:
+    def as_langchain_tool(self) -> "Tool":
+        from langchain_core.tools import Tool
+
         return Tool(
             name="arxiv_search",
             func=lambda q: self.search_papers(q),
@@ -0,0 +1,308 @@
+import copy
+import functools
+import inspect
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ToolCache:
+    """Two-level cache for tool results: in-memory LRU in front of SQLite
+
+    Entries expire per source (news goes stale in minutes, financial
+    statements in days). The SQLite file is shared across processes, so a
+    query answered by one worker is a disk hit for the next one.
+    """
+
+    DEFAULT_TTLS = {
+        "arxiv": 6 * 3600,
+        "news": 15 * 60,
+        "company_info": 3600,
+        "financial_metrics": 7 * 24 * 3600,
+    }
+
+    def __init__(
+        self,
+        path: Optional[str] = ".cache/tool_cache.sqlite",
+        max_memory_entries: int = 256,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = 3600,
+    ):
+        self.path = path
+        self.max_memory_entries = max_memory_entries
+        self.ttls = {**self.DEFAULT_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+
+        self._memory: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        # Disk I/O has its own lock so memory hits never wait on a write
+        self._db_lock = threading.Lock()
+
+        self._db = None
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS tool_cache ("
+                "source TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, PRIMARY KEY (source, key))"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def make_key(*args, **kwargs) -> str:
+        """Stable key from call arguments; strings are case/space normalized"""
+        return json.dumps(
+            {"args": [_normalize(a) for a in args], "kwargs": _normalize(kwargs)},
+            sort_keys=True,
+            default=str,
+        )
+
+    def ttl_for(self, source: str) -> float:
+        return self.ttls.get(source, self.default_ttl)
+
+    def get(self, source: str, key: str) -> Tuple[bool, Any]:
+        now = time.time()
+
+        with self._lock:
+            stats = self._source_stats(source)
+
+            entry = self._memory.get((source, key))
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._memory.move_to_end((source, key))
+                    stats["hits"] += 1
+                    stats["memory_hits"] += 1
+                    return True, value
+                del self._memory[(source, key)]
+
+            if self._db is not None:
+                with self._db_lock:
+                    row = self._db.execute(
+                        "SELECT value, expires_at FROM tool_cache "
+                        "WHERE source = ? AND key = ?",
+                        (source, key),
+                    ).fetchone()
+                if row is not None and row[1] > now:
+                    value = json.loads(row[0])
+                    self._remember(source, key, row[1], value)
+                    stats["hits"] += 1
+                    stats["disk_hits"] += 1
+                    return True, value
+
+            stats["misses"] += 1
+            return False, None
+
+    def set(self, source: str, key: str, value: Any):
+        expires_at = time.time() + self.ttl_for(source)
+        payload = json.dumps(value, default=_json_default)
+
+        with self._lock:
+            # Round-trip through JSON so memory and disk hits look the same
+            self._remember(source, key, expires_at, json.loads(payload))
+
+        if self._db is None:
+            return
+        # The call already succeeded; a full or locked disk only loses the entry
+        try:
+            with self._db_lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO tool_cache "
+                    "(source, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                    (source, key, payload, expires_at),
+                )
+                self._db.commit()
+        except sqlite3.Error as e:
+            logger.warning("Tool cache write failed for %s: %s", source, e)
+
+    def clear(self, source: Optional[str] = None):
+        with self._lock:
+            if source is None:
+                self._memory.clear()
+            else:
+                for cache_key in [k for k in self._memory if k[0] == source]:
+                    del self._memory[cache_key]
+
+            if self._db is not None:
+                with self._db_lock:
+                    if source is None:
+                        self._db.execute("DELETE FROM tool_cache")
+                    else:
+                        self._db.execute(
+                            "DELETE FROM tool_cache WHERE source = ?", (source,)
+                        )
+                    self._db.commit()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {source: dict(counts) for source, counts in self._stats.items()}
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _remember(self, source: str, key: str, expires_at: float, value: Any):
+        self._memory[(source, key)] = (expires_at, value)
+        self._memory.move_to_end((source, key))
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _source_stats(self, source: str) -> Dict[str, int]:
+        if source not in self._stats:
+            self._stats[source] = {
+                "hits": 0,
+                "misses": 0,
+                "memory_hits": 0,
+                "disk_hits": 0,
+            }
+        return self._stats[source]
+
+
+class SingleFlight:
+    """Share one in-flight call among identical concurrent callers
+
+    The first caller for a (source, key) runs the call; callers arriving
+    while it runs wait for it and get a copy of its result (or its
+    exception) instead of issuing their own request. Nothing is kept once
+    the call finishes; that is the cache's job.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Tuple[str, str], "_Call"] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def do(self, source: str, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            stats = self._stats.setdefault(
+                source, {"calls": 0, "executed": 0, "coalesced": 0}
+            )
+            stats["calls"] += 1
+            call = self._calls.get((source, key))
+            leader = call is None
+            if leader:
+                call = self._calls[(source, key)] = _Call()
+                stats["executed"] += 1
+            else:
+                call.waiters += 1
+                stats["coalesced"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            # Callers may mutate what they get back
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[(source, key)]
+            call.done.set()
+
+        # No one can join once the call is unregistered
+        return copy.deepcopy(call.result) if call.waiters else call.result
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {source: dict(counts) for source, counts in self._stats.items()}
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+def cached(source: str) -> Callable:
+    """Cache a tool method's result under `source` when the tool has a cache
+
+    The decorated method must belong to an object with a `cache` attribute
+    (a ToolCache or None) and may have a `single_flight` attribute (a
+    SingleFlight or None) that coalesces identical concurrent misses.
+    Error results are never cached. The wrapper exposes `cache_source` and
+    `cache_key(self, *args, **kwargs)`.
+    """
+
+    def decorator(method: Callable) -> Callable:
+        signature = inspect.signature(method)
+
+        def cache_key(self, *args, **kwargs) -> str:
+            # Bind defaults so f(q) and f(q, days_back=365) share an entry
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            arguments.pop("self", None)
+            return ToolCache.make_key(**arguments)
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            cache = getattr(self, "cache", None)
+            flight = getattr(self, "single_flight", None)
+            if cache is None and flight is None:
+                return method(self, *args, **kwargs)
+
+            key = cache_key(self, *args, **kwargs)
+            if cache is not None:
+                hit, value = cache.get(source, key)
+                if hit:
+                    return value
+
+            def call():
+                value = method(self, *args, **kwargs)
+                if cache is not None and not _is_error(value):
+                    cache.set(source, key, value)
+                return value
+
+            return call() if flight is None else flight.do(source, key, call)
+
+        # Lets bulk paths read/seed the same entries as single calls
+        wrapper.cache_source = source
+        wrapper.cache_key = cache_key
+        return wrapper
+
+    return decorator
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return " ".join(value.lower().split())
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in sorted(value.items())}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def _is_error(value: Any) -> bool:
+    if isinstance(value, dict):
+        return "error" in value
+    if isinstance(value, list):
+        return any(isinstance(item, dict) and "error" in item for item in value)
+    return False
+
+
+def _json_default(value: Any) -> Any:
+    # numpy/pandas scalars coming out of yfinance DataFrames
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
@@ -1,11 +1,33 @@
-from typing import Dict, List
+import concurrent.futures
+from typing import TYPE_CHECKING, Dict, List, Optional
 
-import yfinance as yf
-from langchain.tools import Tool
+from .cache import SingleFlight, ToolCache, cached
+from .lazy import lazy_import
+from .symbol_resolver import SymbolResolver, default_resolver
+
+if TYPE_CHECKING:
+    from langchain_core.tools import Tool
+
+    from .financials_store import FinancialsStore
+
+# Pulls in pandas; imported on the first lookup
+yf = lazy_import("yfinance")
 
 
 class FinanceDataTool:
-    def __init__(self):
+    def __init__(
+        self,
+        cache: Optional[ToolCache] = None,
+        max_workers: int = 8,
+        single_flight: Optional[SingleFlight] = None,
+        store: Optional["FinancialsStore"] = None,
+        resolver: Optional[SymbolResolver] = None,
+    ):
+        self.cache = cache
+        # Multi-period history kept locally; refreshed incrementally
+        self.store = store
+        self.single_flight = single_flight or SingleFlight()
+        self.max_workers = max_workers
         self.company_tickers = {
             "lg_energy": "373220.KS",  # LG Energy Solution
             "samsung_sdi": "006400.KS",  # Samsung SDI
@@ -14,15 +36,107 @@ class FinanceDataTool:
             "byd": "1211.HK",  # BYD (Hong Kong)
             "panasonic": "6752.T",  # Panasonic (Tokyo)
         }
+        # Anything beyond company_tickers: "LG Energy Solution Ltd", "Tesla"
+        self.resolver = resolver or default_resolver(aliases=self.company_tickers)
 
+    def resolve_ticker(self, company_name: str) -> Optional[str]:
+        ticker = self.company_tickers.get(company_name.lower().replace(" ", "_"))
+        return ticker or self.resolver.resolve(company_name)
+
+    @cached("company_info")
     def get_company_info(self, company_name: str) -> Dict:
-        ticker_symbol = self.company_tickers.get(company_name.lower().replace(" ", "_"))
+        ticker_symbol = self.resolve_ticker(company_name)
 
         if not ticker_symbol:
             return {"error": f"Company {company_name} not found in database"}
 
+        return self._company_info(yf.Ticker(ticker_symbol))
+
+    @cached("financial_metrics")
+    def get_financial_metrics(self, company_name: str) -> Dict:
+        ticker_symbol = self.resolve_ticker(company_name)
+
+        if not ticker_symbol:
+            return {"error": f"Company {company_name} not found"}
+
+        return self._financial_metrics(yf.Ticker(ticker_symbol))
+
+    def get_companies_bulk(self, companies: List[str]) -> Dict[str, Dict]:
+        """Fetch info and financial metrics for many companies at once
+
+        All tickers share one yf.Tickers session and their .info/.financials
+        requests run concurrently (bounded by max_workers), so a peer
+        comparison costs roughly one round trip instead of one per company.
+        Cached entries are reused, and each fetch goes through single_flight
+        and back into the cache under the same keys get_company_info and
+        get_financial_metrics use, so it coalesces with their calls too.
+        """
+        results = {company: {} for company in companies}
+        pending = {}  # (company, kind) -> ticker symbol
+
+        for company in companies:
+            ticker_symbol = self.resolve_ticker(company)
+            if not ticker_symbol:
+                error = {"error": f"Company {company} not found in database"}
+                results[company] = {"info": error, "metrics": error}
+                continue
+
+            for kind, method in self._bulk_methods().items():
+                hit, value = self._cache_lookup(method, company)
+                if hit:
+                    results[company][kind] = value
+                else:
+                    pending[(company, kind)] = ticker_symbol
+
+        if not pending:
+            return results
+
+        symbols = sorted(set(pending.values()))
+        tickers = yf.Tickers(" ".join(symbols)).tickers
+
+        workers = max(1, min(self.max_workers, len(pending)))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self._bulk_fetch, kind, company, tickers[symbol]): (
+                    company,
+                    kind,
+                )
+                for (company, kind), symbol in pending.items()
+            }
+            for future in concurrent.futures.as_completed(futures):
+                company, kind = futures[future]
+                results[company][kind] = future.result()
+
+        return results
+
+    def compare_companies(
+        self, companies: List[str], include_financials: bool = True
+    ) -> Dict:
+        comparison = {}
+        bulk = self.get_companies_bulk(companies)
+
+        for company in companies:
+            info = bulk[company]["info"]
+            comparison[company] = {
+                "market_cap": info.get("market_cap", "N/A"),
+                "revenue": info.get("revenue", "N/A"),
+                "profit_margin": info.get("profit_margin", "N/A"),
+            }
+
+            if include_financials:
+                metrics = bulk[company]["metrics"]
+                comparison[company].update(
+                    {
+                        "operating_income": metrics.get("operating_income", "N/A"),
+                        "net_income": metrics.get("net_income", "N/A"),
+                        "period": metrics.get("period", "N/A"),
+                    }
+                )
+
+        return comparison
+
+    def _company_info(self, ticker) -> Dict:
         try:
-            ticker = yf.Ticker(ticker_symbol)
             info = ticker.info
 
             return {
@@ -39,15 +153,15 @@ class FinanceDataTool:
         except Exception as e:
             return {"error": str(e)}
 
-    def get_financial_metrics(self, company_name: str) -> Dict:
-        ticker_symbol = self.company_tickers.get(company_name.lower().replace(" ", "_"))
-
-        if not ticker_symbol:
-            return {"error": f"Company {company_name} not found"}
+    def _financial_metrics(self, ticker) -> Dict:
+        if self.store is not None:
+            try:
+                data = self.store.refresh(ticker.ticker, ticker)
+                return self.store.metrics(ticker.ticker, data)
+            except Exception as e:
+                return {"error": str(e)}
 
         try:
-            ticker = yf.Ticker(ticker_symbol)
-
             financials = ticker.financials
 
             if financials.empty:
@@ -65,27 +179,54 @@ class FinanceDataTool:
         except Exception as e:
             return {"error": str(e)}
 
-    def compare_companies(self, companies: List[str]) -> Dict:
-        comparison = {}
-
-        for company in companies:
-            info = self.get_company_info(company)
-            comparison[company] = {
-                "market_cap": info.get("market_cap", "N/A"),
-                "revenue": info.get("revenue", "N/A"),
-                "profit_margin": info.get("profit_margin", "N/A"),
-            }
-
-        return comparison
+    def _bulk_methods(self) -> Dict:
+        return {
+            "info": FinanceDataTool.get_company_info,
+            "metrics": FinanceDataTool.get_financial_metrics,
+        }
 
-    def as_langchain_tool(self) -> Tool:
+    def _bulk_fetch(self, kind: str, company: str, ticker) -> Dict:
+        method = self._bulk_methods()[kind]
+        fetch = {"info": self._company_info, "metrics": self._financial_metrics}[kind]
+
+        def call():
+            value = fetch(ticker)
+            self._cache_store(method, company, value)
+            return value
+
+        if self.single_flight is None:
+            return call()
+        key = method.cache_key(self, company)
+        return self.single_flight.do(method.cache_source, key, call)
+
+    def _cache_lookup(self, method, company: str):
+        if self.cache is None:
+            return False, None
+        return self.cache.get(method.cache_source, method.cache_key(self, company))
+
+    def _cache_store(self, method, company: str, value: Dict):
+        if self.cache is not None and "error" not in value:
+            self.cache.set(method.cache_source, method.cache_key(self, company), value)
+
+    def _tool_lookup(self, company_name: str) -> Dict:
+        info = self.get_company_info(company_name)
+        if self.store is None or "error" in info:
+            return info
+        # With a store, history comes without extra downloads
+        return {**info, "financials": self.get_financial_metrics(company_name)}
+
+    def as_langchain_tool(self) -> "Tool":
         """Convert to LangChain Tool"""
+        from langchain_core.tools import Tool
+
         return Tool(
             name="yahoo_finance",
-            func=lambda q: self.get_company_info(q),
+            func=lambda q: self._tool_lookup(q),
             description=(
                 "Get financial data for battery companies. "
                 "Available companies: LG Energy, Samsung SDI, CATL, BYD, Panasonic. "
                 "Returns: market cap, revenue, margins, P/E ratio, etc."
             ),
+            # Lets agents extract company names without calling the tool
+            metadata={"company_tickers": self.company_tickers},
         )
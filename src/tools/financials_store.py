@@ -0,0 +1,222 @@
+import os
+import re
+import threading
+import time
+from datetime import date, timedelta
+from typing import Dict, Optional
+
+import numpy as np
+
+# Income statement rows kept per period (ticker.financials index labels)
+FIELDS = ("Total Revenue", "Gross Profit", "Operating Income", "Net Income")
+
+# Annual reports land a few months after the period ends
+FILING_LAG_DAYS = 120
+
+
+class FinancialsStore:
+    """Per-ticker columnar store of annual fundamentals and daily closes
+
+    Each ticker is one NumPy .npz file: `periods` (datetime64[D], oldest
+    first) with a `values` matrix (FIELDS x periods, NaN where missing),
+    plus `price_dates`/`prices`. refresh() only downloads what can be new:
+    closes after the last stored day, and the income statement only once
+    the next annual period is due. Periods Yahoo has since dropped stay in
+    the file, so history grows past its four-year window.
+
+    metrics() derives multi-period figures (YoY growth, margins and their
+    trend, CAGR, price return and volatility) with vectorized operations
+    on the stored arrays.
+    """
+
+    def __init__(
+        self,
+        directory: str = ".cache/financials",
+        max_age: float = 12 * 3600,
+        price_history_days: int = 5 * 365,
+    ):
+        self.directory = directory
+        self.max_age = max_age
+        self.price_history_days = price_history_days
+        os.makedirs(directory, exist_ok=True)
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def load(self, symbol: str) -> Optional[Dict[str, np.ndarray]]:
+        path = self._path(symbol)
+        if not os.path.exists(path):
+            return None
+        with np.load(path, allow_pickle=False) as data:
+            return {name: data[name] for name in data.files}
+
+    def refresh(self, symbol: str, ticker) -> Dict[str, np.ndarray]:
+        """Bring the stored data for symbol up to date from a yf.Ticker"""
+        with self._lock_for(symbol):
+            data = self.load(symbol) or _empty()
+            if time.time() - float(data["refreshed_at"]) < self.max_age:
+                return data
+
+            today = np.datetime64(date.today(), "D")
+            periods, values = data["periods"], data["values"]
+            due = (
+                periods[-1] + np.timedelta64(365 + FILING_LAG_DAYS, "D")
+                if len(periods)
+                else today
+            )
+            if due <= today:
+                periods, values = _merge_periods(periods, values, ticker.financials)
+
+            price_dates, prices = data["price_dates"], data["prices"]
+            start = (
+                price_dates[-1] + np.timedelta64(1, "D")
+                if len(price_dates)
+                else today - np.timedelta64(self.price_history_days, "D")
+            )
+            if start <= today:
+                history = ticker.history(start=str(start), interval="1d")
+                price_dates, prices = _merge_prices(price_dates, prices, history)
+
+            data = {
+                "periods": periods,
+                "values": values,
+                "price_dates": price_dates,
+                "prices": prices,
+                "refreshed_at": np.array(time.time()),
+            }
+            self._save(symbol, data)
+            return data
+
+    def metrics(self, symbol: str, data: Optional[Dict] = None) -> Dict:
+        data = data if data is not None else self.load(symbol)
+        if data is None or not len(data["periods"]):
+            return {"error": f"No stored financials for {symbol}"}
+
+        periods, values = data["periods"], data["values"]
+        rows = dict(zip(FIELDS, values))
+        revenue = rows["Total Revenue"]
+        latest = values[:, -1]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            yoy = revenue[1:] / revenue[:-1] - 1
+            margins = {
+                name: rows[field] / revenue
+                for name, field in (
+                    ("gross_margin", "Gross Profit"),
+                    ("operating_margin", "Operating Income"),
+                    ("net_margin", "Net Income"),
+                )
+            }
+            years = (periods[-1] - periods[0]).astype(float) / 365.25
+            cagr = (revenue[-1] / revenue[0]) ** (1 / years) - 1 if years > 0 else None
+
+        result = {
+            "total_revenue": _scalar(latest[0]),
+            "gross_profit": _scalar(latest[1]),
+            "operating_income": _scalar(latest[2]),
+            "net_income": _scalar(latest[3]),
+            "period": str(periods[-1]),
+            "history": {
+                "periods": [str(p) for p in periods],
+                "revenue": _list(revenue),
+                "revenue_yoy": [None] + _list(yoy),
+                **{name: _list(series) for name, series in margins.items()},
+            },
+            "revenue_cagr": _scalar(cagr),
+            # Percentage points per year, least squares over all periods
+            "operating_margin_trend": _trend(periods, margins["operating_margin"]),
+        }
+        result.update(_price_metrics(data["price_dates"], data["prices"]))
+        return result
+
+    def _lock_for(self, symbol: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(symbol, threading.Lock())
+
+    def _path(self, symbol: str) -> str:
+        return os.path.join(self.directory, re.sub(r"[^\w.-]", "_", symbol) + ".npz")
+
+    def _save(self, symbol: str, data: Dict):
+        # np.savez appends .npz unless the name already ends with it
+        tmp = self._path(symbol) + ".tmp.npz"
+        np.savez(tmp, **data)
+        os.replace(tmp, self._path(symbol))
+
+
+def _empty() -> Dict[str, np.ndarray]:
+    return {
+        "periods": np.array([], dtype="datetime64[D]"),
+        "values": np.empty((len(FIELDS), 0)),
+        "price_dates": np.array([], dtype="datetime64[D]"),
+        "prices": np.array([], dtype=float),
+        "refreshed_at": np.array(0.0),
+    }
+
+
+def _merge_periods(periods: np.ndarray, values: np.ndarray, financials):
+    """Append the statement's periods newer than the last stored one"""
+    if financials is None or financials.empty:
+        return periods, values
+    columns = np.array(
+        [np.datetime64(str(c)[:10], "D") for c in financials.columns],
+        dtype="datetime64[D]",
+    )
+    newer = columns > periods[-1] if len(periods) else np.ones(len(columns), bool)
+    if not newer.any():
+        return periods, values
+
+    frame = financials.reindex(list(FIELDS))
+    new_values = frame.to_numpy(dtype=float, na_value=np.nan)[:, newer]
+    order = np.argsort(columns[newer])
+    return (
+        np.concatenate([periods, columns[newer][order]]),
+        np.concatenate([values, new_values[:, order]], axis=1),
+    )
+
+
+def _merge_prices(dates: np.ndarray, prices: np.ndarray, history):
+    if history is None or history.empty or "Close" not in history:
+        return dates, prices
+    new_dates = np.array(
+        [np.datetime64(str(d)[:10], "D") for d in history.index],
+        dtype="datetime64[D]",
+    )
+    new_prices = history["Close"].to_numpy(dtype=float)
+    keep = new_dates > dates[-1] if len(dates) else np.ones(len(new_dates), bool)
+    return (
+        np.concatenate([dates, new_dates[keep]]),
+        np.concatenate([prices, new_prices[keep]]),
+    )
+
+
+def _price_metrics(dates: np.ndarray, prices: np.ndarray) -> Dict:
+    if len(prices) < 2:
+        return {"price_return_1y": None, "price_volatility": None}
+    year_ago = dates[-1] - np.timedelta64(365, "D")
+    start = int(np.searchsorted(dates, year_ago))
+    returns = np.diff(np.log(prices[start:]))
+    return {
+        "last_close": _scalar(prices[-1]),
+        "price_return_1y": _scalar(prices[-1] / prices[start] - 1),
+        # Annualized standard deviation of daily log returns
+        "price_volatility": _scalar(returns.std() * np.sqrt(252)),
+    }
+
+
+def _trend(periods: np.ndarray, series: np.ndarray) -> Optional[float]:
+    mask = np.isfinite(series)
+    if mask.sum() < 2:
+        return None
+    years = (periods[mask] - periods[mask][0]).astype(float) / 365.25
+    slope = np.polyfit(years, series[mask], 1)[0]
+    return _scalar(slope * 100)
+
+
+def _scalar(value) -> Optional[float]:
+    if value is None:
+        return None
+    value = float(value)
+    return value if np.isfinite(value) else None
+
+
+def _list(values: np.ndarray) -> list:
+    return [_scalar(v) for v in values]
@@ -0,0 +1,35 @@
+import importlib
+import threading
+import types
+
+
+class LazyModule(types.ModuleType):
+    """Module stand-in that imports the real module on first attribute access
+
+    yfinance (pandas), arxiv and newsapi cost most of the tools' import
+    time, so the tool modules bind them through this and only pay for them
+    when a lookup actually runs. Attributes set on the stand-in (e.g. test
+    monkeypatching) shadow the real module's.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> types.ModuleType:
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self.__name__)
+        return self._module
+
+    def __getattr__(self, attr: str):
+        # Only called for attributes not found on the stand-in itself
+        if attr.startswith("__") and attr.endswith("__"):
+            raise AttributeError(attr)
+        return getattr(self._load(), attr)
+
+
+def lazy_import(name: str) -> LazyModule:
+    return LazyModule(name)
@@ -1,33 +1,82 @@
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import TYPE_CHECKING, Dict, List, Optional
 
-from langchain.tools import Tool
-from newsapi import NewsApiClient
+from .cache import SingleFlight, ToolCache, cached
+from .lazy import lazy_import
+from .news_dedup import cluster_articles
+from .news_fanout import NewsFanout
+
+if TYPE_CHECKING:
+    from langchain_core.tools import Tool
+
+newsapi = lazy_import("newsapi")
 
 
 class NewsSearchTool:
-    """News API tool for competitor intelligence"""
+    """News API tool for competitor intelligence
+
+    Requests `fetch_size` raw articles and collapses syndicated copies
+    (shingle similarity >= dedup_threshold, see news_dedup) before
+    returning the `max_articles` most relevant distinct stories, each
+    with a source count. dedup_threshold=None returns raw articles.
+
+    With a `fanout` (NewsFanout) the articles come from concurrent
+    requests over its languages and pages instead of a single
+    newsapi-python call; the `language` argument is then ignored.
+    """
 
-    def __init__(self, api_key: str):
-        self.client = NewsApiClient(api_key=api_key)
+    def __init__(
+        self,
+        api_key: str,
+        cache: Optional[ToolCache] = None,
+        single_flight: Optional[SingleFlight] = None,
+        fetch_size: int = 30,
+        dedup_threshold: Optional[float] = 0.5,
+        fanout: Optional[NewsFanout] = None,
+    ):
+        self.api_key = api_key
+        self._client = None
+        self.cache = cache
+        self.single_flight = single_flight or SingleFlight()
+        self.fetch_size = fetch_size
+        self.dedup_threshold = dedup_threshold
+        self.fanout = fanout
 
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = newsapi.NewsApiClient(api_key=self.api_key)
+        return self._client
+
+    @cached("news")
     def search_news(
-        self, query: str, days_back: int = 30, language: str = "en"
+        self,
+        query: str,
+        days_back: int = 30,
+        language: str = "en",
+        max_articles: int = 10,
     ) -> List[Dict]:
         """Search recent news articles"""
         from_date = (datetime.now() - timedelta(days=days_back)).strftime("%Y-%m-%d")
+        dedup = self.dedup_threshold is not None
+        page_size = max(self.fetch_size, max_articles) if dedup else max_articles
 
         try:
-            response = self.client.get_everything(
-                q=query,
-                from_param=from_date,
-                language=language,
-                sort_by="relevancy",
-                page_size=10,
-            )
-
-            articles = response.get("articles", [])
-            return [
+            if self.fanout is not None:
+                raw = self.fanout.search(query, from_date, page_size=page_size)
+                if raw and "error" in raw[0]:
+                    return raw
+            else:
+                response = self.client.get_everything(
+                    q=query,
+                    from_param=from_date,
+                    language=language,
+                    sort_by="relevancy",
+                    page_size=page_size,
+                )
+                raw = response.get("articles", [])
+
+            articles = [
                 {
                     "title": a["title"],
                     "description": a.get("description", ""),
@@ -35,13 +84,18 @@ class NewsSearchTool:
                     "url": a["url"],
                     "published_at": a["publishedAt"],
                 }
-                for a in articles
+                for a in raw
             ]
+            if dedup:
+                articles = cluster_articles(articles, self.dedup_threshold)
+            return articles[:max_articles]
         except Exception as e:
             return [{"error": str(e)}]
 
-    def as_langchain_tool(self) -> Tool:
+    def as_langchain_tool(self) -> "Tool":
         """Convert to LangChain Tool"""
+        from langchain_core.tools import Tool
+
         return Tool(
             name="news_search",
             func=lambda q: self.search_news(q),
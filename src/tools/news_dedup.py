@@ -0,0 +1,68 @@
+import re
+from typing import Dict, FrozenSet, List
+
+# NewsAPI titles usually end with the outlet: "CATL unveils ... - Reuters"
+_OUTLET_SUFFIX = re.compile(r"\s+[-|]\s+[^-|]{2,40}$")
+
+
+def shingles(text: str, k: int = 5) -> FrozenSet[str]:
+    """Character k-grams of the lowercased, punctuation-free text"""
+    normalized = " ".join(re.sub(r"[^\w]+", " ", text.lower()).split())
+    if len(normalized) <= k:
+        return frozenset([normalized]) if normalized else frozenset()
+    return frozenset(normalized[i : i + k] for i in range(len(normalized) - k + 1))
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def article_shingles(article: Dict) -> FrozenSet[str]:
+    title = _OUTLET_SUFFIX.sub("", article.get("title") or "")
+    return shingles(f"{title} {article.get('description') or ''}")
+
+
+def cluster_articles(articles: List[Dict], threshold: float = 0.5) -> List[Dict]:
+    """Collapse near-duplicate articles (syndicated copies, rewrites)
+
+    Articles are compared by Jaccard similarity of character shingles of
+    title and description. In input (relevancy) order, each article
+    joins the first cluster whose representative it matches at
+    >= threshold, otherwise it starts a new cluster. Comparing against
+    the representative only keeps chains of loosely related stories
+    from merging. Each representative comes back once with
+    `source_count` (articles in its cluster) and `sources` (distinct
+    outlets); error entries pass through unchanged.
+    """
+    clusters: List[Dict] = []
+    for article in articles:
+        if "error" in article:
+            clusters.append({"article": article, "members": []})
+            continue
+        grams = article_shingles(article)
+        for cluster in clusters:
+            if cluster["members"] and jaccard(grams, cluster["grams"]) >= threshold:
+                cluster["members"].append(article)
+                break
+        else:
+            clusters.append({"article": article, "grams": grams, "members": [article]})
+
+    results = []
+    for cluster in clusters:
+        if not cluster["members"]:
+            results.append(cluster["article"])
+            continue
+        sources = []
+        for member in cluster["members"]:
+            if member.get("source") and member["source"] not in sources:
+                sources.append(member["source"])
+        results.append(
+            {
+                **cluster["article"],
+                "source_count": len(cluster["members"]),
+                "sources": sources,
+            }
+        )
+    return results
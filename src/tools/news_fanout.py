@@ -0,0 +1,220 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .lazy import lazy_import
+
+httpx = lazy_import("httpx")
+
+NEWS_API_URL = "https://newsapi.org/v2/everything"
+
+# Developer keys get at most 100 results per query (page * pageSize)
+MAX_RESULTS = 100
+
+# Reciprocal rank fusion constant: damps the lead of rank 1 over rank 2
+RRF_K = 60
+
+
+class RequestPacer:
+    """Spaces request starts at least 1/requests_per_second apart
+
+    Thread-safe; pause() pushes every later slot back, so one 429 with a
+    Retry-After holds all workers instead of each finding out separately.
+    """
+
+    def __init__(self, requests_per_second: Optional[float]):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def pause(self, seconds: float):
+        with self._lock:
+            self._next = max(self._next, time.monotonic() + seconds)
+
+
+class NewsFanout:
+    """Concurrent NewsAPI /everything requests over one pooled HTTP client
+
+    search() queries every language at once, then fetches further pages
+    only for languages whose totalResults says they exist. Requests run on
+    up to `max_workers` threads sharing an httpx.Client, so connections
+    stay open between requests and calls. Request starts are paced to
+    `requests_per_second`; a 429 (rateLimited) pauses all workers for its
+    Retry-After (or an exponential backoff) and is retried up to
+    `max_retries` times.
+
+    Results are merged by reciprocal rank fusion, so each language's top
+    stories lead the list, and exact duplicate URLs are fused into one
+    entry. A language that fails (NewsAPI rejects codes it does not
+    index) only drops its own results.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        languages: Sequence[str] = ("en",),
+        pages: int = 1,
+        base_url: str = NEWS_API_URL,
+        max_workers: int = 8,
+        requests_per_second: Optional[float] = 5.0,
+        max_retries: int = 3,
+        backoff_base: float = 1.0,
+        timeout: float = 15.0,
+    ):
+        self.api_key = api_key
+        self.languages = list(languages)
+        self.pages = pages
+        self.base_url = base_url
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.timeout = timeout
+        self.pacer = RequestPacer(requests_per_second)
+        self._http = None
+        self._http_lock = threading.Lock()
+        self._stats = {"requests": 0, "retries": 0, "errors": 0}
+        self._stats_lock = threading.Lock()
+
+    @property
+    def http(self):
+        if self._http is None:
+            with self._http_lock:
+                if self._http is None:
+                    self._http = httpx.Client(
+                        timeout=self.timeout,
+                        headers={"X-Api-Key": self.api_key},
+                        limits=httpx.Limits(
+                            max_connections=self.max_workers,
+                            max_keepalive_connections=self.max_workers,
+                        ),
+                    )
+        return self._http
+
+    def search(
+        self,
+        query: str,
+        from_date: str,
+        page_size: int = 30,
+        languages: Optional[Sequence[str]] = None,
+    ) -> List[Dict]:
+        """Merged, re-ranked articles for query across languages and pages"""
+        languages = list(languages or self.languages)
+        page_size = min(page_size, MAX_RESULTS)
+        params = {"q": query, "from": from_date, "sortBy": "relevancy"}
+        last_page = min(self.pages, MAX_RESULTS // page_size)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            first = list(
+                executor.map(
+                    lambda lang: self._get(params, lang, 1, page_size), languages
+                )
+            )
+            more = [
+                (lang, page)
+                for lang, response in zip(languages, first)
+                if "articles" in response
+                for page in range(2, last_page + 1)
+                if response.get("totalResults", 0) > (page - 1) * page_size
+            ]
+            rest = list(
+                executor.map(
+                    lambda job: self._get(params, job[0], job[1], page_size), more
+                )
+            )
+
+        ranked: List[Tuple[int, Dict]] = []
+        errors = []
+        for (lang, page), response in zip(
+            [(lang, 1) for lang in languages] + more, first + rest
+        ):
+            if "articles" not in response:
+                errors.append(f"{lang}: {response.get('message', 'request failed')}")
+                continue
+            for rank, article in enumerate(response["articles"]):
+                ranked.append(((page - 1) * page_size + rank, article))
+
+        if not ranked and errors:
+            return [{"error": "; ".join(errors)}]
+        return _fuse(ranked)
+
+    def stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def close(self):
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+
+    def _get(self, params: Dict, language: str, page: int, page_size: int) -> Dict:
+        request = {**params, "language": language, "page": page, "pageSize": page_size}
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self._count("retries")
+            self.pacer.wait()
+            self._count("requests")
+            try:
+                response = self.http.get(self.base_url, params=request)
+            except httpx.TransportError as e:
+                error = {"status": "error", "message": str(e)}
+                if attempt < self.max_retries:
+                    time.sleep(self._backoff(attempt))
+                continue
+
+            if response.status_code == 429:
+                error = {"status": "error", "message": "rateLimited"}
+                delay = _retry_after(response)
+                # Every worker waits out the limit, not just this one
+                self.pacer.pause(self._backoff(attempt) if delay is None else delay)
+                continue
+
+            try:
+                body = response.json()
+            except ValueError:
+                body = {"status": "error", "message": response.text[:200]}
+            if body.get("status") != "ok":
+                self._count("errors")
+            return body
+
+        self._count("errors")
+        return error
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0.5, 1.0) * self.backoff_base * 2**attempt
+
+    def _count(self, name: str):
+        with self._stats_lock:
+            self._stats[name] += 1
+
+
+def _retry_after(response) -> Optional[float]:
+    try:
+        return float(response.headers.get("Retry-After", ""))
+    except ValueError:
+        return None
+
+
+def _fuse(ranked: List[Tuple[int, Dict]]) -> List[Dict]:
+    """Reciprocal rank fusion of per-language results, keyed by URL"""
+    scores: Dict[str, float] = {}
+    articles: Dict[str, Dict] = {}
+    for rank, article in ranked:
+        url = article.get("url") or article.get("title")
+        scores[url] = scores.get(url, 0.0) + 1.0 / (RRF_K + rank)
+        articles.setdefault(url, article)
+    # Newest first among equal scores (same rank in different languages)
+    order = sorted(
+        scores, key=lambda url: articles[url].get("publishedAt") or "", reverse=True
+    )
+    order.sort(key=lambda url: -scores[url])
+    return [articles[url] for url in order]
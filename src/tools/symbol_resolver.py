@@ -0,0 +1,382 @@
+import bisect
+import os
+import re
+import threading
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+DEFAULT_INDEX = os.path.join(os.path.dirname(__file__), "data", "symbols.tsv")
+
+# Dropped from names and queries: "LG Energy Solution Ltd." == "lg energy solution"
+SUFFIXES = {
+    "ab",
+    "ag",
+    "adr",
+    "asa",
+    "co",
+    "company",
+    "corp",
+    "corporation",
+    "inc",
+    "incorporated",
+    "limited",
+    "llc",
+    "lp",
+    "ltd",
+    "nv",
+    "plc",
+    "sa",
+    "se",
+    "spa",
+    "the",
+}
+
+# Descriptive words a query may add or drop: "Tesla Motors" == "Tesla".
+# Only these are cut from the end of a query, and fuzzy matches ignore
+# them when checking that every query word matches the name.
+GENERIC_WORDS = {
+    "automotive",
+    "global",
+    "group",
+    "holding",
+    "holdings",
+    "industries",
+    "international",
+    "motor",
+    "motors",
+    "technologies",
+    "technology",
+}
+
+# Industry and dictionary words that name no company on their own: a
+# one-word query made of one of these only resolves by exact name
+COMMON_TERMS = {
+    "anode",
+    "auto",
+    "automobile",
+    "bank",
+    "batteries",
+    "battery",
+    "capital",
+    "cathode",
+    "cell",
+    "cells",
+    "chemical",
+    "chemicals",
+    "cobalt",
+    "electric",
+    "electrolyte",
+    "electronics",
+    "energy",
+    "financial",
+    "gas",
+    "graphite",
+    "industry",
+    "lithium",
+    "market",
+    "materials",
+    "metals",
+    "minerals",
+    "mining",
+    "nickel",
+    "oil",
+    "power",
+    "resources",
+    "semiconductor",
+    "semiconductors",
+    "sodium",
+    "solar",
+    "solid",
+    "solutions",
+    "steel",
+    "storage",
+    "systems",
+}
+
+# "$TSLA", "373220.KS", "BRK-B": only inputs shaped like this are looked up
+# as symbols, so words such as "IT" or "ALL" are not taken for tickers
+_TICKER = re.compile(
+    r"\$([A-Za-z0-9]{1,6}(?:[.-][A-Za-z]{1,3})?)|([A-Z0-9]{1,6}[.-][A-Z]{1,3})"
+)
+
+# Upper bound on keys scored per fuzzy lookup
+MAX_CANDIDATES = 1000
+
+
+class SymbolMatch(NamedTuple):
+    symbol: str
+    name: str
+    score: float
+    method: str  # "symbol", "alias", "prefix", "ngram"
+
+
+def normalize_name(text: str) -> str:
+    words = re.sub(r"[^a-z0-9&]+", " ", text.lower().replace("_", " ")).split()
+    return " ".join(w for w in words if w not in SUFFIXES)
+
+
+def trigrams(text: str) -> List[str]:
+    padded = f" {text} "
+    return [padded[i : i + 3] for i in range(len(padded) - 2)]
+
+
+def dice(a: frozenset, b: frozenset) -> float:
+    return 2 * len(a & b) / (len(a) + len(b)) if a or b else 0.0
+
+
+class SymbolResolver:
+    """Company name -> ticker symbol over a bundled, updatable symbol index
+
+    The index (data/symbols.tsv: symbol, name, |-separated aliases) is
+    loaded on the first lookup and indexed once: a dict of normalized
+    names/aliases/symbols, a sorted key list for prefix search, and a
+    character-trigram inverted index. A lookup tries, in order, the
+    symbol (only for ticker-shaped input: "$TSLA", "373220.KS"), an exact
+    alias, the query with trailing GENERIC_WORDS dropped ("Tesla Motors"
+    -> "tesla"), a key starting with the query's whole words
+    ("contemporary amperex" -> "contemporary amperex technology") and
+    finally trigram similarity (Dice coefficient >= min_score, scored on
+    keys sharing one of the query's probe_grams rarest trigrams), which
+    absorbs typos and word-order noise. A fuzzy match also needs the
+    query and name to agree word by word, including the name's first
+    distinctive word, so a shared word ("Electronics") cannot carry "LG
+    Electronics" to Samsung Electronics. A single generic or industry
+    word ("lithium", "energy") resolves only by exact name.
+
+    Extra aliases (e.g. FinanceDataTool.company_tickers) take precedence
+    over the file.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_INDEX,
+        aliases: Optional[Dict[str, str]] = None,
+        min_score: float = 0.6,
+        probe_grams: int = 8,
+    ):
+        self.path = path
+        self.aliases = dict(aliases or {})
+        self.min_score = min_score
+        self.probe_grams = probe_grams
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def resolve(self, text: str) -> Optional[str]:
+        match = self.match(text)
+        return match.symbol if match else None
+
+    def match(self, text: str) -> Optional[SymbolMatch]:
+        self._ensure_loaded()
+        if not text or not text.strip():
+            return None
+
+        ticker = _TICKER.fullmatch(text.strip())
+        if ticker:
+            symbol = (ticker.group(1) or ticker.group(2)).upper()
+            if symbol in self._names:
+                return SymbolMatch(symbol, self._names[symbol], 1.0, "symbol")
+
+        query = normalize_name(text)
+        if not query:
+            return None
+        if query in self._exact:
+            return self._result(self._exact[query], 1.0, "alias")
+
+        words = query.split()
+        end = len(words)
+        while end > 1 and words[end - 1] in GENERIC_WORDS:
+            end -= 1
+            shorter = " ".join(words[:end])
+            if shorter in self._exact:
+                return self._result(self._exact[shorter], end / len(words), "alias")
+
+        # "Lithium" or "energy" alone names an industry, not an issuer
+        if len(words) == 1 and words[0] in GENERIC_WORDS | COMMON_TERMS:
+            return None
+
+        if len(query) >= 3:
+            # Whole words only: "motor" must not become "motorola solutions"
+            start = bisect.bisect_left(self._keys, query + " ")
+            if start < len(self._keys) and self._keys[start].startswith(query + " "):
+                return self._result(self._exact[self._keys[start]], 0.9, "prefix")
+
+        for score, key in self._scored(query):
+            if score < self.min_score:
+                break
+            if self._words_match(words, key):
+                return self._result(self._exact[key], score, "ngram")
+        return None
+
+    def search(
+        self, text: str, limit: int = 5, normalized: bool = False
+    ) -> List[SymbolMatch]:
+        """Best trigram matches, e.g. for "did you mean" suggestions"""
+        self._ensure_loaded()
+        query = text if normalized else normalize_name(text)
+
+        results, seen = [], set()
+        for score, key in self._scored(query):
+            symbol = self._exact[key]
+            if symbol not in seen:
+                seen.add(symbol)
+                results.append(self._result(symbol, score, "ngram"))
+            if len(results) == limit:
+                break
+        return results
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self._names)
+
+    def _result(self, symbol: str, score: float, method: str) -> SymbolMatch:
+        return SymbolMatch(symbol, self._names.get(symbol, symbol), score, method)
+
+    def _scored(self, query: str) -> List[Tuple[float, str]]:
+        """(Dice score, key) pairs, best first"""
+        grams = frozenset(trigrams(query))
+
+        # Candidates come from the rarest grams only: common ones (" co",
+        # "ing") would touch most of the index for no ranking benefit
+        rare = sorted(
+            (self._grams[gram] for gram in grams if gram in self._grams), key=len
+        )
+        candidates = set()
+        for posting in rare[: self.probe_grams]:
+            if candidates and len(candidates) + len(posting) > MAX_CANDIDATES:
+                break
+            candidates.update(posting)
+
+        size = len(grams)
+        key_grams = self._key_grams
+        # Negated scores sort best first, ties by key, without a key function
+        scored = sorted(
+            (
+                -2 * len(grams & key_grams[key]) / (size + len(key_grams[key])),
+                key,
+            )
+            for key in candidates
+        )
+        return [(-score, key) for score, key in scored]
+
+    def _words_match(self, words: List[str], key: str) -> bool:
+        """Query and key agree on their distinctive words
+
+        Every non-generic query word must resemble some word of key, and
+        key's first non-generic word (the one naming the company, e.g.
+        "samsung" in "samsung electronics") must resemble a query word.
+        """
+        key_words = [frozenset(trigrams(word)) for word in key.split()]
+        query_words = [frozenset(trigrams(word)) for word in words]
+
+        def similar(grams, others):
+            return any(dice(grams, other) >= self.min_score for other in others)
+
+        for word, grams in zip(words, query_words):
+            if word not in GENERIC_WORDS and not similar(grams, key_words):
+                return False
+        distinctive = [w for w in key.split() if w not in GENERIC_WORDS]
+        return not distinctive or similar(
+            frozenset(trigrams(distinctive[0])), query_words
+        )
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            names: Dict[str, str] = {}
+            exact: Dict[str, str] = {}
+            for symbol, name, aliases in load_index(self.path):
+                names[symbol] = name
+                for key in [name, *aliases]:
+                    # Earlier rows (seed entries) keep contested aliases
+                    exact.setdefault(normalize_name(key), symbol)
+            for alias, symbol in self.aliases.items():
+                names.setdefault(symbol, alias)
+                exact[normalize_name(alias)] = symbol
+            exact.pop("", None)
+
+            grams: Dict[str, List[str]] = {}
+            key_grams: Dict[str, frozenset] = {}
+            for key in exact:
+                key_grams[key] = frozenset(trigrams(key))
+                for gram in key_grams[key]:
+                    grams.setdefault(gram, []).append(key)
+
+            self._names = names
+            self._exact = exact
+            self._keys = sorted(exact)
+            self._grams = grams
+            self._key_grams = key_grams
+            self._loaded = True
+
+
+def load_index(path: str) -> Iterable[Tuple[str, str, List[str]]]:
+    """(symbol, name, aliases) rows of a symbols.tsv file"""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip() or line.startswith("#"):
+                continue
+            fields = line.rstrip("\n").split("\t")
+            aliases = fields[2].split("|") if len(fields) > 2 and fields[2] else []
+            yield fields[0], fields[1], aliases
+
+
+def write_index(path: str, rows: Iterable[Tuple[str, str, List[str]]]):
+    """Write (symbol, name, aliases) rows; the first row per symbol wins"""
+    seen = set()
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(
+            "# symbol\tname\taliases (|-separated); "
+            "rebuild with examples/update_symbol_index.py\n"
+        )
+        for symbol, name, aliases in rows:
+            if symbol in seen:
+                continue
+            seen.add(symbol)
+            f.write(f"{symbol}\t{name}\t{'|'.join(aliases)}\n")
+    os.replace(tmp, path)
+
+
+def parse_nasdaq_listing(lines: Iterable[str]) -> Iterable[Tuple[str, str, List[str]]]:
+    """Rows from NASDAQ Trader's nasdaqtraded.txt (all US-listed securities)
+
+    Skips ETFs and test issues; "Tesla, Inc. - Common Stock" becomes
+    "Tesla, Inc.".
+    """
+    header = None
+    for line in lines:
+        fields = line.rstrip("\r\n").split("|")
+        if header is None:
+            header = {name: i for i, name in enumerate(fields)}
+            continue
+        if len(fields) < len(header) or line.startswith("File Creation Time"):
+            continue
+        if fields[header["ETF"]] == "Y" or fields[header["Test Issue"]] == "Y":
+            continue
+        # Yahoo writes class shares with a dash: BRK.B -> BRK-B
+        symbol = fields[header["Symbol"]].replace(".", "-")
+        name = fields[header["Security Name"]].split(" - ")[0].strip()
+        if symbol and name:
+            yield symbol, name, []
+
+
+_defaults: Dict[Tuple, SymbolResolver] = {}
+_default_lock = threading.Lock()
+
+
+def default_resolver(aliases: Optional[Dict[str, str]] = None) -> SymbolResolver:
+    """Process-wide resolver over the bundled index, loaded on first lookup
+
+    One resolver is shared per set of extra aliases. SYMBOL_INDEX_PATH
+    points it at another index, e.g. a full listing written by
+    examples/update_symbol_index.py --output.
+    """
+    key = tuple(sorted((aliases or {}).items()))
+    with _default_lock:
+        if key not in _defaults:
+            _defaults[key] = SymbolResolver(
+                os.getenv("SYMBOL_INDEX_PATH", DEFAULT_INDEX), aliases=aliases
+            )
+        return _defaults[key]
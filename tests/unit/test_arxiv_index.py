@@ -0,0 +1,146 @@
+import os
+import re
+import sys
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from tools import arxiv_search
+from tools.arxiv_index import ArxivIndex
+from tools.arxiv_search import ArxivSearchTool
+
+NOW = datetime.now(timezone.utc).replace(microsecond=0)
+
+
+def paper(n, title, summary="", days_old=1, category="cond-mat.mtrl-sci"):
+    return SimpleNamespace(
+        entry_id=f"http://arxiv.org/abs/2401.{n:05d}v1",
+        title=title,
+        authors=[SimpleNamespace(name="A. Author"), SimpleNamespace(name="B. Author")],
+        published=NOW - timedelta(days=days_old),
+        summary=summary or f"Abstract of {title}",
+        pdf_url=f"http://arxiv.org/pdf/2401.{n:05d}v1",
+        categories=[category],
+    )
+
+
+class FakeClient:
+    """arxiv.Client stand-in honouring submittedDate ranges and sort order"""
+
+    def __init__(self, papers):
+        self.papers = list(papers)
+        self.queries = []
+        self.yielded = 0
+
+    def results(self, search):
+        self.queries.append(search.query)
+        start = re.search(r"submittedDate:\[(\d{12})", search.query).group(1)
+        since = datetime.strptime(start, "%Y%m%d%H%M").replace(tzinfo=timezone.utc)
+        papers = sorted(
+            (p for p in self.papers if p.published >= since),
+            key=lambda p: p.published,
+            reverse=search.sort_order == arxiv_search.arxiv.SortOrder.Descending,
+        )
+        for result in papers[: search.max_results]:
+            self.yielded += 1
+            yield result
+
+
+class TestArxivIndex:
+    """Test the local FTS5 arXiv index"""
+
+    @pytest.fixture
+    def index(self, tmp_path):
+        index = ArxivIndex(str(tmp_path / "arxiv.sqlite"), categories=["cat-a"])
+        yield index
+        index.close()
+
+    def test_bm25_ranking(self, index):
+        """Test title matches outrank abstract mentions and old papers drop out"""
+        index.add(
+            [
+                paper(1, "Cathode coatings", "Mentions solid-state electrolyte once"),
+                paper(2, "Solid electrolyte interphase in solid-state batteries"),
+                paper(3, "Solid electrolytes revisited", days_old=900),
+                paper(4, "Graphene supercapacitors"),
+            ]
+        )
+
+        results = index.search("solid-state electrolyte", max_results=5)
+
+        assert [r["title"] for r in results] == [
+            "Solid electrolyte interphase in solid-state batteries",
+            "Cathode coatings",
+        ]
+        assert results[0]["authors"] == ["A. Author", "B. Author"]
+        assert results[0]["categories"] == ["cond-mat.mtrl-sci"]
+
+    def test_partial_matches_need_coverage(self, index):
+        """Test all key terms are preferred and weak overlaps return nothing"""
+        index.add(
+            [
+                paper(1, "Silicon anode expansion"),
+                paper(2, "Silicon anode binders for lithium cells"),
+                paper(3, "Lattice quantum chromodynamics on GPUs"),
+            ]
+        )
+
+        assert [r["title"] for r in index.search("silicon anode binders")] == [
+            "Silicon anode binders for lithium cells"
+        ]
+        # Two of three key terms: relaxed match
+        assert len(index.search("silicon anode coatings")) == 2
+        # One shared word ("anode") is not enough to answer locally
+        assert index.search("perovskite solar anode degradation") == []
+
+    def test_incremental_sync(self, index):
+        """Test a second sync fetches only papers past the watermark"""
+        client = FakeClient([paper(1, "Old anode", days_old=5), paper(2, "Anode")])
+        assert index.sync(client) == {"cat-a": 2}
+        assert "cat:cat-a" in client.queries[0]
+
+        client.papers.insert(0, paper(3, "New anode", days_old=0))
+        client.yielded = 0
+        assert index.sync(client) == {"cat-a": 1}
+
+        # Resumed at the watermark instead of rereading the whole window
+        assert client.yielded == 2
+        assert index.status()["papers"] == 3
+        assert index.is_fresh()
+        assert not index.is_fresh(max_age=-1)
+
+    def test_backlog_larger_than_batch(self, index):
+        """Test a sync pages through a backlog bigger than max_results"""
+        papers = [paper(n, f"Electrolyte {n}", days_old=n * 0.01) for n in range(25)]
+        client = FakeClient(papers)
+
+        assert index.sync(client, max_results=10) == {"cat-a": 25}
+
+        assert index.status()["papers"] == 25
+        assert len(client.queries) == 3
+        watermark = index.status()["categories"]["cat-a"]["watermark"]
+        assert watermark == max(p.published for p in papers).isoformat()
+
+    def test_tool_answers_from_fresh_index(self, index, monkeypatch):
+        """Test the tool skips the API while the index is fresh"""
+        live = FakeClient([paper(9, "Live anode result")])
+        monkeypatch.setattr(arxiv_search.arxiv, "Client", lambda page_size: live)
+        tool = ArxivSearchTool(index=index)
+
+        # Never synced: stale, so the live API answers
+        assert tool.search_papers("anode")[0]["title"] == "Live anode result"
+
+        index.sync(FakeClient([paper(1, "Indexed anode study")]))
+        assert tool.search_papers("anode")[0]["title"] == "Indexed anode study"
+        assert len(live.queries) == 1
+
+        # Fresh, but nothing covers the query: the live API answers
+        tool.search_papers("anode perovskite tandem")
+        assert len(live.queries) == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,80 @@
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from tools import arxiv_search
+from tools.arxiv_search import ArxivSearchTool, date_filtered_query
+
+NOW = datetime.now(timezone.utc)
+
+
+def paper(days_old):
+    return SimpleNamespace(
+        title=f"Paper {days_old}d",
+        authors=[SimpleNamespace(name="A. Author")],
+        published=NOW - timedelta(days=days_old),
+        summary="Solid electrolyte interphase",
+        pdf_url="https://arxiv.org/pdf/0000.00000",
+        categories=["cond-mat.mtrl-sci"],
+    )
+
+
+class TestArxivSearchTool:
+    """Test arXiv search without network access"""
+
+    @pytest.fixture
+    def fake_client(self, monkeypatch):
+        """arxiv.Client stand-in serving papers newest first"""
+        log = {"clients": [], "searches": [], "yielded": 0}
+        papers = [paper(days) for days in (1, 10, 40, 400, 500, 600)]
+
+        class FakeClient:
+            def __init__(self, page_size=100):
+                log["clients"].append(page_size)
+
+            def results(self, search):
+                log["searches"].append(search)
+                for result in papers[: search.max_results]:
+                    log["yielded"] += 1
+                    yield result
+
+        monkeypatch.setattr(arxiv_search.arxiv, "Client", FakeClient)
+        return log
+
+    def test_date_range_in_query(self):
+        """Test the submittedDate range is part of the query string"""
+        since = datetime(2024, 1, 2, 3, 4, tzinfo=timezone.utc)
+        until = datetime(2025, 6, 7, 8, 9, tzinfo=timezone.utc)
+
+        query = date_filtered_query("solid-state battery", since, until)
+
+        assert query == (
+            "(solid-state battery) AND submittedDate:[202401020304 TO 202506070809]"
+        )
+
+    def test_stops_at_cutoff(self, fake_client):
+        """Test iteration stops at the first paper older than days_back"""
+        tool = ArxivSearchTool()
+
+        results = tool.search_papers("anode", days_back=100)
+
+        assert [r["title"] for r in results] == ["Paper 1d", "Paper 10d", "Paper 40d"]
+        assert fake_client["yielded"] == 4
+        assert "submittedDate:[" in fake_client["searches"][0].query
+
+    def test_page_size_follows_max_results(self, fake_client):
+        """Test one request covers max_results unless page_size is set"""
+        ArxivSearchTool().search_papers("anode", max_results=5)
+        ArxivSearchTool(page_size=2).search_papers("anode", max_results=5)
+        ArxivSearchTool(page_size=50).search_papers("anode", max_results=5)
+
+        assert fake_client["clients"] == [5, 2, 5]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
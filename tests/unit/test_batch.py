@@ -0,0 +1,103 @@
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from src.graph.batch import BatchRunner, load_records
+
+
+class FakeWorkflow:
+    """Async workflow stand-in that tracks how many runs overlap"""
+
+    def __init__(self, fail_on=()):
+        self.fail_on = set(fail_on)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.queries = []
+
+    async def arun(self, query, context=""):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        self.queries.append(query)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+
+        if query in self.fail_on:
+            raise RuntimeError("Bedrock throttled")
+        return {
+            "executive_summary": f"Summary of {query}",
+            "final_report": f"Report on {query} ({context})",
+            "recommendations": ["- act"],
+            "agent_statuses": {"synthesis": "completed"},
+            "errors": [],
+        }
+
+
+def read_jsonl(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class TestBatchRunner:
+    """Test bulk query execution and resume"""
+
+    @pytest.fixture
+    def input_path(self, tmp_path):
+        path = tmp_path / "queries.jsonl"
+        with open(path, "w") as f:
+            for i in range(10):
+                f.write(json.dumps({"id": f"q{i}", "query": f"query {i}"}) + "\n")
+        return str(path)
+
+    def test_runs_all_with_bounded_concurrency(self, input_path, tmp_path):
+        """Test every query runs and at most `concurrency` overlap"""
+        workflow = FakeWorkflow()
+        output = str(tmp_path / "out.jsonl")
+
+        stats = BatchRunner(workflow, concurrency=3).run(input_path, output)
+
+        rows = read_jsonl(output)
+        assert stats["completed"] == 10
+        assert workflow.max_in_flight == 3
+        assert {row["id"] for row in rows} == {f"q{i}" for i in range(10)}
+        assert stats["queries_per_min"] > 0
+        assert stats["p50_latency_s"] <= stats["p95_latency_s"]
+
+    def test_resume_skips_completed(self, input_path, tmp_path):
+        """Test a rerun only processes queries missing from the checkpoint"""
+        output = str(tmp_path / "out.jsonl")
+        first = FakeWorkflow(fail_on={"query 4"})
+        BatchRunner(first, concurrency=4).run(input_path, output)
+
+        second = FakeWorkflow()
+        stats = BatchRunner(second, concurrency=4).run(input_path, output)
+
+        assert second.queries == ["query 4"]
+        assert stats["skipped"] == 9
+        assert stats["completed"] == 1
+        rows = read_jsonl(output)
+        assert [row["error"] for row in rows if row["id"] == "q4"] == [
+            "Bedrock throttled",
+            None,
+        ]
+
+    def test_records_without_ids_get_stable_ids(self, tmp_path):
+        """Test IDs derived from query/context match across runs"""
+        path = tmp_path / "queries.jsonl"
+        with open(path, "w") as f:
+            f.write(json.dumps({"query": "LG Energy", "context": "2024"}) + "\n")
+            f.write(json.dumps({"query": "LG Energy"}) + "\n")
+
+        first = load_records(str(path))
+        second = load_records(str(path))
+
+        assert [r["id"] for r in first] == [r["id"] for r in second]
+        assert first[0]["id"] != first[1]["id"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,92 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from benchmarks import bench_startup, bench_workflow
+from benchmarks.harness import compare_results
+
+
+class TestBenchmarks:
+    """Smoke test the offline benchmark suite so it does not rot"""
+
+    def test_quick_run_writes_json(self, tmp_path):
+        """Test a quick run covers every hot path and writes JSON"""
+        output = str(tmp_path / "bench.json")
+
+        assert bench_workflow.main(["--quick", "--output", output]) == 0
+
+        with open(output) as f:
+            results = json.load(f)
+        names = set(results["benchmarks"])
+        assert {
+            "graph_compile",
+            "workflow_run",
+            "workflow_arun",
+            "synthesis_prompt_format",
+            "research_parse_findings",
+            "competitor_parse_insights",
+            "concurrency_async_2",
+            "concurrency_threads_2",
+            "agent_mode_react",
+            "agent_mode_prefetch",
+        } <= names
+        assert results["meta"]["python"]
+
+    def test_compare_flags_regressions(self):
+        """Test slowdowns beyond the threshold are flagged"""
+        baseline = {"benchmarks": {"a": {"median_s": 1.0}, "b": {"median_s": 1.0}}}
+        current = {"benchmarks": {"a": {"median_s": 1.1}, "b": {"median_s": 1.5}}}
+
+        rows = {row["name"]: row for row in compare_results(baseline, current, 0.2)}
+
+        assert not rows["a"]["regression"]
+        assert rows["b"]["regression"]
+
+    def test_parse_importtime(self):
+        """Test -X importtime lines parse into names, depths and timings"""
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   json.decoder\n"
+            "import time:       300 |        420 | json\n"
+        )
+
+        rows = bench_startup.parse_importtime(stderr)
+
+        assert rows == [
+            {"name": "json.decoder", "depth": 1, "self_us": 120, "cumulative_us": 120},
+            {"name": "json", "depth": 0, "self_us": 300, "cumulative_us": 420},
+        ]
+
+    def test_startup_defers_heavy_imports(self):
+        """Test importing the workflow and tools stays lazy
+
+        Import times vary with the machine; bench_startup.py checks those
+        against DEFAULT_BUDGETS.
+        """
+        results = bench_startup.bench_imports(list(bench_startup.DEFAULT_BUDGETS), 1)
+
+        assert bench_startup.check_budgets(results, {}, True) == []
+
+    def test_check_budgets(self):
+        """Test slow modules and eager heavy imports are both reported"""
+        results = {
+            "slow": {"median_ms": 600.0, "deferred_loaded": []},
+            "eager": {"median_ms": 10.0, "deferred_loaded": ["boto3"]},
+        }
+
+        failures = bench_startup.check_budgets(
+            results, {"slow": 500, "eager": 500}, True
+        )
+
+        assert failures == [
+            "slow: 600ms > 500ms budget",
+            "eager: eagerly imports boto3",
+        ]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,129 @@
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+from langchain_core.language_models import FakeListChatModel
+from langchain_core.tools import Tool
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from src.agents import llm_registry
+from src.cassette import Cassette, CassetteMissError
+from src.graph.workflow import MultiAgentWorkflow
+
+
+def make_tools(calls):
+    def search(name):
+        def run(query):
+            calls.append((name, query))
+            return [{"title": f"{name} result for {query}"}]
+
+        return Tool(name=name, func=run, description=f"{name} tool")
+
+    return {
+        "arxiv_search": search("arxiv_search"),
+        "yahoo_finance": search("yahoo_finance"),
+        "news_api": search("news_search"),
+    }
+
+
+class TestCassette:
+    """Test record/replay of LLM and tool calls"""
+
+    @pytest.fixture
+    def path(self, tmp_path):
+        return str(tmp_path / "cassette.json")
+
+    @pytest.fixture
+    def config(self):
+        llm_registry.clear_registry()
+        yield {
+            "region": "us-west-2",
+            "model_id": "anthropic.claude-3-haiku-20240307-v1:0",
+        }
+        llm_registry.clear_registry()
+
+    def test_llm_round_trip(self, path):
+        """Test recorded LLM answers replay without the real model"""
+        with Cassette(path, mode="record") as cassette:
+            llm = cassette.wrap_llm(FakeListChatModel(responses=["first"]), "m")
+            assert llm.invoke("hello").content == "first"
+
+        replay = Cassette(path).wrap_llm(None, "m")
+
+        assert replay.invoke("hello").content == "first"
+        with pytest.raises(CassetteMissError):
+            replay.invoke("never recorded")
+
+    def test_stream_round_trip(self, path):
+        """Test streamed responses replay chunk by chunk"""
+        with Cassette(path, mode="record") as cassette:
+            llm = cassette.wrap_llm(FakeListChatModel(responses=["abc"]), "m")
+            recorded = [chunk.content for chunk in llm.stream("hi")]
+
+        replayed = [
+            chunk.content for chunk in Cassette(path).wrap_llm(None, "m").stream("hi")
+        ]
+
+        assert replayed == recorded == ["a", "b", "c"]
+
+    def test_tool_round_trip_with_latency(self, path):
+        """Test tool outputs replay with recorded latency injected"""
+
+        def slow_search(query):
+            time.sleep(0.05)
+            return [{"title": query}]
+
+        tool = Tool(name="arxiv_search", func=slow_search, description="d")
+        with Cassette(path, mode="record") as cassette:
+            cassette.wrap_tool(tool).run("anode")
+
+        fast = Cassette(path).wrap_tool(tool)
+        timed = Cassette(path, latency=True).wrap_tool(tool)
+
+        start = time.perf_counter()
+        assert fast.func("anode") == [{"title": "anode"}]
+        fast_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        timed.func("anode")
+        timed_elapsed = time.perf_counter() - start
+
+        assert timed_elapsed >= 0.05 > fast_elapsed
+
+    def test_workflow_replays_offline(self, path, config, monkeypatch):
+        """Test a recorded workflow run replays without Bedrock or tools"""
+        monkeypatch.setattr(
+            llm_registry,
+            "ChatBedrock",
+            lambda **kwargs: FakeListChatModel(
+                responses=["Thought: done\nFinal Answer: - finding one\n- finding two"]
+            ),
+        )
+        calls = []
+
+        with Cassette(path, mode="record") as cassette:
+            recorded = MultiAgentWorkflow(
+                make_tools(calls), {**config, "cassette": cassette}
+            ).run("solid-state batteries")
+
+        monkeypatch.undo()
+        llm_registry.clear_registry()
+
+        replay = {**config, "cassette": Cassette(path)}
+        workflow = MultiAgentWorkflow(make_tools(calls), replay)
+        replayed = workflow.run("solid-state batteries")
+        replayed_async = asyncio.run(
+            MultiAgentWorkflow(make_tools(calls), replay).arun("solid-state batteries")
+        )
+
+        assert recorded["research_findings"] == ["finding one", "finding two"]
+        for result in (replayed, replayed_async):
+            assert result["research_findings"] == recorded["research_findings"]
+            assert result["final_report"] == recorded["final_report"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,151 @@
+import asyncio
+import os
+import sys
+
+import pytest
+from langchain_core.tools import Tool
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from benchmarks.fakes import fake_llm_factory, fake_tools
+from src.graph.workflow import MultiAgentWorkflow
+
+
+class FlakyNews:
+    """News tool that times out on its first `failures` calls"""
+
+    def __init__(self, failures=1):
+        self.failures = failures
+        self.calls = 0
+
+    def __call__(self, query):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ConnectionError("NewsAPI timed out")
+        return [{"title": "LG Energy expands LFP lines", "source": "Reuters"}]
+
+
+def count_calls(agent):
+    """Wrap agent.analyze/aanalyze so tests can see which agents reran"""
+    calls = []
+    analyze, aanalyze = agent.analyze, agent.aanalyze
+
+    def counted(*args, **kwargs):
+        calls.append(1)
+        return analyze(*args, **kwargs)
+
+    async def acounted(*args, **kwargs):
+        calls.append(1)
+        return await aanalyze(*args, **kwargs)
+
+    agent.analyze, agent.aanalyze = counted, acounted
+    return calls
+
+
+class TestCheckpointedWorkflow:
+    """Test per-agent checkpoints and resuming failed branches"""
+
+    @pytest.fixture
+    def news(self):
+        return FlakyNews()
+
+    @pytest.fixture
+    def workflow(self, news, tmp_path):
+        tools = fake_tools()
+        tools["news_api"] = Tool(name="news_search", func=news, description="News")
+        config = {
+            "region": "us-west-2",
+            "model_id": "fake",
+            "llm_factory": fake_llm_factory(),
+            "checkpoint_path": str(tmp_path / "runs.sqlite"),
+        }
+        return MultiAgentWorkflow(tools, config)
+
+    def test_failures_recorded(self, workflow):
+        """Test a failed agent shows up in statuses and errors"""
+        result = workflow.run("LG Energy Solution outlook", run_id="run-1")
+
+        assert result["metadata"]["run_id"] == "run-1"
+        assert result["agent_statuses"] == {
+            "research": "completed",
+            "financial": "completed",
+            "competitor": "failed",
+            "synthesis": "completed",
+        }
+        assert len(result["errors"]) == 1
+        assert result["errors"][0].startswith("competitor: ")
+        assert "NewsAPI timed out" in result["errors"][0]
+
+    def test_resume_reruns_only_failed_agent(self, workflow, news):
+        """Test resume() redoes the failed branch and keeps the others"""
+        first = workflow.run("LG Energy Solution outlook", run_id="run-1")
+        research_calls = count_calls(workflow.research_agent)
+        financial_calls = count_calls(workflow.financial_agent)
+        competitor_calls = count_calls(workflow.competitor_agent)
+
+        resumed = workflow.resume("run-1")
+
+        assert (len(research_calls), len(financial_calls)) == (0, 0)
+        assert len(competitor_calls) == 1
+        assert news.calls == 2
+        assert resumed["errors"] == []
+        assert set(resumed["agent_statuses"].values()) == {"completed"}
+        assert resumed["research_findings"] == first["research_findings"]
+        assert resumed["agent_updated_at"]["research"] == (
+            first["agent_updated_at"]["research"]
+        )
+
+        # Nothing left to redo: the stored state comes back without a run
+        assert workflow.resume("run-1")["final_report"] == resumed["final_report"]
+        assert len(competitor_calls) == 1
+
+    def test_resume_reruns_stale_agents(self, workflow):
+        """Test max_age_s reruns agents whose outputs are too old"""
+        workflow.run("LG Energy Solution outlook", run_id="run-1")
+        research_calls = count_calls(workflow.research_agent)
+
+        workflow.resume("run-1", max_age_s=0)
+
+        assert len(research_calls) == 1
+
+    def test_async_resume(self, workflow, news):
+        """Test arun/aresume share the SQLite checkpoints"""
+
+        async def run():
+            await workflow.arun("LG Energy Solution outlook", run_id="run-2")
+            return await workflow.aresume("run-2")
+
+        resumed = asyncio.run(run())
+
+        assert news.calls == 2
+        assert resumed["errors"] == []
+
+    def test_resume_unknown_run(self, workflow):
+        """Test resuming a run ID that was never checkpointed"""
+        with pytest.raises(ValueError):
+            workflow.resume("missing")
+
+    def test_parallel_node_records_failures(self, news):
+        """Test the default (uncheckpointed) graph reports real statuses too"""
+        tools = fake_tools()
+        tools["news_api"] = Tool(name="news_search", func=news, description="News")
+        workflow = MultiAgentWorkflow(
+            tools,
+            {
+                "region": "us-west-2",
+                "model_id": "fake",
+                "llm_factory": fake_llm_factory(),
+            },
+        )
+
+        result = workflow.run("LG Energy Solution outlook")
+
+        assert result["agent_statuses"]["competitor"] == "failed"
+        assert result["agent_statuses"]["research"] == "completed"
+        assert result["errors"][0].startswith("competitor: ")
+        with pytest.raises(ValueError):
+            workflow.resume("run-1")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import sys
 
@@ -61,6 +62,17 @@ class TestCompetitorAgent:
 
         assert isinstance(result, list)
 
+    def test_aanalyze_method(self, config):
+        """Test async analyze returns the same format as analyze"""
+        news_tool = NewsSearchTool("test-key").as_langchain_tool()
+        arxiv_tool = ArxivSearchTool().as_langchain_tool()
+        agent = CompetitorIntelAgent(news_tool, arxiv_tool, config)
+
+        result = asyncio.run(agent.aanalyze("battery industry competition"))
+
+        assert isinstance(result, list)
+        assert len(result) > 0
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,130 @@
+import json
+import os
+import sys
+
+import pytest
+from langchain_core.language_models import FakeListChatModel
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from agents.context_builder import ContextBuilder, approx_tokens
+from agents.synthesis_agent import SynthesisAgent
+
+QUERY = "What is LG Energy Solution's solid-state battery strategy?"
+
+
+def make_state(**overrides):
+    state = {
+        "query": QUERY,
+        "research_findings": [
+            "Sulfide solid electrolytes reach 25 mS/cm ionic conductivity",
+            "Sodium-ion cells enter volume production",
+        ],
+        "financial_analysis": {
+            "analysis": "Revenue fell 8% in 2024\nSolid-state pilot line capex rose",
+            "status": "success",
+        },
+        "competitor_insights": [
+            "Sulfide solid electrolytes reach 25 mS/cm ionic conductivity!",
+            "CATL targets solid-state samples in 2027",
+        ],
+    }
+    state.update(overrides)
+    return state
+
+
+class TestContextBuilder:
+    """Test token-budgeted synthesis context"""
+
+    def test_dedupes_across_agents(self):
+        """Test a competitor insight repeating a research finding is dropped"""
+        inputs, usage = ContextBuilder().build(make_state())
+
+        assert inputs["competitor_insights"] == (
+            "CATL targets solid-state samples in 2027"
+        )
+        assert usage["competitor_insights"]["duplicates"] == 1
+        assert usage["research_findings"]["items"] == 2
+
+    def test_compact_financial_json(self):
+        """Test financial analysis is compact JSON with all its fields"""
+        inputs, _ = ContextBuilder().build(make_state())
+
+        assert "\n  " not in inputs["financial_analysis"]
+        assert json.loads(inputs["financial_analysis"]) == {
+            "status": "success",
+            "analysis": "Revenue fell 8% in 2024\nSolid-state pilot line capex rose",
+        }
+
+    def test_budget_keeps_most_relevant_items(self):
+        """Test trimming keeps query-relevant items and stays in budget"""
+        filler = [
+            f"Unrelated market note number {i} about logistics" for i in range(50)
+        ]
+        state = make_state(
+            research_findings=filler[:25]
+            + ["LG Energy Solution solid-state battery pilot line"]
+            + filler[25:]
+        )
+
+        inputs, usage = ContextBuilder(max_tokens=120).build(state)
+
+        assert "LG Energy Solution solid-state" in inputs["research_findings"]
+        assert usage["research_findings"]["dropped"] > 0
+        assert usage["total_tokens"] <= 120
+        assert usage["total_tokens"] == sum(
+            usage[s]["tokens"]
+            for s in ("research_findings", "financial_analysis", "competitor_insights")
+        )
+
+    def test_long_item_truncated_not_dropped(self):
+        """Test one prose answer over the budget is cut, not emptied"""
+        prose = "LG Energy Solution is scaling sulfide solid-state cells. " * 80
+        state = make_state(research_findings=[prose], competitor_insights=[])
+
+        inputs, usage = ContextBuilder(max_tokens=300).build(state)
+
+        assert inputs["research_findings"].startswith("LG Energy Solution is")
+        assert inputs["research_findings"].endswith(" …")
+        assert usage["research_findings"]["truncated"] == 1
+        assert usage["research_findings"]["dropped"] == 0
+        assert usage["total_tokens"] <= 300
+
+    def test_unused_share_passed_on(self):
+        """Test a small section's leftover budget goes to the others"""
+        findings = [f"Solid-state finding {i} for LG Energy" for i in range(20)]
+        state = make_state(research_findings=findings, competitor_insights=[])
+
+        _, usage = ContextBuilder(max_tokens=200).build(state)
+
+        assert usage["research_findings"]["tokens"] > 200 // 3
+
+    def test_custom_token_counter(self):
+        """Test a caller-supplied tokenizer is used for counting"""
+        _, usage = ContextBuilder(count_tokens=lambda text: len(text.split())).build(
+            make_state()
+        )
+
+        assert usage["research_findings"]["tokens"] == 13
+        assert approx_tokens("abcd" * 10) == 10
+
+    def test_synthesis_reports_context_usage(self):
+        """Test synthesize() returns per-section token usage"""
+        llm = FakeListChatModel(responses=["Summary.\n\n- Act"])
+        agent = SynthesisAgent(
+            {
+                "region": "us-west-2",
+                "model_id": "fake",
+                "llm_factory": lambda model_id, **kwargs: llm,
+                "synthesis_context_tokens": 500,
+            }
+        )
+
+        report = agent.synthesize(make_state())
+
+        assert report["context_usage"]["budget"] == 500
+        assert report["context_usage"]["competitor_insights"]["duplicates"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
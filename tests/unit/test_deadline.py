@@ -0,0 +1,113 @@
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+from langchain_core.tools import Tool
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from benchmarks.fakes import fake_llm_factory, fake_tools
+from src.agents.synthesis_agent import SynthesisAgent
+from src.graph.workflow import MultiAgentWorkflow
+
+
+def slow_news(query):
+    time.sleep(1.0)
+    return [{"title": "Late article"}]
+
+
+async def aslow_news(query):
+    await asyncio.sleep(1.0)
+    return [{"title": "Late article"}]
+
+
+class TestAgentDeadlines:
+    """Test per-agent budgets and the request deadline"""
+
+    @pytest.fixture
+    def tools(self):
+        tools = fake_tools()
+        tools["news_api"] = Tool(
+            name="news_search", func=slow_news, coroutine=aslow_news, description="News"
+        )
+        return tools
+
+    def make_workflow(self, tools, **config):
+        return MultiAgentWorkflow(
+            tools,
+            {
+                "region": "us-west-2",
+                "model_id": "fake",
+                "llm_factory": fake_llm_factory(),
+                **config,
+            },
+        )
+
+    def assert_competitor_cut_off(self, result, elapsed):
+        assert elapsed < 0.8
+        assert result["agent_statuses"]["competitor"] == "timed_out"
+        assert result["agent_statuses"]["research"] == "completed"
+        assert result["competitor_insights"] == []
+        assert result["research_findings"]
+        assert result["errors"] == ["competitor: timed out, section is partial"]
+        assert result["final_report"]
+
+    def test_agent_budget(self, tools):
+        """Test synthesis proceeds once the slow agent's budget runs out"""
+        workflow = self.make_workflow(tools, agent_budgets={"competitor": 0.3})
+
+        start = time.perf_counter()
+        result = workflow.run("LG Energy Solution outlook")
+
+        self.assert_competitor_cut_off(result, time.perf_counter() - start)
+
+    def test_request_deadline_async(self, tools):
+        """Test the request deadline cancels stragglers on the event loop"""
+        workflow = self.make_workflow(tools, deadline_s=0.4, synthesis_reserve_s=0.1)
+
+        start = time.perf_counter()
+        result = asyncio.run(workflow.arun("LG Energy Solution outlook"))
+
+        self.assert_competitor_cut_off(result, time.perf_counter() - start)
+
+    def test_checkpointed_agent_budget(self, tools, tmp_path):
+        """Test the per-agent checkpointed nodes honour budgets too"""
+        workflow = self.make_workflow(
+            tools,
+            agent_budgets={"competitor": 0.3},
+            checkpoint_path=str(tmp_path / "runs.sqlite"),
+        )
+
+        start = time.perf_counter()
+        result = workflow.run("LG Energy Solution outlook", run_id="run-1")
+
+        self.assert_competitor_cut_off(result, time.perf_counter() - start)
+
+    def test_partial_sections_flagged_to_synthesis(self):
+        """Test timed-out sections are marked partial in the synthesis prompt"""
+        agent = SynthesisAgent(
+            {
+                "region": "us-west-2",
+                "model_id": "fake",
+                "llm_factory": fake_llm_factory(),
+            }
+        )
+
+        inputs = agent._format_inputs(
+            {
+                "query": "LG outlook",
+                "research_findings": ["- finding"],
+                "financial_analysis": {},
+                "competitor_insights": [],
+                "agent_statuses": {"research": "completed", "competitor": "timed_out"},
+            }
+        )
+
+        assert inputs["research_findings"] == "- finding"
+        assert "partial" in inputs["competitor_insights"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
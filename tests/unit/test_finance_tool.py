@@ -0,0 +1,117 @@
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from tools import finance_api
+from tools.cache import ToolCache
+from tools.finance_api import FinanceDataTool
+
+
+class FakeTicker:
+    """Offline stand-in for yf.Ticker that records what was fetched"""
+
+    def __init__(self, symbol, log):
+        self.symbol = symbol
+        self.log = log
+
+    @property
+    def info(self):
+        self.log.append(("info", self.symbol))
+        return {"longName": self.symbol, "marketCap": 100, "totalRevenue": 50}
+
+    @property
+    def financials(self):
+        self.log.append(("financials", self.symbol))
+        return pd.DataFrame(
+            {"2024-12-31": [50.0, 5.0, 3.0]},
+            index=["Total Revenue", "Operating Income", "Net Income"],
+        )
+
+
+class TestFinanceDataTool:
+    """Test Yahoo Finance tool without network access"""
+
+    @pytest.fixture
+    def fetch_log(self, monkeypatch):
+        log = []
+        batches = []
+
+        class FakeTickers:
+            def __init__(self, symbols):
+                batches.append(symbols.split())
+                self.tickers = {s: FakeTicker(s, log) for s in symbols.split()}
+
+        monkeypatch.setattr(finance_api.yf, "Tickers", FakeTickers)
+        monkeypatch.setattr(
+            finance_api.yf, "Ticker", lambda symbol: FakeTicker(symbol, log)
+        )
+        return {"fetches": log, "batches": batches}
+
+    def test_compare_companies_single_batch(self, fetch_log):
+        """Test all peers are resolved through one Tickers session"""
+        tool = FinanceDataTool()
+        companies = list(tool.company_tickers)
+
+        comparison = tool.compare_companies(companies)
+
+        assert len(fetch_log["batches"]) == 1
+        assert len(fetch_log["batches"][0]) == len(companies)
+        assert len(fetch_log["fetches"]) == 2 * len(companies)
+        assert comparison["catl"]["market_cap"] == 100
+        assert comparison["catl"]["net_income"] == 3.0
+        assert comparison["catl"]["period"] == "2024-12-31"
+
+    def test_compare_unknown_company(self, fetch_log):
+        """Test unknown names are reported without fetching"""
+        tool = FinanceDataTool()
+
+        comparison = tool.compare_companies(["unknown_co"])
+
+        assert comparison["unknown_co"]["market_cap"] == "N/A"
+        assert fetch_log["batches"] == []
+
+    def test_bulk_seeds_single_lookups(self, fetch_log, tmp_path):
+        """Test bulk results are served to later single-company calls"""
+        tool = FinanceDataTool(cache=ToolCache(str(tmp_path / "cache.sqlite")))
+
+        tool.compare_companies(["lg_energy", "byd"])
+        fetched = len(fetch_log["fetches"])
+        info = tool.get_company_info("lg_energy")
+        metrics = tool.get_financial_metrics("byd")
+        tool.compare_companies(["lg_energy", "byd"])
+
+        assert len(fetch_log["fetches"]) == fetched
+        assert info["market_cap"] == 100
+        assert metrics["total_revenue"] == 50.0
+
+    def test_bulk_shares_in_flight_calls(self, fetch_log):
+        """Test bulk and single calls for one company share a request"""
+        tool = FinanceDataTool()
+        started, release = threading.Event(), threading.Event()
+        slow_info = tool._company_info
+
+        def company_info(ticker):
+            started.set()
+            release.wait(5)
+            return slow_info(ticker)
+
+        tool._company_info = company_info
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            single = executor.submit(tool.get_company_info, "lg_energy")
+            started.wait(5)
+            threading.Timer(0.2, release.set).start()
+            bulk = tool.get_companies_bulk(["lg_energy"])
+
+        assert single.result()["market_cap"] == bulk["lg_energy"]["info"]["market_cap"]
+        assert fetch_log["fetches"].count(("info", "373220.KS")) == 1
+        assert tool.single_flight.stats()["company_info"]["coalesced"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
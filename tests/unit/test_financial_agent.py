@@ -1,3 +1,4 @@
+import asyncio
 import os
 import sys
 
@@ -61,6 +62,17 @@ class TestFinancialAgent:
         assert isinstance(result, dict)
         assert "analysis" in result
 
+    def test_aanalyze_method(self, config):
+        """Test async analyze returns the same format as analyze"""
+        finance_tool = FinanceDataTool().as_langchain_tool()
+        agent = FinancialAnalystAgent(finance_tool, config)
+
+        result = asyncio.run(agent.aanalyze("LG Energy Solution financials"))
+
+        assert isinstance(result, dict)
+        assert "analysis" in result
+        assert result["status"] in ["success", "error"]
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
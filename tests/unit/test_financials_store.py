@@ -0,0 +1,142 @@
+import os
+import sys
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from tools import finance_api
+from tools.finance_api import FinanceDataTool
+from tools.financials_store import FinancialsStore
+
+TODAY = date.today()
+
+
+class FakeTicker:
+    """yf.Ticker stand-in with an annual statement and daily closes"""
+
+    def __init__(self, symbol, periods, closes):
+        self.ticker = symbol
+        self.periods = periods  # {period end: (revenue, gross, operating, net)}
+        self.closes = closes  # {day: close}
+        self.log = []
+
+    @property
+    def info(self):
+        return {"longName": self.ticker}
+
+    @property
+    def financials(self):
+        self.log.append("financials")
+        # Yahoo lists the newest period first
+        ends = sorted(self.periods, reverse=True)
+        return pd.DataFrame(
+            {pd.Timestamp(end): self.periods[end] for end in ends},
+            index=["Total Revenue", "Gross Profit", "Operating Income", "Net Income"],
+        )
+
+    def history(self, start, interval):
+        self.log.append(("history", start))
+        days = [d for d in sorted(self.closes) if str(d) >= start]
+        return pd.DataFrame(
+            {"Close": [self.closes[d] for d in days]},
+            index=pd.DatetimeIndex([pd.Timestamp(d) for d in days]),
+        )
+
+
+def year_end(years_ago):
+    return date(TODAY.year - years_ago, 12, 31)
+
+
+class TestFinancialsStore:
+    """Test the .npz financials store and its derived metrics"""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        return FinancialsStore(str(tmp_path / "financials"), max_age=0)
+
+    @pytest.fixture
+    def ticker(self):
+        periods = {
+            year_end(4): (100.0, 30.0, 10.0, 5.0),
+            year_end(3): (120.0, 36.0, 14.4, 7.0),
+            year_end(2): (144.0, 43.2, 20.16, 9.0),
+        }
+        closes = {TODAY - timedelta(days=n): 100.0 + n for n in range(10, 0, -1)}
+        return FakeTicker("373220.KS", periods, closes)
+
+    def test_metrics_from_history(self, store, ticker):
+        """Test growth, margins and CAGR are derived from stored periods"""
+        metrics = store.metrics("373220.KS", store.refresh("373220.KS", ticker))
+
+        assert metrics["period"] == str(year_end(2))
+        assert metrics["total_revenue"] == 144.0
+        history = metrics["history"]
+        assert history["revenue_yoy"] == [None, pytest.approx(0.2), pytest.approx(0.2)]
+        assert history["operating_margin"] == pytest.approx([0.1, 0.12, 0.14])
+        assert metrics["revenue_cagr"] == pytest.approx(0.2, abs=0.01)
+        assert metrics["operating_margin_trend"] == pytest.approx(2.0, abs=0.05)
+        assert metrics["last_close"] == 101.0
+        assert metrics["price_volatility"] > 0
+
+    def test_refresh_is_incremental(self, store, ticker):
+        """Test refreshes fetch only new closes and periods, keeping old ones"""
+        store.refresh("373220.KS", ticker)
+        last_day = max(ticker.closes)
+
+        # Yahoo drops the oldest period when a new one appears
+        del ticker.periods[year_end(4)]
+        ticker.periods[year_end(1)] = (172.8, 51.8, 27.6, 12.0)
+        ticker.closes[TODAY] = 99.0
+        ticker.log.clear()
+
+        data = store.refresh("373220.KS", ticker)
+
+        assert ticker.log == [
+            "financials",
+            ("history", str(last_day + timedelta(days=1))),
+        ]
+        assert len(data["periods"]) == 4
+        assert data["prices"][-1] == 99.0
+        assert len(data["prices"]) == 11
+
+    def test_statement_skipped_until_next_period_due(self, tmp_path, ticker):
+        """Test the income statement is not downloaded before a new one exists"""
+        ticker.periods = {
+            TODAY - timedelta(days=30): (100.0, 30.0, 10.0, 5.0),
+        }
+        store = FinancialsStore(str(tmp_path), max_age=0)
+        store.refresh("373220.KS", ticker)
+        ticker.log.clear()
+
+        store.refresh("373220.KS", ticker)
+
+        assert "financials" not in ticker.log
+
+    def test_fresh_data_not_refetched(self, tmp_path, ticker):
+        """Test nothing is downloaded within max_age"""
+        store = FinancialsStore(str(tmp_path), max_age=3600)
+        store.refresh("373220.KS", ticker)
+        ticker.log.clear()
+
+        data = store.refresh("373220.KS", ticker)
+
+        assert ticker.log == []
+        assert isinstance(data["values"], np.ndarray)
+
+    def test_tool_returns_history(self, store, ticker, monkeypatch):
+        """Test the finance tool answers metrics from the store"""
+        monkeypatch.setattr(finance_api.yf, "Ticker", lambda symbol: ticker)
+        tool = FinanceDataTool(store=store)
+
+        metrics = tool.get_financial_metrics("lg_energy")
+
+        assert len(metrics["history"]["periods"]) == 3
+        assert tool.as_langchain_tool().func("lg_energy")["financials"] == metrics
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,78 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from agents import llm_registry
+from agents.research_agent import ResearchAgent
+from agents.synthesis_agent import SynthesisAgent
+from tools.arxiv_search import ArxivSearchTool
+
+
+class TestLLMRegistry:
+    """Test shared Bedrock clients and models"""
+
+    @pytest.fixture
+    def config(self):
+        llm_registry.clear_registry()
+        return {
+            "region": "us-west-2",
+            "model_id": "anthropic.claude-3-haiku-20240307-v1:0",
+            "max_pool_connections": 32,
+        }
+
+    def test_same_params_share_llm(self, config):
+        """Test identical (region, model, params) return one instance"""
+        first = llm_registry.get_llm(config, temperature=0.1, max_tokens=2000)
+        second = llm_registry.get_llm(config, max_tokens=2000, temperature=0.1)
+
+        assert first is second
+
+    def test_different_params_share_client(self, config):
+        """Test models with different params still share one client"""
+        react = llm_registry.get_llm(config, temperature=0.1, max_tokens=2000)
+        synthesis = llm_registry.get_llm(config, temperature=0.2, max_tokens=3000)
+
+        assert react is not synthesis
+        assert react.client is synthesis.client
+
+    def test_pool_size_configurable(self, config):
+        """Test the connection pool size reaches the boto3 client"""
+        client = llm_registry.get_bedrock_client("us-west-2", 32)
+
+        assert client.meta.config.max_pool_connections == 32
+
+    def test_rate_limit_disables_botocore_retries(self, config):
+        """Test rate-limited models use a client making exactly one attempt"""
+        plain = llm_registry.get_llm(config, max_tokens=2000)
+        limited = llm_registry.get_llm(
+            {**config, "rate_limit": {"requests_per_second": 2}}, max_tokens=2000
+        )
+
+        retries = limited.inner.client.meta.config.retries
+        assert retries["total_max_attempts"] == 1
+        assert limited.inner is not plain
+        assert "total_max_attempts" not in plain.client.meta.config.retries
+
+    def test_pool_size_separates_models(self, config):
+        """Test a different pool size is not served the first config's model"""
+        small = llm_registry.get_llm(config, max_tokens=2000)
+        large = llm_registry.get_llm(
+            {**config, "max_pool_connections": 64}, max_tokens=2000
+        )
+
+        assert large is not small
+        assert large.client.meta.config.max_pool_connections == 64
+
+    def test_agents_share_client(self, config):
+        """Test agents built from one config reuse the pooled client"""
+        research = ResearchAgent(ArxivSearchTool().as_langchain_tool(), config)
+        synthesis = SynthesisAgent(config)
+
+        assert research.llm.client is synthesis.llm.client
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,183 @@
+import asyncio
+import os
+import sys
+
+import pytest
+from langchain_core.language_models import FakeListChatModel
+from langchain_core.messages import HumanMessage
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from agents.financial_agent import FinancialAnalystAgent
+from agents.model_routing import (
+    CascadeChatModel,
+    RouteStats,
+    get_route_llm,
+    react_check,
+    route_settings,
+)
+from agents.research_agent import ResearchAgent
+
+
+class FailingChatModel(FakeListChatModel):
+    """Model whose every call raises, e.g. a throttled small tier"""
+
+    def _call(self, *args, **kwargs):
+        raise RuntimeError("ThrottlingException")
+
+
+def routed_config(models, routes, stats):
+    """Config whose llm_factory serves the given model per model ID"""
+    return {
+        "region": "us-west-2",
+        "model_id": "large",
+        "llm_factory": lambda model_id, **kwargs: models[model_id],
+        "model_routes": routes,
+        "route_stats": stats,
+    }
+
+
+class TestModelRouting:
+    """Test per-agent model routes and the small-to-large cascade"""
+
+    @pytest.fixture
+    def stats(self):
+        return RouteStats()
+
+    def test_route_precedence(self):
+        """Test agent.step overrides agent, which overrides step and default"""
+        config = {
+            "model_routes": {
+                "default": {"model_id": "default", "max_tokens": 500},
+                "react": {"model_id": "small"},
+                "research": {"max_tokens": 1000},
+                "research.react": {"temperature": 0.0},
+            }
+        }
+
+        assert route_settings(config, "research", "react") == {
+            "model_id": "small",
+            "max_tokens": 1000,
+            "temperature": 0.0,
+        }
+        assert route_settings(config, "synthesis", "report") == {
+            "model_id": "default",
+            "max_tokens": 500,
+        }
+
+    def test_without_routes_uses_shared_model(self, stats):
+        """Test configs without model_routes keep the plain shared model"""
+        model = FakeListChatModel(responses=["ok"])
+        config = routed_config({"large": model}, {}, stats)
+        del config["model_routes"]
+
+        assert get_route_llm(config, "research", "react") is model
+
+    def test_escalates_on_unparseable_step(self, stats):
+        """Test the large model answers when the small one breaks the format"""
+        small = FakeListChatModel(responses=["The best tool is probably arXiv."])
+        large = FakeListChatModel(responses=["Final Answer:\n- Solid-state wins"])
+        config = routed_config(
+            {"small": small, "large": large},
+            {"react": {"cascade": ["small", "large"]}},
+            stats,
+        )
+
+        llm = get_route_llm(config, "research", "react")
+        output = llm.invoke([HumanMessage(content="Question")])
+
+        assert isinstance(llm, CascadeChatModel)
+        assert output.content == "Final Answer:\n- Solid-state wins"
+        route = stats.snapshot()["research.react"]
+        assert route["calls"] == 1
+        assert route["escalations"] == 1
+        assert route["models"]["small"] == pytest.approx(
+            {"attempts": 1, "accepted": 0, "latency_s": 0, "output_tokens": 8},
+            abs=0.05,
+        )
+        assert route["models"]["large"]["accepted"] == 1
+
+    def test_small_model_accepted(self, stats):
+        """Test a valid small-model answer never reaches the large model"""
+        small = FakeListChatModel(responses=["Action: arxiv\nAction Input: anode"])
+        large = FailingChatModel(responses=["unused"])
+        config = routed_config(
+            {"small": small, "large": large},
+            {"research.react": {"cascade": ["small", "large"]}},
+            stats,
+        )
+
+        llm = get_route_llm(config, "research", "react")
+        output = asyncio.run(llm.ainvoke([HumanMessage(content="Question")]))
+
+        assert output.content.startswith("Action: arxiv")
+        assert stats.snapshot()["research.react"]["models"] == {
+            "small": pytest.approx(
+                {"attempts": 1, "accepted": 1, "latency_s": 0, "output_tokens": 9},
+                abs=0.05,
+            )
+        }
+
+    def test_small_model_error_escalates(self, stats):
+        """Test an exception from the small tier falls through to the next"""
+        config = routed_config(
+            {
+                "small": FailingChatModel(responses=["unused"]),
+                "large": FakeListChatModel(responses=["Low-confidence is fine"]),
+            },
+            {"synthesis": {"cascade": ["small", "large"]}},
+            stats,
+        )
+
+        llm = get_route_llm(config, "synthesis", "report")
+
+        assert llm.invoke("Report").content == "Low-confidence is fine"
+        assert stats.snapshot()["synthesis.report"]["escalations"] == 1
+
+    def test_agents_pick_their_routes(self, stats):
+        """Test each agent and step resolves its own model and check"""
+        models = {
+            name: FakeListChatModel(responses=["- finding"])
+            for name in ("small", "large", "fin")
+        }
+        config = routed_config(
+            models,
+            {
+                "research": {"cascade": ["small", "large"]},
+                "financial": {"model_id": "fin"},
+            },
+            stats,
+        )
+        config["agent_modes"] = {"research": "prefetch", "financial": "prefetch"}
+
+        research = ResearchAgent(None, config)
+        financial = FinancialAnalystAgent(None, config)
+
+        assert research.llm.model_ids == ["small", "large"]
+        assert research.llm.route == "research.prefetch"
+        assert research.llm.check("No bullets here") == "no bullet points"
+        assert financial.llm.model_ids == ["fin"]
+
+    def test_single_model_route_streams(self, stats):
+        """Test a one-model route streams chunks and still records stats"""
+        config = routed_config(
+            {"large": FakeListChatModel(responses=["streamed report"])},
+            {"synthesis.report": {"max_tokens": 3000}},
+            stats,
+        )
+
+        chunks = list(get_route_llm(config, "synthesis", "report").stream("Report"))
+
+        assert len(chunks) > 1
+        assert stats.snapshot()["synthesis.report"]["calls"] == 1
+
+    def test_react_check(self):
+        """Test ReAct steps need an action or a confident final answer"""
+        assert react_check("Thought: x\nAction: news\nAction Input: CATL") is None
+        assert react_check("Final Answer: - CATL leads") is None
+        assert react_check("Final Answer: I don't know") is not None
+        assert react_check("Let me think about it") == "unparseable ReAct step"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
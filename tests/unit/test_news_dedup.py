@@ -0,0 +1,130 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from tools.news_api import NewsSearchTool
+from tools.news_dedup import article_shingles, cluster_articles, jaccard
+
+
+def article(title, description, source):
+    return {
+        "title": title,
+        "description": description,
+        "source": source,
+        "url": f"https://{source.lower()}.example/{len(title)}",
+        "published_at": "2026-10-01T08:00:00Z",
+    }
+
+
+SODIUM = [
+    article(
+        "CATL unveils sodium-ion battery with 500 km range - Reuters",
+        "Chinese battery giant CATL on Tuesday unveiled a sodium-ion battery "
+        "it says can power cars for 500 km.",
+        "Reuters",
+    ),
+    article(
+        "CATL Unveils Sodium-Ion Battery With 500km Range - Bloomberg",
+        "China's CATL on Tuesday unveiled a sodium-ion battery that it says "
+        "can power cars for 500 km.",
+        "Bloomberg",
+    ),
+    article(
+        "CATL unveils sodium-ion battery with 500 km range",
+        "Chinese battery giant CATL on Tuesday unveiled a sodium-ion battery "
+        "it says can power cars for 500 km.",
+        "Yahoo Entertainment",
+    ),
+]
+LFP = article(
+    "CATL unveils new LFP battery for trucks - Reuters",
+    "Chinese battery giant CATL on Tuesday unveiled a new LFP battery for "
+    "heavy trucks.",
+    "Reuters",
+)
+SDI = article(
+    "Samsung SDI to build US plant",
+    "Samsung SDI will build a battery plant in Indiana with Stellantis.",
+    "Reuters",
+)
+
+
+class FakeNewsClient:
+    """NewsApiClient stand-in returning canned articles"""
+
+    def __init__(self, articles):
+        self.articles = articles
+        self.calls = []
+
+    def get_everything(self, **kwargs):
+        self.calls.append(kwargs)
+        return {
+            "articles": [
+                {
+                    "title": a["title"],
+                    "description": a["description"],
+                    "source": {"id": None, "name": a["source"]},
+                    "url": a["url"],
+                    "publishedAt": a["published_at"],
+                }
+                for a in self.articles[: kwargs["page_size"]]
+            ]
+        }
+
+
+class TestNewsDedup:
+    """Test near-duplicate news clustering"""
+
+    def test_syndicated_copies_collapse(self):
+        """Test copies merge into the most relevant entry with a source count"""
+        results = cluster_articles([SODIUM[0], LFP, SODIUM[1], SDI, SODIUM[2]])
+
+        assert [r["title"] for r in results] == [
+            SODIUM[0]["title"],
+            LFP["title"],
+            SDI["title"],
+        ]
+        assert results[0]["source_count"] == 3
+        assert results[0]["sources"] == ["Reuters", "Bloomberg", "Yahoo Entertainment"]
+        assert results[1]["source_count"] == 1
+
+    def test_related_stories_stay_apart(self):
+        """Test same-company stories on different topics are not merged"""
+        same = jaccard(article_shingles(SODIUM[0]), article_shingles(SODIUM[1]))
+        related = jaccard(article_shingles(SODIUM[0]), article_shingles(LFP))
+
+        assert same >= 0.5 > related
+
+    def test_errors_pass_through(self):
+        """Test error entries are returned unchanged"""
+        assert cluster_articles([{"error": "rateLimited"}]) == [
+            {"error": "rateLimited"}
+        ]
+
+    def test_tool_fetches_more_and_returns_distinct(self):
+        """Test the tool requests fetch_size articles but returns distinct ones"""
+        tool = NewsSearchTool("key", fetch_size=30)
+        tool._client = FakeNewsClient(SODIUM + [LFP, SDI])
+
+        results = tool.search_news("CATL battery", max_articles=2)
+
+        assert tool._client.calls[0]["page_size"] == 30
+        assert [r["source_count"] for r in results] == [3, 1]
+
+    def test_dedup_can_be_disabled(self):
+        """Test dedup_threshold=None returns raw articles"""
+        tool = NewsSearchTool("key", dedup_threshold=None)
+        tool._client = FakeNewsClient(SODIUM + [LFP, SDI])
+
+        results = tool.search_news("CATL battery")
+
+        assert tool._client.calls[0]["page_size"] == 10
+        assert len(results) == 5
+        assert "source_count" not in results[0]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,201 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from tools.news_api import NewsSearchTool
+from tools.news_fanout import NewsFanout
+
+# Articles per language; anything else is rejected like NewsAPI does
+CORPUS = {
+    lang: [
+        {
+            "source": {"id": None, "name": f"{lang} outlet {n % 3}"},
+            "title": f"{lang} battery story {n}",
+            # Unrelated text per article, so deduplication keeps them apart
+            "description": hashlib.sha1(f"{lang}{n}".encode()).hexdigest(),
+            "url": f"https://news.example/{lang}/{n}",
+            "publishedAt": f"2026-10-{n % 28 + 1:02d}T08:00:00Z",
+        }
+        for n in range(total)
+    ]
+    for lang, total in {"en": 25, "zh": 12, "de": 3}.items()
+}
+
+
+class StubNewsAPI(BaseHTTPRequestHandler):
+    """Local /v2/everything with keep-alive, latency and scripted 429s"""
+
+    protocol_version = "HTTP/1.1"  # keep connections open between requests
+
+    def do_GET(self):
+        server = self.server
+        params = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+        with server.lock:
+            server.requests.append(params)
+            server.ports.add(self.client_address[1])
+            throttle = server.throttle > 0
+            server.throttle -= throttle
+        time.sleep(server.latency)
+
+        if self.headers.get("X-Api-Key") != "key":
+            return self.reply(401, {"status": "error", "code": "apiKeyInvalid"})
+        if throttle:
+            return self.reply(
+                429,
+                {"status": "error", "code": "rateLimited"},
+                {"Retry-After": "0.1"},
+            )
+        if params["language"] not in CORPUS:
+            return self.reply(
+                400,
+                {
+                    "status": "error",
+                    "code": "parameterInvalid",
+                    "message": "language is not supported",
+                },
+            )
+
+        articles = CORPUS[params["language"]]
+        size, page = int(params["pageSize"]), int(params["page"])
+        body = {
+            "status": "ok",
+            "totalResults": len(articles),
+            "articles": articles[(page - 1) * size : page * size],
+        }
+        self.reply(200, body)
+
+    def reply(self, status, body, headers=None):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubNewsAPI)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.requests, server.ports = [], set()
+    server.latency, server.throttle = 0.2, 0
+    server.url = f"http://127.0.0.1:{server.server_port}/v2/everything"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestNewsFanout:
+    """Test concurrent NewsAPI fan-out against a local stub server"""
+
+    def test_pages_and_languages_run_concurrently(self, stub):
+        """Test requests overlap and only existing pages are fetched"""
+        fanout = NewsFanout(
+            "key",
+            ["en", "zh", "de"],
+            pages=3,
+            base_url=stub.url,
+            requests_per_second=None,
+        )
+
+        start = time.perf_counter()
+        articles = fanout.search("battery", "2026-10-01", page_size=10)
+        elapsed = time.perf_counter() - start
+
+        pages = sorted((r["language"], r["page"]) for r in stub.requests)
+        assert pages == [
+            ("de", "1"),
+            ("en", "1"),
+            ("en", "2"),
+            ("en", "3"),
+            ("zh", "1"),
+            ("zh", "2"),
+        ]
+        # Two waves of 0.2s (first pages, then the rest), not six in a row
+        assert elapsed < 0.9
+        assert len(articles) == 40
+        # Rank fusion: every language's top story comes first
+        assert {a["title"] for a in articles[:3]} == {
+            "en battery story 0",
+            "zh battery story 0",
+            "de battery story 0",
+        }
+
+    def test_connections_are_reused(self, stub):
+        """Test repeated searches reuse the pooled keep-alive connections"""
+        fanout = NewsFanout(
+            "key",
+            ["en", "zh"],
+            max_workers=2,
+            base_url=stub.url,
+            requests_per_second=None,
+        )
+
+        for _ in range(3):
+            fanout.search("battery", "2026-10-01", page_size=10)
+
+        assert len(stub.requests) == 6
+        assert len(stub.ports) <= 2
+
+    def test_rate_limit_retried_and_paced(self, stub):
+        """Test a 429 pauses and retries, and request starts are paced"""
+        stub.latency, stub.throttle = 0.0, 1
+        fanout = NewsFanout(
+            "key", ["en", "zh", "de"], base_url=stub.url, requests_per_second=20
+        )
+
+        start = time.perf_counter()
+        articles = fanout.search("battery", "2026-10-01", page_size=10)
+        elapsed = time.perf_counter() - start
+
+        assert len(articles) == 23
+        assert fanout.stats() == {"requests": 4, "retries": 1, "errors": 0}
+        # 4 starts 50ms apart; the retry also waits out Retry-After (100ms)
+        assert elapsed >= 0.14
+
+    def test_unsupported_language_only_drops_its_results(self, stub):
+        """Test one failing language does not fail the whole search"""
+        fanout = NewsFanout("key", ["en", "ko"], base_url=stub.url)
+
+        articles = fanout.search("battery", "2026-10-01", page_size=10)
+
+        assert len(articles) == 10
+        assert fanout.stats()["errors"] == 1
+        assert fanout.search("battery", "2026-10-01", languages=["ko"]) == [
+            {"error": "ko: language is not supported"}
+        ]
+
+    def test_tool_uses_fanout(self, stub):
+        """Test the news tool searches through the fan-out and deduplicates"""
+        fanout = NewsFanout("key", ["en", "zh"], base_url=stub.url)
+        tool = NewsSearchTool("key", fetch_size=10, fanout=fanout)
+
+        results = tool.search_news("battery", max_articles=4)
+
+        assert [r["title"] for r in results[:2]] == [
+            "en battery story 0",
+            "zh battery story 0",
+        ]
+        assert results[0]["source_count"] == 1
+        assert len(results) == 4
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
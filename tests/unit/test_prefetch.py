@@ -0,0 +1,116 @@
+import asyncio
+import os
+import sys
+
+import pytest
+from langchain_core.language_models import FakeListChatModel
+from langchain_core.tools import Tool
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from agents.competitor_agent import CompetitorIntelAgent
+from agents.financial_agent import FinancialAnalystAgent
+from agents.prefetch import agent_mode, extract_companies
+from agents.research_agent import ResearchAgent
+
+TICKERS = {"lg_energy": "373220.KS", "samsung_sdi": "006400.KS", "catl": "300750.SZ"}
+QUERY = "Compare LG Energy Solution and CATL on solid-state batteries"
+
+
+class RecordingTool:
+    """Builds a LangChain tool that remembers its inputs"""
+
+    def __init__(self, name, metadata=None):
+        self.inputs = []
+        self.tool = Tool(
+            name=name,
+            func=self.run,
+            description=f"Fake {name}",
+            metadata=metadata,
+        )
+
+    def run(self, query):
+        self.inputs.append(query)
+        return [{"title": f"{self.tool.name} result for {query}"}]
+
+
+class TestPrefetchMode:
+    """Test the prefetch-then-reason agent mode"""
+
+    @pytest.fixture
+    def llm(self):
+        # A second call would return "unexpected" and leave i at 2
+        return FakeListChatModel(
+            responses=["Summary\n- first point\n- second point", "unexpected"]
+        )
+
+    @pytest.fixture
+    def config(self, llm):
+        modes = {
+            "research": "prefetch",
+            "financial": "prefetch",
+            "competitor": "prefetch",
+        }
+        return {
+            "region": "us-west-2",
+            "model_id": "fake",
+            "llm_factory": lambda model_id, **kwargs: llm,
+            "agent_modes": modes,
+        }
+
+    def test_extract_companies(self):
+        """Test company keys are found as whole words in free text"""
+        assert extract_companies(QUERY, TICKERS) == ["lg_energy", "catl"]
+        assert extract_companies("Samsung SDI's margins", TICKERS) == ["samsung_sdi"]
+        assert extract_companies("CATLs and LG", TICKERS) == []
+        assert extract_companies(QUERY, None) == []
+
+    def test_mode_selection(self):
+        """Test modes default to ReAct and reject unknown values"""
+        assert agent_mode({}, "research") == "react"
+        assert agent_mode({"agent_modes": {"research": "prefetch"}}, "research") == (
+            "prefetch"
+        )
+        with pytest.raises(ValueError):
+            agent_mode({"agent_modes": {"research": "fast"}}, "research")
+
+    def test_research_single_llm_call(self, config, llm):
+        """Test research searches once and reasons in one LLM call"""
+        arxiv = RecordingTool("arxiv_search")
+        agent = ResearchAgent(arxiv.tool, config)
+
+        findings = agent.analyze(QUERY)
+
+        assert findings == ["first point", "second point"]
+        assert arxiv.inputs == [QUERY]
+        assert llm.i == 1
+
+    def test_financial_looks_up_each_company(self, config, llm):
+        """Test financial prefetch resolves companies via the tool's tickers"""
+        finance = RecordingTool("yahoo_finance", {"company_tickers": TICKERS})
+        agent = FinancialAnalystAgent(finance.tool, config)
+
+        result = agent.analyze(QUERY, context="Focus on 2024")
+
+        assert result["status"] == "success"
+        assert sorted(finance.inputs) == ["catl", "lg_energy"]
+        assert llm.i == 1
+
+    def test_competitor_async(self, config, llm):
+        """Test competitor prefetch narrows news to the named companies"""
+        news = RecordingTool("news_search")
+        arxiv = RecordingTool("arxiv_search")
+        agent = CompetitorIntelAgent(
+            news.tool, arxiv.tool, config, company_tickers=TICKERS
+        )
+
+        insights = asyncio.run(agent.aanalyze(QUERY))
+
+        assert insights == ["first point", "second point"]
+        assert news.inputs == ["lg energy OR catl"]
+        assert arxiv.inputs == [QUERY]
+        assert llm.i == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
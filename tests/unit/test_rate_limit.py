@@ -0,0 +1,148 @@
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+from langchain_core.language_models import FakeListChatModel
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from agents import llm_registry
+from agents.rate_limit import (
+    AdaptiveRateLimiter,
+    RateLimitedChatModel,
+    backoff_delay,
+    is_throttling,
+)
+
+
+class ThrottledError(Exception):
+    """Shaped like botocore's ClientError"""
+
+    def __init__(self):
+        super().__init__("An error occurred (ThrottlingException): slow down")
+        self.response = {"Error": {"Code": "ThrottlingException"}}
+
+
+class FlakyChatModel(FakeListChatModel):
+    """Fails with `error` for the first `failures` calls"""
+
+    failures: int = 0
+    error: str = "throttle"
+    attempts: int = 0
+
+    def _generate(self, *args, **kwargs):
+        self.attempts += 1
+        if self.attempts <= self.failures:
+            if self.error == "throttle":
+                # langchain_aws wraps the ClientError in a ValueError
+                try:
+                    raise ThrottledError()
+                except ThrottledError as e:
+                    raise ValueError(f"Error raised by bedrock service: {e}") from e
+            raise ValueError("ValidationException: bad prompt")
+        return super()._generate(*args, **kwargs)
+
+
+class TestAdaptiveRateLimiter:
+    """Test the shared Bedrock limiter and retry policy"""
+
+    def test_requests_are_paced(self):
+        """Test calls beyond the burst wait for the refill"""
+        limiter = AdaptiveRateLimiter(requests_per_second=20, burst=1)
+
+        start = time.perf_counter()
+        for _ in range(5):
+            limiter.acquire()
+
+        assert time.perf_counter() - start >= 0.18
+        assert limiter.stats()["acquired"] == 5
+
+    def test_token_debt_holds_back_calls(self):
+        """Test usage above the estimate delays the next call"""
+        limiter = AdaptiveRateLimiter(tokens_per_minute=6000)  # 100 tokens/s
+
+        assert limiter.acquire(blocking=False, tokens=100)
+        limiter.record_tokens(6000)
+
+        assert not limiter.acquire(blocking=False)
+        assert asyncio.run(limiter.aacquire(tokens=10))
+        assert limiter.stats()["waited_s"] > 0
+
+    def test_throttle_backs_off_and_recovers(self):
+        """Test rates drop once per throttle burst and climb back on success"""
+        limiter = AdaptiveRateLimiter(requests_per_second=10, decrease=0.5)
+
+        limiter.on_throttle()
+        limiter.on_throttle()  # same burst, inside the cooldown
+        assert limiter.stats()["requests_per_second"] == pytest.approx(5)
+        assert limiter.stats()["throttles"] == 2
+
+        for _ in range(20):
+            limiter.on_success()
+        assert limiter.stats()["requests_per_second"] == pytest.approx(10)
+
+    def test_backoff_is_jittered_and_capped(self):
+        """Test delays stay within the exponential envelope and the cap"""
+        delays = [backoff_delay(attempt, base=0.5, cap=4) for attempt in range(8)]
+
+        assert all(0 <= delay <= 4 for delay in delays)
+        assert len(set(delays)) > 1
+
+    def test_throttling_detection(self):
+        """Test wrapped and raw throttling errors are recognised"""
+        try:
+            try:
+                raise ThrottledError()
+            except ThrottledError as e:
+                raise ValueError("Error raised by bedrock service") from e
+        except ValueError as wrapped:
+            assert is_throttling(wrapped)
+        assert not is_throttling(ValueError("ValidationException: bad prompt"))
+
+    def test_model_retries_throttled_calls(self):
+        """Test throttled calls are retried and the limiter slows down"""
+        limiter = AdaptiveRateLimiter(requests_per_second=50)
+        inner = FlakyChatModel(responses=["ok"], failures=2)
+        llm = RateLimitedChatModel(inner=inner, limiter=limiter, backoff_base=0.01)
+
+        assert llm.invoke("hello").content == "ok"
+        assert inner.attempts == 3
+        assert limiter.stats()["throttles"] == 2
+        assert limiter.stats()["scale"] < 1
+
+    def test_other_errors_are_not_retried(self):
+        """Test non-throttling errors surface on the first attempt"""
+        limiter = AdaptiveRateLimiter(requests_per_second=50)
+        inner = FlakyChatModel(responses=["ok"], failures=1, error="invalid")
+        llm = RateLimitedChatModel(inner=inner, limiter=limiter, backoff_base=0.01)
+
+        with pytest.raises(ValueError):
+            asyncio.run(llm.ainvoke("hello"))
+        assert inner.attempts == 1
+        assert limiter.stats()["tokens"] == 0
+
+    def test_registry_shares_limiter(self):
+        """Test every model for one Bedrock quota shares a limiter"""
+        llm_registry.clear_registry()
+        config = {
+            "region": "us-west-2",
+            "model_id": "fake",
+            "llm_factory": lambda model_id, **kwargs: FakeListChatModel(
+                responses=["ok"]
+            ),
+            "rate_limit": {"requests_per_second": 5, "max_retries": 2},
+        }
+
+        react = llm_registry.get_llm(config, temperature=0.1)
+        synthesis = llm_registry.get_llm(config, temperature=0.2)
+
+        assert react.limiter is synthesis.limiter
+        assert react.max_retries == 2
+        assert react.invoke("hi").content == "ok"
+        llm_registry.clear_registry()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
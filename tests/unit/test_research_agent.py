@@ -1,3 +1,4 @@
+import asyncio
 import os
 import sys
 
@@ -66,6 +67,16 @@ class TestResearchAgent:
         result = agent.analyze("")
         assert isinstance(result, list)
 
+    def test_aanalyze_method(self, config):
+        """Test async analyze returns the same format as analyze"""
+        arxiv_tool = ArxivSearchTool().as_langchain_tool()
+        agent = ResearchAgent(arxiv_tool, config)
+
+        result = asyncio.run(agent.aanalyze("battery technology"))
+
+        assert isinstance(result, list)
+        assert len(result) > 0
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,150 @@
+import os
+import sqlite3
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from benchmarks.fakes import fake_llm_factory, fake_tools
+from src.graph.result_cache import (
+    ResultCache,
+    char_ngrams,
+    cosine,
+    key_terms,
+    normalize_text,
+)
+from src.graph.workflow import MultiAgentWorkflow
+
+BASE_QUERY = "What is LG Energy Solution's competitive position?"
+
+
+def make_result(report="LG report"):
+    return {
+        "query": BASE_QUERY,
+        "final_report": report,
+        "executive_summary": report,
+        "recommendations": [],
+        "errors": [],
+        "metadata": {"trace": {"spans": []}},
+    }
+
+
+class TestResultCache:
+    """Test normalized and similarity matching of workflow results"""
+
+    def test_normalized_exact_match(self):
+        """Test case, punctuation and filler words do not affect the key"""
+        cache = ResultCache()
+        cache.store(BASE_QUERY, "", make_result())
+
+        hit = cache.lookup("  what's LG energy solution competitive POSITION ", "")
+
+        assert normalize_text(BASE_QUERY) == "lg energy solution competitive position"
+        assert hit["final_report"] == "LG report"
+        assert hit["metadata"]["cache"]["match"] == "exact"
+        assert "trace" not in hit["metadata"]
+
+    def test_similarity_match_needs_threshold(self):
+        """Test near-duplicates only hit when similarity matching is enabled"""
+        exact_only = ResultCache()
+        similar = ResultCache(similarity_threshold=0.85)
+        for cache in (exact_only, similar):
+            cache.store(BASE_QUERY, "", make_result())
+
+        rephrased = "How competitive is LG Energy Solution's position?"
+        assert exact_only.lookup(rephrased) is None
+        hit = similar.lookup(rephrased)
+
+        assert hit["metadata"]["cache"]["match"] == "similar"
+        assert hit["metadata"]["cache"]["cached_query"] == BASE_QUERY
+        assert similar.lookup("Samsung SDI competitive position") is None
+        assert similar.lookup(BASE_QUERY, "Focus on 2019 filings") is None
+        assert similar.stats()["similar_hits"] == 1
+
+    def test_similarity_needs_same_numbers_and_names(self):
+        """Test a different year or an added region never hits by similarity"""
+        cache = ResultCache(similarity_threshold=0.85)
+        cache.store("Samsung SDI 2023 revenue", "", make_result("2023"))
+        cache.store(BASE_QUERY, "", make_result())
+
+        assert (
+            cosine(
+                char_ngrams("Samsung SDI 2024 revenue"),
+                char_ngrams("Samsung SDI 2023 revenue"),
+            )
+            > 0.85
+        )
+        assert cache.lookup("Samsung SDI 2024 revenue") is None
+        assert cache.lookup(BASE_QUERY.replace("?", " in Europe?")) is None
+        assert cache.lookup("Samsung SDI revenue 2023")["final_report"] == "2023"
+        assert key_terms("Battery demand. Is CATL ahead in Q3?") == {"catl", "q3"}
+
+    def test_custom_embedding(self):
+        """Test a dense embedding function replaces the n-gram vectorizer"""
+        embed = lambda text: [1.0, 0.0] if "battery" in text.lower() else [0.0, 1.0]
+        cache = ResultCache(similarity_threshold=0.9, embed=embed)
+        cache.store("battery market", "", make_result("battery"))
+
+        assert cache.lookup("Battery supply chain")["final_report"] == "battery"
+        assert cache.lookup("semiconductor market") is None
+
+    def test_ttl_and_persistence(self, tmp_path):
+        """Test entries survive a restart and expire after the TTL"""
+        path = str(tmp_path / "results.sqlite")
+        ResultCache(path=path).store(BASE_QUERY, "", make_result())
+
+        assert ResultCache(path=path).lookup(BASE_QUERY) is not None
+
+        expiring = ResultCache(path=path, ttl=0.05)
+        time.sleep(0.1)
+        assert expiring.lookup(BASE_QUERY) is None
+
+        expiring.store("Samsung SDI outlook", "", make_result())
+        rows = sqlite3.connect(path).execute("SELECT query FROM result_cache")
+        assert [row[0] for row in rows] == ["Samsung SDI outlook"]
+
+    def test_cosine(self):
+        """Test cosine similarity on sparse and dense vectors"""
+        assert cosine(char_ngrams("LG Energy"), char_ngrams("lg energy!")) == 1.0
+        assert cosine(char_ngrams(""), char_ngrams("")) == 1.0
+        assert cosine([1.0, 0.0], [0.0, 1.0]) == 0.0
+
+
+class TestWorkflowResultCache:
+    """Test the workflow serves repeated queries from the result cache"""
+
+    def test_second_query_skips_pipeline(self):
+        """Test a near-duplicate query returns the stored report without a run"""
+        cache = ResultCache(similarity_threshold=0.85)
+        config = {
+            "region": "us-west-2",
+            "model_id": "fake",
+            "llm_factory": fake_llm_factory(),
+            "result_cache": cache,
+        }
+        workflow = MultiAgentWorkflow(fake_tools(), config)
+        calls = []
+        original = workflow.graph.invoke
+        workflow.graph.invoke = lambda *a, **kw: calls.append(1) or original(*a, **kw)
+
+        first = workflow.run(BASE_QUERY)
+        start = time.perf_counter()
+        second = workflow.run("How competitive is LG Energy Solution's position?")
+        elapsed = time.perf_counter() - start
+        events = list(workflow.stream(BASE_QUERY))
+
+        assert len(calls) == 1
+        assert first["metadata"]["cache"] == {"hit": False}
+        assert second["metadata"]["cache"]["hit"] is True
+        assert second["final_report"] == first["final_report"]
+        assert elapsed < 0.1
+        assert events == [
+            ("report_chunk", first["final_report"]),
+            ("final", events[-1][1]),
+        ]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,172 @@
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+from langchain_core.language_models import FakeListChatModel
+from langchain_core.tools import Tool
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from benchmarks.fakes import fake_llm_factory, fake_tools
+from src.agents.synthesis_agent import SynthesisAgent
+from src.graph.workflow import MultiAgentWorkflow
+
+CONFIG = {
+    "region": "us-west-2",
+    "model_id": "fake",
+    "llm_factory": fake_llm_factory(),
+    "synthesis_mode": "sectioned",
+}
+
+HEADINGS = [
+    "## Executive Summary",
+    "## Technical Analysis",
+    "## Financial Performance",
+    "## Competitive Landscape",
+    "## Strategic Recommendations",
+    "## Key Risks and Opportunities",
+]
+
+
+def slow_news(query):
+    time.sleep(0.5)
+    return [{"title": "Late article"}]
+
+
+class TestSectionedSynthesis:
+    """Test per-section synthesis pipelined with the agents"""
+
+    def test_sections_written_while_agents_run(self):
+        """Test a fast agent's section is written before a slow agent ends"""
+        tools = fake_tools()
+        tools["news_api"] = Tool(name="news_search", func=slow_news, description="N")
+        workflow = MultiAgentWorkflow(tools, CONFIG)
+        written = {}
+        write_section = workflow.synthesis_agent.write_section
+
+        def record(name, query, output):
+            section = write_section(name, query, output)
+            written[name] = time.perf_counter()
+            return section
+
+        workflow.synthesis_agent.write_section = record
+        start = time.perf_counter()
+        result = workflow.run("LG Energy Solution outlook")
+
+        assert written["research"] - start < 0.4
+        assert written["competitor"] - start >= 0.5
+        assert result["report_sections"]["research"].startswith("- Solid-state")
+
+    def test_report_structure(self):
+        """Test the assembled report keeps the six-section order"""
+        result = MultiAgentWorkflow(fake_tools(), CONFIG).run("battery outlook")
+
+        report = result["final_report"]
+        positions = [report.index(heading) for heading in HEADINGS]
+        assert positions == sorted(positions)
+        assert result["executive_summary"].startswith("Executive summary:")
+        assert (
+            result["recommendations"][0] == "- Accelerate solid-state R&D partnerships"
+        )
+        assert result["errors"] == []
+
+    def test_async_and_stream_match_report(self):
+        """Test arun and stream produce the same sectioned report"""
+        workflow = MultiAgentWorkflow(fake_tools(), CONFIG)
+
+        report = asyncio.run(workflow.arun("battery outlook"))["final_report"]
+        events = list(workflow.stream("battery outlook"))
+        chunks = [chunk for kind, chunk in events if kind == "report_chunk"]
+
+        assert len(chunks) == len(HEADINGS)
+        assert "".join(chunks) == events[-1][1]["final_report"] == report
+
+    def test_timed_out_agent_marked_partial(self):
+        """Test a cut-off agent's section is a partial note, not a model call"""
+        tools = fake_tools()
+        tools["news_api"] = Tool(name="news_search", func=slow_news, description="N")
+        workflow = MultiAgentWorkflow(
+            tools, {**CONFIG, "agent_budgets": {"competitor": 0.2}}
+        )
+
+        result = workflow.run("battery outlook")
+
+        assert result["report_sections"]["competitor"] == ""
+        assert "_Partial: the competitor analysis" in result["final_report"]
+
+    def test_slow_section_keeps_agent_output(self):
+        """Test a section running past the budget does not discard the agent"""
+        workflow = MultiAgentWorkflow(
+            fake_tools(), {**CONFIG, "agent_budgets": {"research": 0.3}}
+        )
+        write_section = workflow.synthesis_agent.write_section
+        awrite_section = workflow.synthesis_agent.awrite_section
+        calls = []
+
+        def slow(name, query, output):
+            calls.append(name)
+            if name == "research" and calls.count(name) == 1:
+                time.sleep(0.5)
+            return write_section(name, query, output)
+
+        async def aslow(name, query, output):
+            calls.append(name)
+            if name == "research" and calls.count(name) == 1:
+                await asyncio.sleep(0.5)
+            return await awrite_section(name, query, output)
+
+        workflow.synthesis_agent.write_section = slow
+        workflow.synthesis_agent.awrite_section = aslow
+
+        for run in (workflow.run, lambda q: asyncio.run(workflow.arun(q))):
+            calls.clear()
+            result = run("battery outlook")
+
+            assert result["agent_statuses"]["research"] == "completed"
+            assert result["research_findings"]
+            # Rewritten at synthesis instead of being marked partial
+            assert calls.count("research") == 2
+            assert "_Partial" not in result["final_report"]
+            assert "## Technical Analysis\n- Solid-state" in result["final_report"]
+
+    def test_missing_sections_written_at_synthesis(self):
+        """Test direct synthesis writes sections the workflow did not"""
+        agent = SynthesisAgent(CONFIG)
+        agent.section_llm = agent.closing_llm = FakeListChatModel(
+            responses=[
+                "- finding",
+                "## Executive Summary\nShort summary.\n\n"
+                "## Strategic Recommendations\n- Act\n\n"
+                "## Key Risks and Opportunities\n- Risk",
+            ]
+        )
+
+        result = agent.synthesize(
+            {
+                "query": "LG outlook",
+                "research_findings": ["- finding"],
+                "agent_statuses": {"financial": "failed", "competitor": "failed"},
+            }
+        )
+
+        assert "## Technical Analysis\n- finding" in result["final_report"]
+        assert "_Not available: the financial analysis failed._" in (
+            result["final_report"]
+        )
+        assert result["executive_summary"] == "Short summary."
+        assert result["recommendations"] == ["- Act"]
+
+    def test_closing_without_headings(self):
+        """Test closing text without headings becomes the summary"""
+        agent = SynthesisAgent(CONFIG)
+
+        result = agent._sectioned_report({"research": "- a"}, "Plain summary.")
+
+        assert result["final_report"].startswith("## Executive Summary\nPlain")
+        assert result["executive_summary"] == "Plain summary."
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,160 @@
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from tools.finance_api import FinanceDataTool
+from tools.symbol_resolver import (
+    SymbolResolver,
+    load_index,
+    parse_nasdaq_listing,
+    write_index,
+)
+
+
+class TestSymbolResolver:
+    """Test fuzzy company name to ticker resolution"""
+
+    @pytest.fixture(scope="class")
+    def resolver(self):
+        return SymbolResolver()
+
+    @pytest.mark.parametrize(
+        "name, symbol, method",
+        [
+            ("LG Energy Solution Ltd", "373220.KS", "alias"),
+            ("Tesla", "TSLA", "alias"),
+            ("Tesla Motors", "TSLA", "alias"),
+            ('"CATL"', "300750.SZ", "alias"),
+            ("$TSLA", "TSLA", "symbol"),
+            ("373220.KS", "373220.KS", "symbol"),
+            ("BRK-B", "BRK-B", "symbol"),
+            ("Contemporary Amperex", "300750.SZ", "prefix"),
+            ("Panasonc", "6752.T", "ngram"),
+            ("Albermarle Corp.", "ALB", "ngram"),
+        ],
+    )
+    def test_resolves_variants(self, resolver, name, symbol, method):
+        """Test suffixes, aliases, symbols, prefixes and typos resolve"""
+        match = resolver.match(name)
+
+        assert match.symbol == symbol
+        assert match.method == method
+
+    def test_unknown_names_do_not_guess(self, resolver):
+        """Test unrelated names return None instead of a weak match"""
+        assert resolver.resolve("Acme Widgets Incorporated") is None
+        assert resolver.resolve("") is None
+
+    @pytest.mark.parametrize(
+        "word", ["motor", "lithium", "solid", "materials", "energy", "Samsung S"]
+    )
+    def test_generic_words_do_not_guess(self, resolver, word):
+        """Test industry words and partial words do not pick an issuer"""
+        assert resolver.match(word) is None
+
+    @pytest.mark.parametrize("word", ["IT", "ALL", "tsla", "$NOPE"])
+    def test_only_ticker_shaped_input_is_a_symbol(self, resolver, word):
+        """Test plain words are matched as names, not as tickers"""
+        assert resolver.match(word) is None
+
+    @pytest.mark.parametrize(
+        "name",
+        [
+            "Apple Hospitality REIT",
+            "Toyota Tsusho",
+            "Hyundai Mobis",
+            "Panasonic Energy",
+            "LG Electronics",
+        ],
+    )
+    def test_related_names_do_not_resolve_to_parent(self, tmp_path, name):
+        """Test a shared first or last word does not pick another company"""
+        path = str(tmp_path / "symbols.tsv")
+        write_index(
+            path,
+            [
+                ("AAPL", "Apple", []),
+                ("7203.T", "Toyota Motor", []),
+                ("005380.KS", "Hyundai Motor", []),
+                ("6752.T", "Panasonic Holdings", ["panasonic"]),
+                ("005930.KS", "Samsung Electronics", []),
+            ],
+        )
+        resolver = SymbolResolver(path)
+
+        assert resolver.match(name) is None
+        assert resolver.resolve("Toyota Motor Corporation") == "7203.T"
+
+    def test_bundled_index_covers_large_caps(self, resolver):
+        """Test common issuers beyond the battery seed rows resolve"""
+        assert resolver.resolve("American Express") == "AXP"
+        assert resolver.resolve("Bank of America Corp") == "BAC"
+        assert resolver.resolve("General Mills") == "GIS"
+        assert resolver.resolve("LG Electronics") == "066570.KS"
+        assert resolver.resolve("Apple Hospitality REIT") == "APLE"
+
+    def test_lookup_speed_on_large_index(self, tmp_path):
+        """Test fuzzy lookups stay well under a millisecond at 20k issuers"""
+        path = str(tmp_path / "symbols.tsv")
+        write_index(
+            path,
+            [
+                (f"S{i:05d}", f"Issuer {i:05d} {word} Holdings", [])
+                for i, word in enumerate(
+                    ["Energy", "Lithium", "Motors", "Materials"] * 5000
+                )
+            ],
+        )
+        resolver = SymbolResolver(path)
+        assert len(resolver) == 20000
+
+        queries = ["Issuer 01233 Lithum", "issuer 19999 materials", "$S00042"]
+        start = time.perf_counter()
+        for _ in range(100):
+            for query in queries:
+                resolver.match(query)
+        per_lookup = (time.perf_counter() - start) / 300
+
+        assert resolver.resolve("Issuer 01233 Lithum") == "S01233"
+        assert per_lookup < 0.001
+
+    def test_nasdaq_listing_update(self, tmp_path):
+        """Test the NASDAQ Trader listing parses into index rows"""
+        lines = [
+            "Nasdaq Traded|Symbol|Security Name|Listing Exchange|Market Category"
+            "|ETF|Round Lot Size|Test Issue|Financial Status|CQS Symbol"
+            "|NASDAQ Symbol|NextShares",
+            "Y|TSLA|Tesla, Inc. - Common Stock|Q|Q|N|100|N|N||TSLA|N",
+            "Y|BRK.B|Berkshire Hathaway Inc. Class B|N| |N|100|N||BRK.B|BRK.B|N",
+            "Y|LIT|Global X Lithium & Battery Tech ETF|P| |Y|100|N||LIT|LIT|N",
+            "File Creation Time: 1017202608:00|||||||||||",
+        ]
+
+        rows = list(parse_nasdaq_listing(lines))
+        path = str(tmp_path / "symbols.tsv")
+        write_index(path, rows)
+
+        assert list(load_index(path)) == [
+            ("TSLA", "Tesla, Inc.", []),
+            ("BRK-B", "Berkshire Hathaway Inc. Class B", []),
+        ]
+        assert SymbolResolver(path).resolve("Berkshire Hathaway") == "BRK-B"
+
+    def test_finance_tool_uses_resolver(self):
+        """Test every finance tool lookup goes through the resolver"""
+        tool = FinanceDataTool()
+
+        assert tool.resolve_ticker("lg_energy") == "373220.KS"
+        assert tool.resolve_ticker("LG Energy Solution Ltd") == "373220.KS"
+        assert tool.resolve_ticker("Tesla") == "TSLA"
+        # company_tickers reach the resolver as aliases
+        assert tool.resolver.resolve("sk innovation") == "096770.KS"
+        assert tool.resolver.aliases == tool.company_tickers
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
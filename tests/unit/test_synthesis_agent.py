@@ -1,8 +1,10 @@
+import asyncio
 import os
 import sys
 
 import pytest
 from dotenv import load_dotenv
+from langchain_core.language_models import FakeListChatModel
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
 
@@ -80,6 +82,31 @@ class TestSynthesisAgent:
         assert isinstance(result, dict)
         assert "final_report" in result
 
+    def test_asynthesize_method(self, config, mock_state):
+        """Test async synthesize returns the same format as synthesize"""
+        agent = SynthesisAgent(config)
+        result = asyncio.run(agent.asynthesize(mock_state))
+
+        assert isinstance(result, dict)
+        assert "final_report" in result
+        assert "executive_summary" in result
+        assert isinstance(result["recommendations"], list)
+
+    def test_synthesize_streams_tokens(self, config, mock_state):
+        """Test streamed chunks add up to the final report"""
+        agent = SynthesisAgent(config)
+        agent.llm = FakeListChatModel(
+            responses=["Summary line.\n\n- Invest in solid-state R&D"]
+        )
+
+        chunks = []
+        result = agent.synthesize(mock_state, on_token=chunks.append)
+
+        assert len(chunks) > 1
+        assert "".join(chunks) == result["final_report"]
+        assert result["executive_summary"] == "Summary line."
+        assert result["recommendations"] == ["- Invest in solid-state R&D"]
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
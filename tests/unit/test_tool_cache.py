@@ -0,0 +1,247 @@
+import os
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from tools import finance_api
+from tools.cache import SingleFlight, ToolCache, cached
+from tools.finance_api import FinanceDataTool
+
+
+class CountingTool:
+    """Minimal tool that counts how often it really runs"""
+
+    def __init__(self, cache=None):
+        self.cache = cache
+        self.calls = 0
+
+    @cached("arxiv")
+    def search(self, query: str, max_results: int = 10):
+        self.calls += 1
+        return [{"title": f"{query} paper", "max_results": max_results}]
+
+    @cached("news")
+    def failing(self, query: str):
+        self.calls += 1
+        return [{"error": "rate limited"}]
+
+
+class BrokenDisk:
+    """SQLite connection stand-in whose writes fail or block"""
+
+    def __init__(self, db, error=None, gate=None):
+        self.db = db
+        self.error = error
+        self.gate = gate
+
+    def execute(self, sql, *args):
+        if sql.startswith("INSERT"):
+            if self.gate is not None:
+                self.gate.wait(5)
+            if self.error is not None:
+                raise self.error
+        return self.db.execute(sql, *args)
+
+    def commit(self):
+        self.db.commit()
+
+
+class TestToolCache:
+    """Test tool result caching"""
+
+    @pytest.fixture
+    def cache_path(self, tmp_path):
+        return str(tmp_path / "tool_cache.sqlite")
+
+    def test_memory_hit_and_stats(self, cache_path):
+        """Test repeated calls are served from memory"""
+        tool = CountingTool(ToolCache(cache_path))
+
+        first = tool.search("solid-state battery")
+        second = tool.search("solid-state battery")
+
+        assert first == second
+        assert tool.calls == 1
+        stats = tool.cache.stats()["arxiv"]
+        assert stats["misses"] == 1
+        assert stats["memory_hits"] == 1
+
+    def test_key_normalization(self, cache_path):
+        """Test case, whitespace and explicit defaults share one entry"""
+        tool = CountingTool(ToolCache(cache_path))
+
+        tool.search("Solid-State  Battery")
+        tool.search("solid-state battery", max_results=10)
+        tool.search("solid-state battery", max_results=5)
+
+        assert tool.calls == 2
+
+    def test_disk_hit_across_instances(self, cache_path):
+        """Test entries persist in SQLite for other processes"""
+        CountingTool(ToolCache(cache_path)).search("cathode materials")
+
+        tool = CountingTool(ToolCache(cache_path))
+        result = tool.search("cathode materials")
+
+        assert tool.calls == 0
+        assert result[0]["title"] == "cathode materials paper"
+        assert tool.cache.stats()["arxiv"]["disk_hits"] == 1
+
+    def test_ttl_expiry(self, cache_path):
+        """Test entries expire per source TTL"""
+        tool = CountingTool(ToolCache(cache_path, ttls={"arxiv": -1}))
+
+        tool.search("anode")
+        tool.search("anode")
+
+        assert tool.calls == 2
+
+    def test_lru_eviction(self):
+        """Test the in-memory layer is bounded"""
+        cache = ToolCache(path=None, max_memory_entries=2)
+        tool = CountingTool(cache)
+
+        tool.search("a")
+        tool.search("b")
+        tool.search("c")
+        tool.search("a")
+
+        assert tool.calls == 4
+
+    def test_errors_not_cached(self, cache_path):
+        """Test error results always go back to the source"""
+        tool = CountingTool(ToolCache(cache_path))
+
+        tool.failing("battery")
+        tool.failing("battery")
+
+        assert tool.calls == 2
+
+    def test_disk_write_error_keeps_result(self, cache_path, caplog):
+        """Test a failed SQLite write is logged, not raised to the tool call"""
+        cache = ToolCache(cache_path)
+        cache._db = BrokenDisk(cache._db, sqlite3.OperationalError("disk is full"))
+        tool = CountingTool(cache)
+
+        result = tool.search("separator")
+
+        assert result[0]["title"] == "separator paper"
+        assert tool.search("separator") == result
+        assert tool.calls == 1
+        assert "disk is full" in caplog.text
+
+    def test_disk_write_outside_memory_lock(self, cache_path):
+        """Test memory hits are served while another thread writes to disk"""
+        cache = ToolCache(cache_path)
+        cache.set("arxiv", "warm", [1])
+        gate = threading.Event()
+        cache._db = BrokenDisk(cache._db, gate=gate)
+
+        writer = threading.Thread(target=cache.set, args=("arxiv", "cold", [2]))
+        writer.start()
+        try:
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                hit = pool.submit(cache.get, "arxiv", "warm").result(timeout=2)
+        finally:
+            gate.set()
+            writer.join()
+
+        assert hit == (True, [1])
+        assert cache.get("arxiv", "cold") == (True, [2])
+
+    def test_no_cache_passthrough(self):
+        """Test tools without a cache behave as before"""
+        tool = CountingTool()
+
+        tool.search("battery")
+        tool.search("battery")
+
+        assert tool.calls == 2
+
+    def test_langchain_tool_uses_cache(self, cache_path, monkeypatch):
+        """Test the LangChain wrapper goes through the cache transparently"""
+        fetches = []
+
+        class FakeTicker:
+            def __init__(self, symbol):
+                fetches.append(symbol)
+                self.info = {"longName": "LG Energy Solution", "marketCap": 1}
+
+        monkeypatch.setattr(finance_api.yf, "Ticker", FakeTicker)
+
+        tool = FinanceDataTool(cache=ToolCache(cache_path)).as_langchain_tool()
+        tool.run("lg_energy")
+        tool.run("lg_energy")
+
+        assert fetches == ["373220.KS"]
+
+
+class SlowTool:
+    """Tool whose calls stay in flight long enough to overlap"""
+
+    def __init__(self, single_flight, cache=None, error=None):
+        self.single_flight = single_flight
+        self.cache = cache
+        self.error = error
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    @cached("arxiv")
+    def search(self, query: str):
+        with self.lock:
+            self.calls += 1
+        time.sleep(0.2)
+        if self.error:
+            raise self.error
+        return [{"title": f"{query} paper"}]
+
+
+class TestSingleFlight:
+    """Test coalescing of identical in-flight tool calls"""
+
+    def run_concurrently(self, fn, args):
+        with ThreadPoolExecutor(max_workers=len(args)) as executor:
+            futures = [executor.submit(fn, arg) for arg in args]
+            return [f.exception() or f.result() for f in futures]
+
+    def test_identical_calls_share_one_request(self):
+        """Test concurrent identical queries run once and are counted"""
+        flight = SingleFlight()
+        tool = SlowTool(flight)
+
+        results = self.run_concurrently(
+            tool.search, ["solid state", "Solid  State", "solid state", "sodium ion"]
+        )
+
+        assert tool.calls == 2
+        assert results[0] == results[1] == [{"title": "solid state paper"}]
+        assert results[0] is not results[1]
+        assert flight.stats()["arxiv"] == {"calls": 4, "executed": 2, "coalesced": 2}
+
+    def test_errors_reach_every_waiter(self):
+        """Test a failed leader call fails its followers without retrying"""
+        tool = SlowTool(SingleFlight(), error=ConnectionError("arXiv 503"))
+
+        results = self.run_concurrently(tool.search, ["battery"] * 3)
+
+        assert tool.calls == 1
+        assert all(isinstance(r, ConnectionError) for r in results)
+
+    def test_sequential_calls_not_coalesced(self):
+        """Test finished calls are left to the cache, not replayed"""
+        tool = SlowTool(SingleFlight())
+
+        tool.search("battery")
+        tool.search("battery")
+
+        assert tool.calls == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
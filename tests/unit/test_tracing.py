@@ -0,0 +1,127 @@
+import json
+import os
+import sys
+
+import pytest
+from langchain_core.language_models import FakeListChatModel
+from langchain_core.tools import Tool
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from src.graph.tracing import Tracer, export_prometheus, trace_span
+from src.graph.workflow import MultiAgentWorkflow
+from src.tools.arxiv_search import ArxivSearchTool
+from src.tools.finance_api import FinanceDataTool
+from src.tools.news_api import NewsSearchTool
+
+
+class TestTracing:
+    """Test latency span collection and export"""
+
+    def test_nested_spans(self):
+        """Test spans nest through the active tracer"""
+        tracer = Tracer()
+
+        with tracer.activate():
+            with trace_span("workflow", "workflow"):
+                with trace_span("research", "agent"):
+                    pass
+
+        spans = {span["name"]: span for span in tracer.spans}
+        assert spans["research"]["parent_id"] == spans["workflow"]["span_id"]
+        assert spans["workflow"]["parent_id"] is None
+        assert spans["research"]["duration_ms"] >= 0
+
+    def test_trace_span_without_tracer(self):
+        """Test trace_span is a no-op outside a traced run"""
+        with trace_span("research", "agent") as span:
+            assert span is None
+
+    def test_llm_and_tool_spans(self):
+        """Test callback handler records LLM and tool calls under the span"""
+        tracer = Tracer()
+        llm = FakeListChatModel(responses=["ok"])
+        tool = Tool(name="arxiv_search", func=lambda q: "papers", description="d")
+        config = {"callbacks": [tracer.callback_handler()]}
+
+        with tracer.activate(), trace_span("research", "agent"):
+            llm.invoke("hello", config=config)
+            tool.run("battery", callbacks=config["callbacks"])
+
+        spans = {span["name"]: span for span in tracer.spans}
+        assert spans["llm"]["kind"] == "llm"
+        assert spans["tool.arxiv_search"]["kind"] == "tool"
+        assert spans["llm"]["parent_id"] == spans["research"]["span_id"]
+        assert spans["tool.arxiv_search"]["attributes"]["input"] == "battery"
+
+    def test_token_rollup_and_exports(self):
+        """Test token counts roll up and export as JSON and Prometheus"""
+        tracer = Tracer()
+
+        with tracer.activate(), trace_span("synthesis", "node"):
+            with trace_span("llm", "llm", model="haiku") as span:
+                span["input_tokens"] = 120
+                span["output_tokens"] = 30
+
+        spans = {span["name"]: span for span in tracer.spans}
+        assert spans["synthesis"]["total_input_tokens"] == 120
+        assert spans["synthesis"]["total_output_tokens"] == 30
+
+        exported = json.loads(tracer.to_json())
+        assert exported["trace_id"] == tracer.trace_id
+        assert len(exported["spans"]) == 2
+
+        text = export_prometheus(tracer.spans)
+        count = 'analyst_span_duration_seconds_count{kind="node",name="synthesis"}'
+        assert f"{count} 1" in text
+        assert 'analyst_llm_tokens_total{model="haiku",direction="input"} 120' in text
+
+    def test_workflow_attaches_trace(self):
+        """Test a workflow run carries its spans in the state metadata"""
+        tools = {
+            "arxiv_search": ArxivSearchTool().as_langchain_tool(),
+            "yahoo_finance": FinanceDataTool().as_langchain_tool(),
+            "news_api": NewsSearchTool("test-key").as_langchain_tool(),
+        }
+        config = {
+            "region": "us-west-2",
+            "model_id": "anthropic.claude-3-haiku-20240307-v1:0",
+        }
+        workflow = MultiAgentWorkflow(tools, config)
+        workflow.synthesis_agent.llm = FakeListChatModel(responses=["Report"])
+
+        result = workflow.run("battery outlook")
+        spans = result["metadata"]["trace"]["spans"]
+        kinds = {(span["kind"], span["name"]) for span in spans}
+        by_id = {span["span_id"]: span for span in spans}
+
+        assert ("workflow", "workflow") in kinds
+        assert ("node", "parallel_agents") in kinds
+        assert ("node", "synthesis") in kinds
+        assert {("agent", a) for a in ("research", "financial", "competitor")} <= kinds
+        for span in spans:
+            if span["kind"] == "agent":
+                assert by_id[span["parent_id"]]["name"] == "parallel_agents"
+
+    def test_workflow_tracing_disabled(self):
+        """Test tracing can be switched off from config"""
+        tools = {
+            "arxiv_search": ArxivSearchTool().as_langchain_tool(),
+            "yahoo_finance": FinanceDataTool().as_langchain_tool(),
+            "news_api": NewsSearchTool("test-key").as_langchain_tool(),
+        }
+        config = {
+            "region": "us-west-2",
+            "model_id": "anthropic.claude-3-haiku-20240307-v1:0",
+            "tracing": False,
+        }
+        workflow = MultiAgentWorkflow(tools, config)
+        workflow.synthesis_agent.llm = FakeListChatModel(responses=["Report"])
+
+        result = workflow.run("battery outlook")
+
+        assert "trace" not in result["metadata"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,133 @@
+import asyncio
+import concurrent.futures
+import os
+import sys
+
+import pytest
+from dotenv import load_dotenv
+from langchain_core.language_models import FakeListChatModel
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from src.graph.workflow import MultiAgentWorkflow
+from src.tools.arxiv_search import ArxivSearchTool
+from src.tools.finance_api import FinanceDataTool
+from src.tools.news_api import NewsSearchTool
+
+
+class TestMultiAgentWorkflow:
+    """Test workflow orchestration"""
+
+    @pytest.fixture
+    def config(self):
+        """Test configuration"""
+        load_dotenv()
+        return {
+            "region": os.getenv("AWS_REGION", "us-west-2"),
+            "model_id": os.getenv(
+                "BEDROCK_MODEL", "anthropic.claude-3-5-sonnet-20241022-v2:0"
+            ),
+        }
+
+    @pytest.fixture
+    def tools(self):
+        """LangChain tools keyed the way the workflow expects"""
+        return {
+            "arxiv_search": ArxivSearchTool().as_langchain_tool(),
+            "yahoo_finance": FinanceDataTool().as_langchain_tool(),
+            "news_api": NewsSearchTool("test-key").as_langchain_tool(),
+        }
+
+    def test_workflow_initialization(self, tools, config):
+        """Test workflow builds all agents and the graph"""
+        workflow = MultiAgentWorkflow(tools, config)
+
+        assert workflow.graph is not None
+        assert hasattr(workflow, "research_agent")
+        assert hasattr(workflow, "financial_agent")
+        assert hasattr(workflow, "competitor_agent")
+        assert hasattr(workflow, "synthesis_agent")
+
+    def test_arun_method(self, tools, config):
+        """Test async run returns the full report state"""
+        workflow = MultiAgentWorkflow(tools, config)
+
+        result = asyncio.run(workflow.arun("battery industry outlook"))
+
+        assert isinstance(result, dict)
+        assert isinstance(result["research_findings"], list)
+        assert isinstance(result["competitor_insights"], list)
+        assert "final_report" in result
+        assert "executive_summary" in result
+        assert isinstance(result["recommendations"], list)
+
+    def test_arun_concurrent_queries(self, tools, config):
+        """Test several queries can share one event loop"""
+        workflow = MultiAgentWorkflow(tools, config)
+
+        async def run_all():
+            return await asyncio.gather(
+                workflow.arun("solid-state batteries"),
+                workflow.arun("LG Energy Solution position"),
+            )
+
+        results = asyncio.run(run_all())
+
+        assert len(results) == 2
+        assert results[0]["query"] == "solid-state batteries"
+        assert results[1]["query"] == "LG Energy Solution position"
+
+    def test_stream_yields_report_chunks(self, tools, config):
+        """Test stream() yields report chunks before the final state"""
+        workflow = MultiAgentWorkflow(tools, config)
+        workflow.synthesis_agent.llm = FakeListChatModel(
+            responses=["Executive summary.\n\n- Recommendation"]
+        )
+
+        events = list(workflow.stream("battery industry outlook"))
+        chunks = [payload for kind, payload in events if kind == "report_chunk"]
+        kind, final_state = events[-1]
+
+        assert kind == "final"
+        assert len(chunks) > 1
+        assert "".join(chunks) == final_state["final_report"]
+        assert final_state["executive_summary"] == "Executive summary."
+
+    def test_astream_and_run(self, tools, config):
+        """Test astream() streams the report and run() does not stream"""
+        workflow = MultiAgentWorkflow(tools, config)
+        workflow.synthesis_agent.llm = FakeListChatModel(
+            responses=["Executive summary.\n\n- Recommendation"]
+        )
+        synthesize = workflow.synthesis_agent.synthesize
+        callbacks = []
+
+        def record(state, on_token=None):
+            callbacks.append(on_token)
+            return synthesize(state, on_token=on_token)
+
+        async def collect():
+            return [event async for event in workflow.astream("battery outlook")]
+
+        events = asyncio.run(collect())
+        chunks = [payload for kind, payload in events if kind == "report_chunk"]
+        workflow.synthesis_agent.synthesize = record
+        workflow.run("battery outlook")
+
+        assert len(chunks) > 1
+        assert "".join(chunks) == events[-1][1]["final_report"]
+        assert callbacks == [None]
+
+    def test_reuse_across_threads(self, tools, config):
+        """Test one workflow instance serves concurrent queries"""
+        workflow = MultiAgentWorkflow(tools, config)
+        queries = [f"battery query {i}" for i in range(4)]
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(workflow.run, queries))
+
+        assert [r["query"] for r in results] == queries
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])